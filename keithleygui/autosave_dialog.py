@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, print_function, absolute_import
+import pkg_resources as pkgr
+from qtpy import QtCore, QtWidgets, uic
+
+# local imports
+from keithleygui.config.main import CONF
+from keithleygui.utils.autosave import format_filename
+
+AUTOSAVE_UI_PATH = pkgr.resource_filename('keithleygui', 'autosave_dialog.ui')
+
+
+class AutosaveDialog(QtWidgets.QDialog):
+    """Dialog to edit the 'Autosave' settings."""
+
+    def __init__(self, parent=None):
+        super(self.__class__, self).__init__(parent=parent)
+        # load user interface layout from .ui file
+        uic.loadUi(AUTOSAVE_UI_PATH, self)
+
+        # connect callbacks
+        self.accepted.connect(self._on_accept)
+        self.pushButtonDirectory.clicked.connect(self._on_choose_directory)
+        self.pushButtonSpool.clicked.connect(self._on_choose_spool)
+        self.checkBoxSpool.toggled.connect(self.lineEditSpool.setEnabled)
+        self.checkBoxSpool.toggled.connect(self.pushButtonSpool.setEnabled)
+        self.lineEditTemplate.textChanged.connect(self._update_preview)
+        self.lineEditSample.textChanged.connect(self._update_preview)
+        self.spinBoxCounter.valueChanged.connect(self._update_preview)
+
+    def exec_(self):
+        self.populate_ui_from_conf()
+        return super(self.__class__, self).exec_()
+
+    @QtCore.Slot()
+    def populate_ui_from_conf(self):
+        self.checkBoxEnabled.setChecked(CONF.get('Autosave', 'enabled'))
+        self.lineEditDirectory.setText(CONF.get('Autosave', 'directory'))
+        self.lineEditSample.setText(CONF.get('Autosave', 'sample'))
+        self.lineEditTemplate.setText(CONF.get('Autosave', 'template'))
+        self.spinBoxCounter.setValue(CONF.get('Autosave', 'counter'))
+        self.checkBoxAtomic.setChecked(CONF.get('Autosave', 'atomic'))
+        self.checkBoxSpool.setChecked(CONF.get('Autosave', 'spool'))
+        self.lineEditSpool.setText(CONF.get('Autosave', 'spool_directory'))
+        self.lineEditSpool.setEnabled(self.checkBoxSpool.isChecked())
+        self.pushButtonSpool.setEnabled(self.checkBoxSpool.isChecked())
+        self._update_preview()
+
+    @QtCore.Slot()
+    def _update_preview(self):
+        try:
+            name = format_filename(self.lineEditTemplate.text(), self.lineEditSample.text(),
+                                   'transfer', self.spinBoxCounter.value())
+            self.labelPreview.setText('e.g., ' + name)
+        except ValueError as e:
+            self.labelPreview.setText(str(e))
+
+    def _choose_directory(self, line_edit):
+        prompt = 'Please select a folder.'
+        path = QtWidgets.QFileDialog.getExistingDirectory(self, prompt, line_edit.text())
+        if path:
+            line_edit.setText(path)
+
+    @QtCore.Slot()
+    def _on_choose_directory(self):
+        self._choose_directory(self.lineEditDirectory)
+
+    @QtCore.Slot()
+    def _on_choose_spool(self):
+        self._choose_directory(self.lineEditSpool)
+
+    @QtCore.Slot()
+    def _on_accept(self):
+        CONF.set('Autosave', 'enabled', self.checkBoxEnabled.isChecked())
+        CONF.set('Autosave', 'directory', self.lineEditDirectory.text())
+        CONF.set('Autosave', 'sample', self.lineEditSample.text())
+        CONF.set('Autosave', 'template', self.lineEditTemplate.text())
+        CONF.set('Autosave', 'counter', self.spinBoxCounter.value())
+        CONF.set('Autosave', 'atomic', self.checkBoxAtomic.isChecked())
+        CONF.set('Autosave', 'spool', self.checkBoxSpool.isChecked())
+        CONF.set('Autosave', 'spool_directory', self.lineEditSpool.text())
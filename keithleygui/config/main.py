@@ -11,6 +11,7 @@ keithleygui configuration options.
 # Local import
 from keithleygui.config.user import UserConfig
 from keithley2600 import Keithley2600
+from keithleygui.utils.autosave import DEFAULT_TEMPLATE
 
 PACKAGE_NAME = 'keithleygui'
 SUBFOLDER = '.%s' % PACKAGE_NAME
@@ -51,6 +52,55 @@ DEFAULTS = [
               'delay': -1.0,
               'gate': Keithley2600.SMU_LIST[0],
               'drain': Keithley2600.SMU_LIST[1],
+              'checkpoint': 0,  # points per checkpoint, 0 for whole curves
+              'repeats': 1,
+              'keep_raw': False,
+              'settle_adaptive': False,
+              'settle_rtol': 0.01,
+              'settle_max_wait': 5.0,  # s
+             }),
+            ('TimeSeries',
+             {
+              'Vg': -60.0,
+              'Vd': -5.0,
+              'interval': 1.0,
+              'duration': 0.0,
+              'buffer_size': 100000,
+              'spill': False,
+              'spill_max_age': 30,  # days after which spill files are deleted, 0 keeps all
+             }),
+            ('Monitor',
+             {
+              'interval': 0.5,
+             }),
+            ('Plot',
+             {
+              'opengl': False,
+              'antialias_max_points': 20000,
+              'transform': 'current',  # see utils.derived_curves.TRANSFORMS
+             }),
+            ('History',
+             {
+              'memory_limit': 512,  # MB
+              'max_entries': 1000,
+             }),
+            ('Autosave',
+             {
+              'enabled': False,
+              'directory': '',  # defaults to the home folder
+              'template': DEFAULT_TEMPLATE,
+              'sample': 'sample',
+              'counter': 1,
+              'atomic': True,
+              'spool': False,
+              'spool_directory': '',  # defaults to a folder in the config dir
+             }),
+            ('Analysis',
+             {
+              'width': 1e-3,  # m
+              'length': 50e-6,  # m
+              'capacitance': 1e-8,  # F/cm^2
+              'show_fits': True,
              })
             ]
 
@@ -61,6 +111,9 @@ for smu in Keithley2600.SMU_LIST:
                      'sense': 'SENSE_LOCAL',
                      'limitv': 200.0,
                      'limiti': 0.1,
+                     'filter_enable': False,
+                     'filter_type': 'FILTER_REPEAT_AVG',
+                     'filter_count': 1,
                      })
     DEFAULTS.append(smu_settings)
 
@@ -8,24 +8,55 @@
 # system imports
 from __future__ import division, print_function, absolute_import
 import os.path as osp
+import time
 import pkg_resources as pkgr
 import visa
 from qtpy import QtCore, QtWidgets, uic
-from keithley2600 import TransistorSweepData, IVSweepData
+from keithley2600 import TransistorSweepData, IVSweepData, ResultTable
 import numpy as np
 
 # local imports
 from keithleygui.utils.led_indicator_widget import LedIndicator
-from keithleygui.utils.scientific_spinbox import ScienDSpinBox
-from keithleygui.utils.pyqtplot_canvas import SweepDataPlot
+from keithleygui.utils.scientific_spinbox import ScienDSpinBox, ReadingDSpinBox
+from keithleygui.utils.pyqtplot_canvas import SweepDataPlot, StripChartPlot
+from keithleygui.utils.ring_buffer import RingBuffer, prune_spill_files
+from keithleygui.utils.smu_monitor import MonitorThread
+from keithleygui.utils.time_series_tab import TimeSeriesTab
+from keithleygui.utils.sweep_table import SweepTableDock
+from keithleygui.utils.sweep_catalog import SweepCatalog, SweepCatalogDock
+from keithleygui.utils.sweep_list import SweepListDock
+from keithleygui.utils.parameter_dock import TransistorParameterDock
+from keithleygui.utils.analysis_thread import AnalysisThread
+from keithleygui.utils.derived_curves import TRANSFORMS
+from keithleygui.utils.running_stats import RunningStatistics, averaged_sweep
+from keithleygui.utils.settling import wait_until_settled, settle_column_name
+from keithleygui.utils.sweep_history import SweepHistory
+from keithleygui.utils.sweep_loader import combine_sweeps, SWEEP_CLASSES, DEFAULT_CLASS
+from keithleygui.utils.load_thread import LoadThread
+from keithleygui.utils.journal import (SweepJournal, recover_sweep,
+                                       interrupted_journals, remove_journal)
+from keithleygui.utils.autosave import format_filename
+from keithleygui.utils.autosave_thread import AutosaveThread
 from keithleygui.connection_dialog import ConnectionDialog
-from keithleygui.config.main import CONF
+from keithleygui.autosave_dialog import AutosaveDialog
+from keithleygui.config.main import CONF, SUBFOLDER
+from keithleygui.config.base import get_conf_path
 
 MAIN_UI_PATH = pkgr.resource_filename('keithleygui', 'main.ui')
 
 
 class SMUSettingsTab(QtWidgets.QWidget):
 
+    # labels and TSP names of the measurement filter types, the filter averages
+    # 'count' readings on the instrument and returns a single value
+    FILTER_TYPES = (('off', None),
+                    ('repeat average', 'FILTER_REPEAT_AVG'),
+                    ('moving average', 'FILTER_MOVING_AVG'),
+                    ('median', 'FILTER_MEDIAN'))
+
+    # numeric values of the filter types, the driver does not define these constants
+    FILTER_VALUES = {'FILTER_MOVING_AVG': 0, 'FILTER_REPEAT_AVG': 1, 'FILTER_MEDIAN': 2}
+
     def __init__(self, smu_name):
         super(self.__class__, self).__init__()
 
@@ -82,12 +113,113 @@ class SMUSettingsTab(QtWidgets.QWidget):
         self.scienceSpinBoxLimV.setSuffix("V")
         self.gridLayouts.addWidget(self.scienceSpinBoxLimV, 2, 1, 1, 1)
 
+        self.labelFilter = QtWidgets.QLabel(self)
+        self.labelFilter.setObjectName('labelFilter')
+        self.labelFilter.setAlignment(QtCore.Qt.AlignRight)
+        self.labelFilter.setText('Filter:')
+        self.gridLayouts.addWidget(self.labelFilter, 3, 0, 1, 1)
+
+        self.comboBoxFilter = QtWidgets.QComboBox(self)
+        self.comboBoxFilter.setObjectName('comboBoxFilter')
+        self.comboBoxFilter.setMinimumWidth(150)
+        self.comboBoxFilter.setMaximumWidth(150)
+        self.comboBoxFilter.addItems([label for label, _ in self.FILTER_TYPES])
+        self.gridLayouts.addWidget(self.comboBoxFilter, 3, 1, 1, 2)
+
+        self.labelFilterCount = QtWidgets.QLabel(self)
+        self.labelFilterCount.setObjectName('labelFilterCount')
+        self.labelFilterCount.setAlignment(QtCore.Qt.AlignRight)
+        self.labelFilterCount.setText('Filter count:')
+        self.gridLayouts.addWidget(self.labelFilterCount, 4, 0, 1, 1)
+
+        self.spinBoxFilterCount = QtWidgets.QSpinBox(self)
+        self.spinBoxFilterCount.setObjectName('spinBoxFilterCount')
+        self.spinBoxFilterCount.setMinimumWidth(90)
+        self.spinBoxFilterCount.setMaximumWidth(90)
+        self.spinBoxFilterCount.setAlignment(QtCore.Qt.AlignRight)
+        self.spinBoxFilterCount.setRange(1, 100)
+        self.spinBoxFilterCount.setSuffix(' x')
+        self.gridLayouts.addWidget(self.spinBoxFilterCount, 4, 1, 1, 1)
+
+        self.comboBoxFilter.currentIndexChanged.connect(self._on_filter_changed)
+        self.setFilterSettings(CONF.get(self.smu_name, 'filter_enable'),
+                               CONF.get(self.smu_name, 'filter_type'),
+                               CONF.get(self.smu_name, 'filter_count'))
+
+        self.labelReadingV = QtWidgets.QLabel(self)
+        self.labelReadingV.setObjectName('labelReadingV')
+        self.labelReadingV.setAlignment(QtCore.Qt.AlignRight)
+        self.labelReadingV.setText('Voltage:')
+        self.gridLayouts.addWidget(self.labelReadingV, 5, 0, 1, 1)
+
+        self.readingSpinBoxV = ReadingDSpinBox(self)
+        self.readingSpinBoxV.setObjectName('readingSpinBoxV')
+        self.readingSpinBoxV.setMinimumWidth(90)
+        self.readingSpinBoxV.setMaximumWidth(90)
+        self.readingSpinBoxV.setAlignment(QtCore.Qt.AlignRight)
+        self.readingSpinBoxV.setReadOnly(True)
+        self.readingSpinBoxV.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
+        self.readingSpinBoxV.setDecimals(3, dynamic_precision=False)
+        self.readingSpinBoxV.setSuffix("V")
+        self.gridLayouts.addWidget(self.readingSpinBoxV, 5, 1, 1, 1)
+
+        self.labelReadingI = QtWidgets.QLabel(self)
+        self.labelReadingI.setObjectName('labelReadingI')
+        self.labelReadingI.setAlignment(QtCore.Qt.AlignRight)
+        self.labelReadingI.setText('Current:')
+        self.gridLayouts.addWidget(self.labelReadingI, 6, 0, 1, 1)
+
+        self.readingSpinBoxI = ReadingDSpinBox(self)
+        self.readingSpinBoxI.setObjectName('readingSpinBoxI')
+        self.readingSpinBoxI.setMinimumWidth(90)
+        self.readingSpinBoxI.setMaximumWidth(90)
+        self.readingSpinBoxI.setAlignment(QtCore.Qt.AlignRight)
+        self.readingSpinBoxI.setReadOnly(True)
+        self.readingSpinBoxI.setButtonSymbols(QtWidgets.QAbstractSpinBox.NoButtons)
+        self.readingSpinBoxI.setDecimals(3, dynamic_precision=False)
+        self.readingSpinBoxI.setSuffix("A")
+        self.gridLayouts.addWidget(self.readingSpinBoxI, 6, 1, 1, 1)
+
+        self.setMonitorVisible(False)
+
+    def setMonitorVisible(self, visible):
+        """Show or hide the live voltage and current readings."""
+        for widget in (self.labelReadingV, self.readingSpinBoxV,
+                       self.labelReadingI, self.readingSpinBoxI):
+            widget.setVisible(visible)
+
+    def filterSettings(self):
+        """
+        Returns the filter settings as tuple (enable, filter_type, count), where
+        `filter_type` is the name of a Keithley constant.
+        """
+        filter_type = self.FILTER_TYPES[self.comboBoxFilter.currentIndex()][1]
+        enable = filter_type is not None
+        if not enable:
+            filter_type = CONF.get(self.smu_name, 'filter_type')  # keep the last type
+
+        return enable, filter_type, self.spinBoxFilterCount.value()
+
+    def setFilterSettings(self, enable, filter_type, count):
+        types = [t for _, t in self.FILTER_TYPES]
+        index = types.index(filter_type) if enable and filter_type in types else 0
+        self.comboBoxFilter.setCurrentIndex(index)
+        self.spinBoxFilterCount.setValue(count)
+        self._on_filter_changed(index)
+
+    @QtCore.Slot(int)
+    def _on_filter_changed(self, index):
+        self.spinBoxFilterCount.setEnabled(index > 0)
+
 
 class KeithleyGuiApp(QtWidgets.QMainWindow):
     """ Provides a GUI for transfer and output sweeps on the Keithley 2600."""
 
     QUIT_ON_CLOSE = True
 
+    SWEEP_LABELS = {'transfer': 'Transfer', 'output': 'Output', 'iv': 'IV',
+                    'timeseries': 'Time series'}
+
     def __init__(self, keithley):
         super(self.__class__, self).__init__()
         # load user interface layout from .ui file
@@ -99,9 +231,65 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
         self._set_up_tabs()  # create Keithley settings tabs
 
-        # create plot widget
-        self.canvas = SweepDataPlot()
+        # create plot widgets, the strip chart is only shown for time series
+        self.canvas = SweepDataPlot(CONF.get('Plot', 'opengl'),
+                                    CONF.get('Plot', 'antialias_max_points'))
         self.gridLayout2.addWidget(self.canvas)
+        self.stripChart = StripChartPlot(CONF.get('Plot', 'opengl'),
+                                         CONF.get('Plot', 'antialias_max_points'))
+        self.gridLayout2.addWidget(self.stripChart)
+        self.stripChart.hide()
+
+        # select derived curves, e.g., the transconductance, from the Plot menu
+        self.transformGroup = QtWidgets.QActionGroup(self)
+        for transform, text in TRANSFORMS.items():
+            action = self.menuPlot.addAction(text)
+            action.setCheckable(True)
+            action.setData(transform)
+            self.transformGroup.addAction(action)
+        self._set_transform(CONF.get('Plot', 'transform'))
+
+        # create data table, hidden until opened from the Window menu
+        self.tableDock = SweepTableDock(self)
+        self.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.tableDock)
+        self.tableDock.hide()
+        self.menuWindow.addSeparator()
+        self.menuWindow.addAction(self.tableDock.toggleViewAction())
+
+        # create catalog of saved and loaded sweeps
+        self.catalog = SweepCatalog(get_conf_path(SUBFOLDER, 'catalog.sqlite'))
+        self.catalogDock = SweepCatalogDock(self.catalog, self)
+        self.addDockWidget(QtCore.Qt.LeftDockWidgetArea, self.catalogDock)
+        self.catalogDock.hide()
+        self.menuWindow.addAction(self.catalogDock.toggleViewAction())
+        self.sweep_smu_settings = None  # SMU settings of the last measurement
+
+        # create history of measured and loaded sweeps
+        self.history = SweepHistory(CONF.get('History', 'memory_limit') * 2**20,
+                                    get_conf_path(osp.join(SUBFOLDER, 'history')),
+                                    CONF.get('History', 'max_entries'))
+        self.n_measurements = 0
+        self.measure_key = None  # history key of the sweep being measured
+        self.resume_key = None  # history key of the selected incomplete sweep
+        self.sweepListDock = SweepListDock(self.history, self)
+        self.addDockWidget(QtCore.Qt.LeftDockWidgetArea, self.sweepListDock)
+        self.sweepListDock.hide()
+        self.menuWindow.addAction(self.sweepListDock.toggleViewAction())
+
+        # create panel of transistor parameters, extracted in a worker thread
+        dimensions = (CONF.get('Analysis', 'width'), CONF.get('Analysis', 'length'),
+                      CONF.get('Analysis', 'capacitance'))
+        self.parameterDock = TransistorParameterDock(dimensions,
+                                                     CONF.get('Analysis', 'show_fits'),
+                                                     self)
+        self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.parameterDock)
+        self.parameterDock.hide()
+        self.menuWindow.addAction(self.parameterDock.toggleViewAction())
+        self.shown_keys = []  # history keys of the sweeps shown
+        self.analysis_pending = set()  # history keys queued for extraction
+        self.analysisThread = AnalysisThread()
+        self.analysisThread.resultSig.connect(self._on_analysis_done)
+        self.analysisThread.start()
 
         # restore last position and size
         self.restore_geometry()
@@ -109,11 +297,31 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         # create connection dialog
         self.connectionDialog = ConnectionDialog(self, self.keithley)
 
+        # create autosave dialog and writer, files left in the spool are synced
+        self.autosaveDialog = AutosaveDialog(self)
+        self.autosaveThread = AutosaveThread()
+        self.autosaveThread.savedSig.connect(self._on_autosaved)
+        self.autosaveThread.failedSig.connect(self._on_autosave_failed)
+        self.autosaveThread.start()
+        if CONF.get('Autosave', 'spool'):
+            self.autosaveThread.sync(self._autosave_spool_directory(),
+                                     self._autosave_directory())
+
         # create LED indicator
         self.led = LedIndicator(self)
         self.statusBar.addPermanentWidget(self.led)
         self.led.setChecked(False)
 
+        # create progress indicator for loading files
+        self.loadThread = None
+        self.loadProgressBar = QtWidgets.QProgressBar(self)
+        self.loadProgressBar.setMaximumWidth(150)
+        self.loadCancelButton = QtWidgets.QPushButton('Cancel', self)
+        self.statusBar.addPermanentWidget(self.loadProgressBar)
+        self.statusBar.addPermanentWidget(self.loadCancelButton)
+        self.loadProgressBar.hide()
+        self.loadCancelButton.hide()
+
         # prepare GUI
         self.connect_ui_callbacks()  # connect to callbacks
         self._on_load_default()  # load default settings into GUI
@@ -128,6 +336,22 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.timer.timeout.connect(self._update_gui_connection)
         self.timer.start(10000)  # Call every 10 seconds
 
+        # time series: redraw the strip chart periodically while recording
+        self.time_series_buffer = None
+        self.stripChartTimer = QtCore.QTimer()
+        self.stripChartTimer.timeout.connect(self.stripChart.update_plot)
+
+        self.measureThread = None
+
+        # SMU monitor: readings are polled in a worker thread and picked up
+        # by this timer at most once per display frame
+        self.monitorThread = None
+        self.monitorTimer = QtCore.QTimer()
+        self.monitorTimer.timeout.connect(self._on_monitor_timeout)
+
+        # offer to recover measurements which were interrupted by a crash
+        QtCore.QTimer.singleShot(0, self._recover_journals)
+
     @staticmethod
     def _string_to_vd(string):
         try:
@@ -174,51 +398,92 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             self.tabWidgetSettings.addTab(tab, smu_name)
             self.smu_tabs.append(tab)
 
+        self.timeSeriesTab = TimeSeriesTab()
+        self.tabWidgetSweeps.addTab(self.timeSeriesTab, 'Time series')
+
     def connect_ui_callbacks(self):
         """Connect buttons and menus to callbacks."""
         self.pushButtonTransfer.clicked.connect(self._on_sweep_clicked)
         self.pushButtonOutput.clicked.connect(self._on_sweep_clicked)
         self.pushButtonIV.clicked.connect(self._on_sweep_clicked)
+        self.timeSeriesTab.pushButtonRun.clicked.connect(self._on_sweep_clicked)
         self.pushButtonAbort.clicked.connect(self._on_abort_clicked)
+        self.pushButtonResume.clicked.connect(self._on_resume_clicked)
 
         self.comboBoxGateSMU.currentIndexChanged.connect(self._on_smu_gate_changed)
         self.comboBoxDrainSMU.currentIndexChanged.connect(self._on_smu_drain_changed)
+        self.checkBoxSettleAdaptive.toggled.connect(self._on_settle_adaptive_toggled)
 
         self.actionSettings.triggered.connect(self.connectionDialog.open)
+        self.actionAutosaveSettings.triggered.connect(self.autosaveDialog.exec_)
         self.actionConnect.triggered.connect(self._on_connect_clicked)
         self.actionDisconnect.triggered.connect(self._on_disconnect_clicked)
+        self.actionMonitor.toggled.connect(self._on_monitor_toggled)
         self.action_Exit.triggered.connect(self.exit_)
         self.actionSaveSweepData.triggered.connect(self._on_save_clicked)
         self.actionLoad_data_from_file.triggered.connect(self._on_load_clicked)
+        self.catalogDock.loadRequested.connect(self.load_sweep_data)
+        self.sweepListDock.selectionChanged.connect(self._on_sweep_list_selection)
+        self.parameterDock.dimensionsChanged.connect(self._on_dimensions_changed)
+        self.parameterDock.showFitsToggled.connect(self._on_show_fits_toggled)
+        self.loadCancelButton.clicked.connect(self._stop_loading)
         self.actionSaveDefaults.triggered.connect(self._on_save_default)
         self.actionLoadDefaults.triggered.connect(self._on_load_default)
+        self.transformGroup.triggered.connect(self._on_transform_selected)
 
 # =============================================================================
 # Measurement callbacks
 # =============================================================================
 
-    def apply_smu_settings(self):
+    def apply_smu_settings(self, smu_settings=None):
         """
         Applies SMU settings to Keithley before a measurement.
         Warning: self.keithley.reset() will reset those settings.
+
+        :param dict smu_settings: Settings as returned by :meth:`get_smu_settings`,
+            defaults to the current settings in the GUI.
         """
-        for tab in self.smu_tabs:
+        if smu_settings is None:
+            smu_settings = self.get_smu_settings()
 
-            smu = getattr(self.keithley, tab.smu_name)
+        for smu_name, settings in smu_settings.items():
 
-            if tab.comboBox.currentIndex() == 0:
-                smu.sense = smu.SENSE_LOCAL
-            elif tab.comboBox.currentIndex() == 1:
-                smu.sense = smu.SENSE_REMOTE
+            smu = getattr(self.keithley, smu_name)
+
+            smu.sense = getattr(smu, settings['sense'])
 
-            lim_i = tab.scienceSpinBoxLimI.value()
+            lim_i = settings['limiti']
             smu.source.limiti = lim_i
             smu.trigger.source.limiti = lim_i
 
-            lim_v = tab.scienceSpinBoxLimV.value()
+            lim_v = settings['limitv']
             smu.source.limitv = lim_v
             smu.trigger.source.limitv = lim_v
 
+            # readings are averaged on the instrument, only the result is transferred
+            if settings.get('filter_enable', False):
+                filter_type = SMUSettingsTab.FILTER_VALUES[settings['filter_type']]
+                smu.measure.filter.type = filter_type
+                smu.measure.filter.count = settings['filter_count']
+                smu.measure.filter.enable = 1  # FILTER_ON
+            else:
+                smu.measure.filter.enable = 0  # FILTER_OFF
+
+    def get_smu_settings(self):
+        """Returns a dictionary with the current settings of all SMUs."""
+        settings = dict()
+        for tab in self.smu_tabs:
+            enable, filter_type, count = tab.filterSettings()
+            settings[tab.smu_name] = {
+                'sense': ('SENSE_LOCAL', 'SENSE_REMOTE')[tab.comboBox.currentIndex()],
+                'limiti': tab.scienceSpinBoxLimI.value(),
+                'limitv': tab.scienceSpinBoxLimV.value(),
+                'filter_enable': enable,
+                'filter_type': filter_type,
+                'filter_count': count,
+            }
+        return settings
+
     @QtCore.Slot()
     def _on_sweep_clicked(self):
         """ Start a transfer measurement with current settings."""
@@ -231,6 +496,7 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             return
 
         self.apply_smu_settings()
+        self.sweep_smu_settings = self.get_smu_settings()
 
         params = dict()
 
@@ -265,6 +531,16 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             params['VStep'] = self.scienDSpinBoxVStep.value()
             smusweep = self.comboBoxSweepSMU.currentText()
             params['smu_sweep'] = getattr(self.keithley, smusweep)
+            params['smu_sweep_name'] = smusweep
+
+        elif self.sender() == self.timeSeriesTab.pushButtonRun:
+            self.statusBar.showMessage('    Recording time series.')
+            # get time series settings
+            params['sweep_type'] = 'timeseries'
+            params['Vg'] = self.timeSeriesTab.scienDSpinBoxVg.value()
+            params['Vd'] = self.timeSeriesTab.scienDSpinBoxVd.value()
+            params['interval'] = self.timeSeriesTab.scienDSpinBoxInterval.value()
+            params['duration'] = self.timeSeriesTab.scienDSpinBoxDuration.value()
 
         else:
             return
@@ -277,9 +553,27 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         params['smu_gate'] = getattr(self.keithley, smugate)
         smudrain = self.comboBoxDrainSMU.currentText()
         params['smu_drain'] = getattr(self.keithley, smudrain)  # drain SMU
+        params['smu_gate_name'] = smugate
+        params['smu_drain_name'] = smudrain
+
+        params['checkpoint'] = self.spinBoxCheckpoint.value()
+        params['repeats'] = self.spinBoxRepeats.value()
+        params['keep_raw'] = self.checkBoxKeepRaw.isChecked()
+        params['smu_settings'] = self.sweep_smu_settings
 
         params['pulsed'] = bool(self.comboBoxSweepType.currentIndex())
 
+        params['settle_adaptive'] = (self.checkBoxSettleAdaptive.isChecked() and
+                                     params['sweep_type'] != 'timeseries')
+        params['settle_rtol'] = self.doubleSpinBoxSettleTol.value() / 100
+        params['settle_max_wait'] = self.scienDSpinBoxSettleMax.value()
+
+        if params['settle_adaptive'] and params['pulsed']:
+            msg = 'Adaptive settling is only available for continuous sweeps.'
+            QtWidgets.QMessageBox.information(self, str('error'), msg)
+
+            return
+
         # check if integration time is valid, return otherwise
         freq = self.keithley.localnode.linefreq
 
@@ -290,23 +584,163 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
             return
 
-        # create measurement thread with params dictionary
-        self.measureThread = MeasureThread(self.keithley, params)
+        if params['sweep_type'] == 'timeseries':
+            params['buffer'] = self._new_time_series_buffer()
+            self.stripChart.setBuffer(params['buffer'],
+                                      ['Gate current', 'Drain current'])
+            self._show_plot(self.stripChart)
+            self.stripChartTimer.start(200)
+
+        self.measure_key = None  # a new sweep
+        self._start_measurement(params)
+
+    def _start_measurement(self, params, resume=None):
+        """Runs a measurement in a thread, optionally resuming a sweep."""
+        self.measureThread = MeasureThread(self.keithley, params,
+                                           get_conf_path(osp.join(SUBFOLDER, 'journal')),
+                                           resume)
         self.measureThread.finishedSig.connect(self._on_measure_done)
+        self.measureThread.repetitionSig.connect(self._on_repetition_done)
 
-        # run measurement
+        # run measurement, the monitor would interleave its queries with the sweep
+        if self.monitorThread is not None:
+            self.monitorThread.pause()
         self._gui_state_busy()
         self.measureThread.start()
 
+    @QtCore.Slot()
+    def _on_resume_clicked(self):
+        """Records the missing points of the selected sweep with its settings."""
+        if self.resume_key is None or self.resume_key not in self.history:
+            return
+
+        if self.keithley.busy:
+            msg = ('Keithley is currently used by another program. ' +
+                   'Please try again later.')
+            QtWidgets.QMessageBox.information(self, str('error'), msg)
+            return
+
+        key = self.resume_key
+        sweep_data, _ = self.history.get(key)
+        params = dict(self.history.info(key)['measure_params'])
+        for smu in ('smu_gate', 'smu_drain', 'smu_sweep'):
+            if params.get(smu + '_name') is not None:
+                params[smu] = getattr(self.keithley, params[smu + '_name'])
+        params['checkpoint'] = self.spinBoxCheckpoint.value()
+
+        self.apply_smu_settings(params.get('smu_settings'))
+        self.sweep_smu_settings = params.get('smu_settings') or self.get_smu_settings()
+
+        self.measure_key = key
+        self._start_measurement(params, resume=sweep_data)
+        self.statusBar.showMessage('    Resuming %s.' % self.history.label(key))
+
+    def _set_resume_key(self, key):
+        """Sets the sweep which can be resumed, if it has missing points."""
+        self.resume_key = None
+        if key is not None:
+            params = self.history.info(key).get('measure_params')
+            sweep_data, _ = self.history.get(key)
+            if (params is not None and sweep_data.data is not None and
+                    MeasureThread.missing_points(params, sweep_data) > 0):
+                self.resume_key = key
+
+        self.pushButtonResume.setEnabled(self.resume_key is not None and
+                                         self.pushButtonTransfer.isEnabled())
+
     def _on_measure_done(self, sd):
-        self.statusBar.showMessage('    Ready.')
+        if self.monitorThread is not None:
+            self.monitorThread.resume()
         self._gui_state_idle()
+        journal = self.measureThread.journal
+        if journal is not None:
+            self.statusBar.showMessage('    Ready. Journaled %s records in %.0f ms.' % (
+                journal.n_records, journal.overhead * 1e3))
+
+        error = self.measureThread.error
+        if error is not None:
+            msg = 'The measurement stopped with an error:\n%s' % error
+            if sd is not None and sd.data is not None:
+                msg += '\nThe data recorded so far is kept and the sweep can be resumed.'
+            QtWidgets.QMessageBox.information(self, str('error'), msg)
+
+        if sd is None or sd.data is None:
+            return
+
         self.actionSaveSweepData.setEnabled(True)
 
-        self.sweep_data = sd
-        self.canvas.plot(self.sweep_data)
-        if not self.keithley.abort_event.is_set():
-            self._on_save_clicked()
+        if self.measure_key is None or self.measure_key not in self.history:
+            self.n_measurements += 1
+            key = 'measurement %s' % self.n_measurements
+            label = '%s %s' % (self.SWEEP_LABELS.get(sd.params['sweep_type'], 'Sweep'),
+                               time.strftime('%Y-%m-%d %H:%M:%S'))
+        else:  # replace the resumed sweep
+            key = self.measure_key
+            label = self.history.label(key)
+        info = {'smu_settings': self.sweep_smu_settings,
+                'measure_params': self.measureThread.settings()}
+
+        if sd.params['sweep_type'] == 'timeseries':
+            self.sweep_data = sd
+            self.tableDock.setSweepData(self.sweep_data)
+            self.sweepListDock.addSweep(key, label, sd, info)
+            self.stripChartTimer.stop()
+            self.stripChart.update_plot()
+            self.time_series_buffer.close()
+            # an aborted time series is the normal way to end an open-ended run
+            self._save_after_measurement()
+            return
+
+        self.sweepListDock.addSweep(key, label, sd, info, select=True)
+        if not self.keithley.abort_event.is_set() and error is None:
+            self._save_after_measurement()
+
+    @QtCore.Slot(int, int, object)
+    def _on_repetition_done(self, repetition, repeats, sd):
+        """Shows the progress of repeated sweeps and lists kept single sweeps."""
+        self.statusBar.showMessage('    Recorded sweep %s of %s.' % (repetition, repeats))
+        if sd is None:
+            return
+
+        key = 'measurement %s #%s' % (self.n_measurements + 1, repetition)
+        label = '%s %s #%s' % (self.SWEEP_LABELS.get(sd.params['sweep_type'], 'Sweep'),
+                               time.strftime('%Y-%m-%d %H:%M:%S'), repetition)
+        self.sweepListDock.addSweep(key, label, sd,
+                                    {'smu_settings': self.sweep_smu_settings})
+
+    def _new_time_series_buffer(self):
+        """Creates a ring buffer for time, gate and drain current."""
+        spill_dir = get_conf_path(osp.join(SUBFOLDER, 'spill'))
+        prune_spill_files(spill_dir, CONF.get('TimeSeries', 'spill_max_age'))
+
+        if self.timeSeriesTab.checkBoxSpill.isChecked():
+            filename = time.strftime('timeseries_%Y-%m-%d_%H-%M-%S.bin')
+            spill_path = osp.join(spill_dir, filename)
+        else:
+            spill_path = None
+
+        self.time_series_buffer = RingBuffer(self.timeSeriesTab.spinBoxBufferSize.value(),
+                                             3, spill_path)
+        return self.time_series_buffer
+
+    def _show_plot(self, plot):
+        """Shows either the sweep canvas or the strip chart."""
+        self.canvas.setVisible(plot is self.canvas)
+        self.stripChart.setVisible(plot is self.stripChart)
+
+    def _set_transform(self, transform):
+        """Shows the derived curves `transform` in both plots."""
+        if transform not in TRANSFORMS:
+            transform = 'current'
+        for action in self.transformGroup.actions():
+            action.setChecked(action.data() == transform)
+        self.canvas.setTransform(transform)
+        self.stripChart.setTransform(transform)
+
+    @QtCore.Slot(QtWidgets.QAction)
+    def _on_transform_selected(self, action):
+        self._set_transform(action.data())
+        CONF.set('Plot', 'transform', action.data())
 
     @QtCore.Slot()
     def _on_abort_clicked(self):
@@ -315,6 +749,51 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         """
         self.keithley.abort_event.set()
 
+    @QtCore.Slot(bool)
+    def _on_monitor_toggled(self, checked):
+        """Start or stop continuous monitoring of all SMUs."""
+        if checked:
+            self.monitorThread = MonitorThread(self.keithley, self.smu_list,
+                                               CONF.get('Monitor', 'interval'))
+            if self.measureThread is not None and self.measureThread.isRunning():
+                self.monitorThread.pause()
+            self.monitorThread.start()
+            self.monitorTimer.start(self._frame_interval())
+        else:
+            self._stop_monitor()
+
+        for tab in self.smu_tabs:
+            tab.setMonitorVisible(checked)
+
+    @QtCore.Slot()
+    def _on_monitor_timeout(self):
+        """Show the latest SMU readings, if any arrived since the last frame."""
+        readings = self.monitorThread.pop_readings()
+        if readings is None:
+            return
+
+        for tab in self.smu_tabs:
+            if tab.smu_name in readings:
+                v, i = readings[tab.smu_name]
+                tab.readingSpinBoxV.updateValue(v)
+                tab.readingSpinBoxI.updateValue(i)
+
+    def _stop_monitor(self):
+        self.monitorTimer.stop()
+        if self.monitorThread is not None:
+            self.monitorThread.stop()
+            self.monitorThread.wait()
+            self.monitorThread = None
+
+    @staticmethod
+    def _frame_interval():
+        """Returns the refresh interval of the primary screen in ms."""
+        screen = QtWidgets.QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        if rate <= 0:
+            rate = 60
+        return int(1000 / rate)
+
 # =============================================================================
 # Interface callbacks
 # =============================================================================
@@ -337,6 +816,13 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         elif int_smu == 1 and len(self.smu_list) < 3:
             self.comboBoxGateSMU.setCurrentIndex(0)
 
+    @QtCore.Slot(bool)
+    def _on_settle_adaptive_toggled(self, checked):
+        """Enables the settle tolerance and maximum time for adaptive settling."""
+        for widget in (self.labelSettleTol, self.doubleSpinBoxSettleTol,
+                       self.labelSettleMax, self.scienDSpinBoxSettleMax):
+            widget.setEnabled(checked)
+
     @QtCore.Slot()
     def _on_connect_clicked(self):
         self.keithley.connect()
@@ -364,21 +850,290 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         if len(filepath) < 4:
             return
         self.sweep_data.save(filepath)
+        # ResultTable.save always replaces the extension with '.txt'
+        filepath = osp.splitext(filepath)[0] + '.txt'
+        self.catalog.add(filepath, self.sweep_data, self.sweep_smu_settings, saved=True)
+        self.catalogDock.refresh()
+
+    @QtCore.Slot()
+    def _recover_journals(self):
+        """Offers to recover the data of measurements which were interrupted."""
+        paths = interrupted_journals(get_conf_path(osp.join(SUBFOLDER, 'journal')))
+        if len(paths) == 0:
+            return
+
+        msg = ('%s measurement(s) were interrupted before they finished. ' % len(paths) +
+               'Recover the data acquired so far?')
+        buttons = (QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No |
+                   QtWidgets.QMessageBox.Discard)
+        reply = QtWidgets.QMessageBox.question(self, 'Recover measurements', msg,
+                                               buttons, QtWidgets.QMessageBox.Yes)
+        if reply == QtWidgets.QMessageBox.No:
+            return  # ask again on next start
+
+        for path in paths:
+            if reply == QtWidgets.QMessageBox.Yes:
+                try:
+                    sweep_data, settings, started = recover_sweep(path)
+                except (IOError, OSError, ValueError) as e:
+                    msg = 'Could not recover %s:\n%s' % (path, e)
+                    QtWidgets.QMessageBox.information(self, str('error'), msg)
+                    continue
+                if sweep_data is not None:
+                    label = 'Recovered %s %s' % (
+                        self.SWEEP_LABELS.get(sweep_data.params['sweep_type'], 'Sweep'),
+                        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started)))
+                    info = {'smu_settings': (settings or {}).get('smu_settings'),
+                            'measure_params': settings}
+                    self.sweepListDock.addSweep(path, label, sweep_data, info,
+                                                select=True)
+                    self.sweepListDock.show()
+            try:
+                remove_journal(path)
+            except OSError as e:
+                msg = 'Could not remove %s:\n%s' % (path, e)
+                QtWidgets.QMessageBox.information(self, str('error'), msg)
+
+    @staticmethod
+    def _autosave_directory():
+        return CONF.get('Autosave', 'directory') or osp.expanduser('~')
+
+    @staticmethod
+    def _autosave_spool_directory():
+        spool_dir = CONF.get('Autosave', 'spool_directory')
+        return spool_dir or get_conf_path(osp.join(SUBFOLDER, 'spool'))
+
+    def _save_after_measurement(self):
+        """
+        Queues the current sweep data for saving in the background if autosave is
+        enabled. Otherwise, or if the file name template is invalid, asks for a file.
+        """
+        if not CONF.get('Autosave', 'enabled'):
+            self._on_save_clicked()
+            return
+
+        counter = CONF.get('Autosave', 'counter')
+        try:
+            filename = format_filename(CONF.get('Autosave', 'template'),
+                                       CONF.get('Autosave', 'sample'),
+                                       self.sweep_data.params['sweep_type'], counter)
+        except ValueError as e:
+            QtWidgets.QMessageBox.information(self, str('error'), str(e))
+            self._on_save_clicked()
+            return
+
+        CONF.set('Autosave', 'counter', counter + 1)
+        spool_dir = None
+        if CONF.get('Autosave', 'spool'):
+            spool_dir = self._autosave_spool_directory()
+
+        self.autosaveThread.put(self.sweep_data, filename, self._autosave_directory(),
+                                spool_dir, CONF.get('Autosave', 'atomic'),
+                                self.sweep_smu_settings)
+        self.statusBar.showMessage('    Saving %s.' % filename)
+
+    @QtCore.Slot(str)
+    def _on_autosaved(self, filepath):
+        self._record_autosaved()
+        self.statusBar.showMessage('    Saved %s.' % filepath)
+
+    def _record_autosaved(self):
+        """Records all files saved in the background in the catalog."""
+        saved = self.autosaveThread.pop_saved()
+        for filepath, sweep_data, smu_settings in saved:
+            self.catalog.add(filepath, sweep_data, smu_settings, saved=True)
+        if len(saved) > 0:
+            self.catalogDock.refresh()
+
+    @QtCore.Slot(str, str)
+    def _on_autosave_failed(self, filepath, error):
+        msg = 'Could not save %s:\n%s' % (filepath, error)
+        QtWidgets.QMessageBox.information(self, str('error'), msg)
 
     @QtCore.Slot()
     def _on_load_clicked(self):
-        """Show GUI to load sweep data from file."""
-        prompt = 'Please select a data file.'
-        filepath, _ = QtWidgets.QFileDialog.getOpenFileName(self, prompt)
+        """Show GUI to load sweep data from one or more files."""
+        prompt = 'Please select data files.'
+        filepaths, _ = QtWidgets.QFileDialog.getOpenFileNames(self, prompt)
+        filepaths = [f for f in filepaths if osp.isfile(f)]
+        if len(filepaths) == 0:
+            return
+
+        self.load_files(filepaths)
+
+    @QtCore.Slot(str)
+    def load_sweep_data(self, filepath):
+        """Loads and plots sweep data from a file."""
         if not osp.isfile(filepath):
+            msg = 'The file %s no longer exists.' % filepath
+            QtWidgets.QMessageBox.information(self, str('error'), msg)
+            self.catalog.remove(filepath)
+            self.catalogDock.refresh()
+            return
+
+        self.load_files([filepath])
+
+    def load_files(self, filepaths):
+        """
+        Loads sweep data files in the background. Sweeps are added to the list of
+        loaded sweeps as they arrive and the first one is plotted.
+        """
+        self._stop_loading()
+
+        self.loadThread = LoadThread(filepaths)
+        self.loadThread.loadedSig.connect(self._on_file_loaded)
+        self.loadThread.failedSig.connect(self._on_file_failed)
+        self.loadThread.progressSig.connect(self._on_load_progress)
+        self.loadThread.finished.connect(self._on_load_finished)
+        self._load_selected = False
+        self._load_errors = []
+
+        self.loadProgressBar.setRange(0, len(filepaths))
+        self.loadProgressBar.setValue(0)
+        self.loadProgressBar.show()
+        self.loadCancelButton.show()
+        if len(filepaths) > 1:
+            self.sweepListDock.show()
+
+        self.loadThread.start()
+
+    @QtCore.Slot()
+    def _stop_loading(self):
+        if self.loadThread is not None:
+            self.loadThread.stop()
+            self.loadThread.wait()
+
+    @QtCore.Slot(str, object)
+    def _on_file_loaded(self, filepath, sweep_data):
+        # select the first sweep of a batch, further sweeps are only listed
+        self.sweepListDock.addSweep(filepath, osp.basename(filepath), sweep_data,
+                                    select=not self._load_selected)
+        self._load_selected = True
+        self.catalog.add(filepath, sweep_data)
+        self._queue_analysis(filepath, sweep_data)
+
+    @QtCore.Slot(str, str)
+    def _on_file_failed(self, filepath, error):
+        self._load_errors.append('%s (%s)' % (osp.basename(filepath), error))
+
+    @QtCore.Slot(int, int)
+    def _on_load_progress(self, n_done, n_total):
+        self.loadProgressBar.setValue(n_done)
+        self.statusBar.showMessage('    Loaded %s of %s files.' % (n_done, n_total))
+
+    @QtCore.Slot()
+    def _on_load_finished(self):
+        self.loadProgressBar.hide()
+        self.loadCancelButton.hide()
+        self.catalogDock.refresh()
+
+        if len(self._load_errors) > 0:
+            msg = 'Could not load the following files:\n' + '\n'.join(self._load_errors)
+            QtWidgets.QMessageBox.information(self, str('error'), msg)
+
+    @QtCore.Slot(object)
+    def _on_sweep_list_selection(self, keys):
+        """Plots the selected sweeps, overlaid if they share the same x-data."""
+        self.shown_keys = list(keys)
+
+        if len(keys) == 1:
+            key = keys[0]
+            sweep_data, arrays = self.history.get(key)
+            self.history.set_arrays(key, self._show_sweep(sweep_data, arrays))
+            self.sweep_smu_settings = self.history.info(key).get('smu_settings')
+            self._set_resume_key(key)
+            self._show_analysis()
             return
 
-        self.sweep_data = TransistorSweepData()
-        self.sweep_data.load(filepath)
+        self._set_resume_key(None)
+        self._show_analysis()
 
-        self.canvas.plot(self.sweep_data)
+        sweeps = [(self.history.label(k), self.history.get(k)[0]) for k in keys]
+        sweep_data = combine_sweeps(sweeps)
+        if sweep_data is None:
+            self.statusBar.showMessage('    Only sweeps with identical x-data ' +
+                                       'can be overlaid.')
+            return
+
+        self._show_sweep(sweep_data)
+        self.sweep_smu_settings = None
+
+    def _show_sweep(self, sweep_data, arrays=None):
+        """
+        Shows sweep data in the canvas and the data table. Returns the plot arrays,
+        which can be passed again to show the same sweep faster.
+        """
+        self.sweep_data = sweep_data
+        self.tableDock.setSweepData(self.sweep_data)
+
+        self._show_plot(self.canvas)
+        arrays = self.canvas.plot(self.sweep_data, arrays)
         self.actionSaveSweepData.setEnabled(True)
 
+        return arrays
+
+# =============================================================================
+# Transistor parameters
+# =============================================================================
+
+    def _queue_analysis(self, key, sweep_data):
+        """Queues the extraction of transistor parameters from a transfer sweep."""
+        if sweep_data.params.get('sweep_type') == 'transfer' and \
+                key not in self.analysis_pending:
+            self.analysis_pending.add(key)
+            self.analysisThread.put(key, sweep_data, self.parameterDock.dimensions())
+
+    def _show_analysis(self):
+        """
+        Shows the parameters of all shown sweeps and, for a single sweep, its fits.
+        Sweeps without parameters for the current dimensions are queued.
+        """
+        dimensions = self.parameterDock.dimensions()
+        results = []
+
+        for key in self.shown_keys:
+            if key not in self.history:
+                continue
+            analysis = self.history.info(key).get('analysis')
+            if analysis is not None and analysis[0] == dimensions:
+                results.append((self.history.label(key), analysis[1]))
+            else:
+                self._queue_analysis(key, self.history.get(key)[0])
+
+        n_pending = len(self.analysis_pending.intersection(self.shown_keys))
+        self.parameterDock.setResults(
+            results, '%s sweep(s) in progress' % n_pending if n_pending > 0 else '')
+
+        if len(self.shown_keys) == 1 and len(results) == 1 and \
+                self.parameterDock.showFits():
+            self.canvas.setOverlays([(r['name'],) + r['fit'] for r in results[0][1]])
+        else:
+            self.canvas.setOverlays([])
+
+    @QtCore.Slot(object, object, object)
+    def _on_analysis_done(self, key, dimensions, results):
+        self.analysis_pending.discard(key)
+        if key not in self.history:
+            return
+        self.history.info(key)['analysis'] = (dimensions, results)
+        if key in self.shown_keys:
+            self._show_analysis()
+
+    @QtCore.Slot(object)
+    def _on_dimensions_changed(self, dimensions):
+        width, length, capacitance = dimensions
+        CONF.set('Analysis', 'width', width)
+        CONF.set('Analysis', 'length', length)
+        CONF.set('Analysis', 'capacitance', capacitance)
+        # other sweeps are updated when they are shown again
+        self.analysis_pending.difference_update(self.shown_keys)
+        self._show_analysis()
+
+    @QtCore.Slot(bool)
+    def _on_show_fits_toggled(self, checked):
+        CONF.set('Analysis', 'show_fits', checked)
+        self._show_analysis()
+
     @QtCore.Slot()
     def _on_save_default(self):
         """Saves current settings from GUI as defaults."""
@@ -408,9 +1163,26 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
         CONF.set('Sweep', 'smu_sweep', self.comboBoxSweepSMU.currentText())
 
+        # save time series settings
+        CONF.set('TimeSeries', 'Vg', self.timeSeriesTab.scienDSpinBoxVg.value())
+        CONF.set('TimeSeries', 'Vd', self.timeSeriesTab.scienDSpinBoxVd.value())
+        CONF.set('TimeSeries', 'interval',
+                 self.timeSeriesTab.scienDSpinBoxInterval.value())
+        CONF.set('TimeSeries', 'duration',
+                 self.timeSeriesTab.scienDSpinBoxDuration.value())
+        CONF.set('TimeSeries', 'buffer_size',
+                 self.timeSeriesTab.spinBoxBufferSize.value())
+        CONF.set('TimeSeries', 'spill', self.timeSeriesTab.checkBoxSpill.isChecked())
+
         # save general settings
         CONF.set('Sweep', 'tInt', self.scienDSpinBoxInt.value())
         CONF.set('Sweep', 'delay', self.scienDSpinBoxSettling.value())
+        CONF.set('Sweep', 'checkpoint', self.spinBoxCheckpoint.value())
+        CONF.set('Sweep', 'repeats', self.spinBoxRepeats.value())
+        CONF.set('Sweep', 'keep_raw', self.checkBoxKeepRaw.isChecked())
+        CONF.set('Sweep', 'settle_adaptive', self.checkBoxSettleAdaptive.isChecked())
+        CONF.set('Sweep', 'settle_rtol', self.doubleSpinBoxSettleTol.value() / 100)
+        CONF.set('Sweep', 'settle_max_wait', self.scienDSpinBoxSettleMax.value())
 
         # get combo box status
         idx_pulsed = self.comboBoxSweepType.currentIndex()
@@ -429,6 +1201,11 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
             CONF.set(tab.smu_name, 'limiti', tab.scienceSpinBoxLimI.value())
             CONF.set(tab.smu_name, 'limitv', tab.scienceSpinBoxLimV.value())
 
+            enable, filter_type, count = tab.filterSettings()
+            CONF.set(tab.smu_name, 'filter_enable', enable)
+            CONF.set(tab.smu_name, 'filter_type', filter_type)
+            CONF.set(tab.smu_name, 'filter_count', count)
+
     @QtCore.Slot()
     def _on_load_default(self):
         """Load default settings to interface."""
@@ -463,9 +1240,25 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
         self.comboBoxGateSMU.setCurrentIndex(idx_sweep)
 
+        # time series settings
+        tab = self.timeSeriesTab
+        tab.scienDSpinBoxVg.setValue(CONF.get('TimeSeries', 'Vg'))
+        tab.scienDSpinBoxVd.setValue(CONF.get('TimeSeries', 'Vd'))
+        tab.scienDSpinBoxInterval.setValue(CONF.get('TimeSeries', 'interval'))
+        tab.scienDSpinBoxDuration.setValue(CONF.get('TimeSeries', 'duration'))
+        tab.spinBoxBufferSize.setValue(CONF.get('TimeSeries', 'buffer_size'))
+        tab.checkBoxSpill.setChecked(CONF.get('TimeSeries', 'spill'))
+
         # other
         self.scienDSpinBoxInt.setValue(CONF.get('Sweep', 'tInt'))
         self.scienDSpinBoxSettling.setValue(CONF.get('Sweep', 'delay'))
+        self.spinBoxCheckpoint.setValue(CONF.get('Sweep', 'checkpoint'))
+        self.spinBoxRepeats.setValue(CONF.get('Sweep', 'repeats'))
+        self.checkBoxKeepRaw.setChecked(CONF.get('Sweep', 'keep_raw'))
+        self.checkBoxSettleAdaptive.setChecked(CONF.get('Sweep', 'settle_adaptive'))
+        self.doubleSpinBoxSettleTol.setValue(CONF.get('Sweep', 'settle_rtol') * 100)
+        self.scienDSpinBoxSettleMax.setValue(CONF.get('Sweep', 'settle_max_wait'))
+        self._on_settle_adaptive_toggled(self.checkBoxSettleAdaptive.isChecked())
 
         # set PULSED comboBox index (0 if pulsed == False, 1 if pulsed == True)
         pulsed = CONF.get('Sweep', 'pulsed')
@@ -502,11 +1295,23 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
 
             tab.scienceSpinBoxLimI.setValue(CONF.get(tab.smu_name, 'limiti'))
             tab.scienceSpinBoxLimV.setValue(CONF.get(tab.smu_name, 'limitv'))
+            tab.setFilterSettings(CONF.get(tab.smu_name, 'filter_enable'),
+                                  CONF.get(tab.smu_name, 'filter_type'),
+                                  CONF.get(tab.smu_name, 'filter_count'))
 
     @QtCore.Slot()
     def exit_(self):
+        self._stop_monitor()
+        self._stop_loading()
+        self.autosaveThread.stop()
+        self.autosaveThread.wait()
+        self.analysisThread.stop()
+        self.analysisThread.wait()
+        self._record_autosaved()
+        self.history.clear()
         self.keithley.disconnect()
         self.timer.stop()
+        self.catalog.close()
         self.save_geometry()
         self.deleteLater()
 
@@ -536,13 +1341,16 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.pushButtonTransfer.setEnabled(False)
         self.pushButtonOutput.setEnabled(False)
         self.pushButtonIV.setEnabled(False)
+        self.timeSeriesTab.pushButtonRun.setEnabled(False)
         self.pushButtonAbort.setEnabled(True)
+        self.pushButtonResume.setEnabled(False)
 
         self.actionConnect.setEnabled(False)
         self.actionDisconnect.setEnabled(False)
 
         self.statusBar.showMessage('    Measuring.')
         self.led.setChecked(True)
+        self.led.setBusy(True)
 
     def _gui_state_idle(self):
         """Set GUI to state for IDLE Keithley."""
@@ -550,12 +1358,15 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.pushButtonTransfer.setEnabled(True)
         self.pushButtonOutput.setEnabled(True)
         self.pushButtonIV.setEnabled(True)
+        self.timeSeriesTab.pushButtonRun.setEnabled(True)
         self.pushButtonAbort.setEnabled(False)
+        self.pushButtonResume.setEnabled(self.resume_key is not None)
 
         self.actionConnect.setEnabled(False)
         self.actionDisconnect.setEnabled(True)
         self.statusBar.showMessage('    Ready.')
         self.led.setChecked(True)
+        self.led.setBusy(False)
 
     def _gui_state_disconnected(self):
         """Set GUI to state for disconnected Keithley."""
@@ -563,63 +1374,478 @@ class KeithleyGuiApp(QtWidgets.QMainWindow):
         self.pushButtonTransfer.setEnabled(False)
         self.pushButtonOutput.setEnabled(False)
         self.pushButtonIV.setEnabled(False)
+        self.timeSeriesTab.pushButtonRun.setEnabled(False)
         self.pushButtonAbort.setEnabled(False)
+        self.pushButtonResume.setEnabled(False)
 
         self.actionConnect.setEnabled(True)
         self.actionDisconnect.setEnabled(False)
         self.statusBar.showMessage('    No Keithley connected.')
         self.led.setChecked(False)
+        self.led.setBusy(False)
 
 
 class MeasureThread(QtCore.QThread):
+    """
+    Runs a measurement. Sweeps are recorded in segments of `params['checkpoint']`
+    points, or curve by curve if it is zero. Every segment is a checkpoint: it is
+    appended to a journal, see :class:`keithleygui.utils.journal.SweepJournal`, and
+    kept if the measurement is aborted or fails, e.g., because the connection is
+    lost. Points which were not recorded are NaN. Such a sweep can be resumed by
+    passing its data as `resume`, which only records the missing points.
+
+    The journal is deleted when the measurement finishes and is only left behind if
+    the program dies. If the measurement fails, :attr:`error` holds the message.
+
+    Transfer, output and IV sweeps are repeated `params['repeats']` times, see
+    :meth:`repeated_sweep`.
+    """
 
     startedSig = QtCore.Signal()
     finishedSig = QtCore.Signal(object)
+    repetitionSig = QtCore.Signal(int, int, object)
 
-    def __init__(self, keithley, params):
+    # transfer and output sweeps: swept voltage, list of stepped voltages, name of
+    # the swept voltage column, label of the stepped voltage in column names (the
+    # driver labels output curves with 'Vd' as well), whether the gate is swept
+    TRANSISTOR_SWEEPS = {
+        'transfer': ('Vg', 'VdList', 'Gate voltage', 'Vd', True),
+        'output': ('Vd', 'VgList', 'Drain voltage', 'Vd', False),
+    }
+
+    def __init__(self, keithley, params, journal_dir=None, resume=None):
         QtCore.QThread.__init__(self)
         self.keithley = keithley
         self.params = params
+        self.journal_dir = journal_dir
+        self.journal = None
+        self.resume = resume
+        self.sweep_data = None
+        self.error = None
 
     def __del__(self):
         self.wait()
 
+    @classmethod
+    def sweeplist(cls, params):
+        """Returns the swept voltages of a transfer, output or IV sweep."""
+        if params['sweep_type'] == 'iv':
+            direction = np.sign(params['VStop'] - params['VStart'])
+            stp = direction * abs(params['VStep'])
+            return np.arange(params['VStart'], params['VStop'] + stp, stp)
+
+        # forward and reverse sweep, always include a step >= the stop voltage
+        swept = cls.TRANSISTOR_SWEEPS[params['sweep_type']][0]
+        start, stop = params[swept + 'Start'], params[swept + 'Stop']
+        step = np.sign(stop - start) * abs(params[swept + 'Step'])
+        sweeplist_fwd = np.arange(start, stop + step, step)
+        return np.append(sweeplist_fwd, np.flip(sweeplist_fwd, 0))
+
+    @staticmethod
+    def _curve_names(label, v_step):
+        return ['%s current (%s = %s)' % (n, label, v_step)
+                for n in ('Source', 'Drain', 'Gate')]
+
+    @classmethod
+    def missing_points(cls, params, sweep_data):
+        """Returns the number of points of a sweep which have not been recorded."""
+        if params['sweep_type'] == 'iv':
+            return len(cls.sweeplist(params)) - sweep_data.nrows
+        elif params['sweep_type'] not in cls.TRANSISTOR_SWEEPS:
+            return 0
+
+        _, stepped_key, _, label, _ = cls.TRANSISTOR_SWEEPS[params['sweep_type']]
+        n = len(cls.sweeplist(params))
+        names = sweep_data.column_names
+        missing = 0
+
+        for v_step in params[stepped_key]:
+            name = cls._curve_names(label, v_step)[0]
+            if name in names:
+                i = names.index(name)
+                missing += np.isnan(sweep_data.data[:, i:i + 3]).any(axis=1).sum()
+            else:
+                missing += n
+
+        return int(missing)
+
+    def settings(self):
+        """Returns all settings which can be saved, without SMU objects."""
+        types = (bool, int, float, str, list, dict, type(None))
+        return dict((k, v) for k, v in self.params.items() if isinstance(v, types))
+
+    def _start_journal(self, sweep_type, params, names=(), units=(), data=None):
+        if self.journal_dir is None or self.journal is not None:
+            return  # repetitions are appended to the journal of the first one
+        self.journal = SweepJournal.create(self.journal_dir)
+        self.journal.start(sweep_type, params, names, units, data, self.settings())
+
+    def _segments(self, start, stop):
+        """Yields the first and last index of all segments between start and stop."""
+        n = self.params.get('checkpoint', 0) or stop - start
+        for i in range(start, stop, n):
+            yield i, min(i + n, stop)
+
+    def _sweep_params(self):
+        """Returns the parameters stored with a transfer, output or IV sweep."""
+        p = self.params
+        params = {'sweep_type': p['sweep_type'], 't_int': p['tInt'],
+                  'delay': p['delay'], 'pulsed': p['pulsed']}
+        if p.get('settle_adaptive'):
+            params['settle_rtol'] = p['settle_rtol']
+            params['settle_max_wait'] = p['settle_max_wait']
+        return params
+
+    def _settled_sweep(self, smus, sweeplists, measure_v=False):
+        """
+        Steps the voltages of `smus` point by point through `sweeplists` and measures
+        their currents once they have settled, see
+        :func:`keithleygui.utils.settling.wait_until_settled`. Stops after the
+        current point if the measurement is aborted.
+
+        :returns: Tuple (voltages, currents, settle_times). Voltages and currents
+            have one row per point and one column per SMU, voltages are `None`
+            unless `measure_v` is True.
+        """
+        p = self.params
+
+        for smu in smus:
+            self.keithley.setIntegrationTime(smu, p['tInt'])
+            smu.measure.delay = 0  # settling is detected instead
+            smu.measure.autorangei = smu.AUTORANGE_ON
+            smu.source.func = smu.OUTPUT_DCVOLTS
+            smu.source.output = smu.OUTPUT_ON
+
+        def measure():
+            return [smu.measure.i() for smu in smus]
+
+        voltages, currents, settle_times = [], [], []
+
+        for levels in zip(*sweeplists):
+            if self.keithley.abort_event.is_set():
+                break
+
+            for smu, level in zip(smus, levels):
+                smu.source.levelv = level
+
+            readings, settle_time, _ = wait_until_settled(
+                    measure, p['settle_rtol'], p['settle_max_wait'],
+                    abort_event=self.keithley.abort_event)
+
+            if measure_v:
+                voltages.append([smu.measure.v() for smu in smus])
+            currents.append(readings)
+            settle_times.append(settle_time)
+
+        shape = (len(currents), len(smus))
+        voltages = np.reshape(voltages, shape) if measure_v else None
+
+        return voltages, np.reshape(currents, shape), np.array(settle_times)
+
     def run(self):
         self.startedSig.emit()
-        sweep_data = None
-
-        if self.params['sweep_type'] == 'transfer':
-            sweep_data = self.keithley.transferMeasurement(
-                    self.params['smu_gate'], self.params['smu_drain'],
-                    self.params['VgStart'], self.params['VgStop'], self.params['VgStep'],
-                    self.params['VdList'], self.params['tInt'], self.params['delay'],
-                    self.params['pulsed']
-                    )
-        elif self.params['sweep_type'] == 'output':
-            sweep_data = self.keithley.outputMeasurement(
-                    self.params['smu_gate'], self.params['smu_drain'],
-                    self.params['VdStart'], self.params['VdStop'], self.params['VdStep'],
-                    self.params['VgList'], self.params['tInt'], self.params['delay'],
-                    self.params['pulsed']
-                    )
-
-        elif self.params['sweep_type'] == 'iv':
-            direction = np.sign(self.params['VStop'] - self.params['VStart'])
-            stp = direction * abs(self.params['VStep'])
-            sweeplist = np.arange(self.params['VStart'], self.params['VStop'] + stp, stp)
-            v_sweep, i_sweep = self.keithley.voltageSweepSingleSMU(
-                    self.params['smu_sweep'], sweeplist, self.params['tInt'],
-                    self.params['delay'], self.params['pulsed']
-                    )
 
-            self.keithley.reset()
+        try:
+            if self.params.get('repeats', 1) > 1 and self.resume is None and \
+                    self.params['sweep_type'] in ('transfer', 'output', 'iv'):
+                self.repeated_sweep()
+            elif self.params['sweep_type'] in self.TRANSISTOR_SWEEPS:
+                self.transistor_sweep()
+            elif self.params['sweep_type'] == 'iv':
+                self.iv_sweep()
+            elif self.params['sweep_type'] == 'timeseries':
+                self.sweep_data = self.time_series()
+        except Exception as e:  # keep the data recorded so far, e.g., on VISA errors
+            self.error = '%s: %s' % (type(e).__name__, e)
+            if self.params['sweep_type'] == 'timeseries':
+                self.sweep_data = self._time_series_data()
+            self.keithley.busy = False
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+
+        self.finishedSig.emit(self.sweep_data)
+
+    def repeated_sweep(self):
+        """
+        Repeats a transfer, output or IV sweep and keeps the mean and standard
+        deviation of every point, see :class:`RunningStatistics`. Only the running
+        statistics are kept in memory. Single sweeps are emitted with
+        :attr:`repetitionSig` as (repetition, repeats, sweep_data) and dropped
+        unless `params['keep_raw']` is True. The instrument is only reset after the
+        last repetition. An aborted repetition still contributes the points recorded
+        until the abort. If a repetition fails, the average of all previous ones is
+        kept.
+
+        All repetitions are appended to one journal, with the running statistics
+        after each one, so that a crash keeps the average of all finished
+        repetitions.
+        """
+        p = self.params
+        repeats = p['repeats']
+        stats = None
+        first = None  # first repetition, which has all columns and rows
 
-            sweep_data = IVSweepData(v_sweep, i_sweep)
-            sweep_data.params = {'sweep_type': 'iv', 't_int': self.params['tInt'],
-                                 'delay': self.params['delay'],
-                                 'pulsed': self.params['pulsed']}
+        try:
+            for repetition in range(1, repeats + 1):
+                if p['sweep_type'] == 'iv':
+                    self.iv_sweep(finish=False)
+                else:
+                    self.transistor_sweep(finish=False)
+
+                sweep_data = self.sweep_data
+                if sweep_data.data is None:
+                    break
+                if stats is None:
+                    first = sweep_data
+                    stats = RunningStatistics(sweep_data.data.shape)
+                stats.add(sweep_data.data)
+                if self.journal is not None:
+                    self.journal.append_statistics(first.column_names,
+                                                   first.column_units, stats)
+
+                self.repetitionSig.emit(repetition, repeats,
+                                        sweep_data if p.get('keep_raw') else None)
+
+                if self.keithley.abort_event.is_set():
+                    break
+        finally:
+            if stats is not None:
+                self.sweep_data = averaged_sweep(first, stats)
+
+        self.keithley.reset()
+        if p['sweep_type'] != 'iv':
+            self.keithley.beeper.beep(0.3, 2400)
+        self.keithley.busy = False
+
+    def transistor_sweep(self, finish=True):
+        """
+        Records a transfer or output sweep like :meth:`Keithley2600.transferMeasurement`
+        and :meth:`Keithley2600.outputMeasurement`, one curve per stepped voltage.
+        The instrument is reset at the end if `finish` is True.
+        """
+        p = self.params
+        _, stepped_key, x_name, label, gate_swept = self.TRANSISTOR_SWEEPS[
+                p['sweep_type']]
 
-        self.finishedSig.emit(sweep_data)
+        if gate_swept:
+            smu_swept, smu_stepped = p['smu_gate'], p['smu_drain']
+        else:
+            smu_swept, smu_stepped = p['smu_drain'], p['smu_gate']
+
+        self.keithley.busy = True
+        self.keithley.abort_event.clear()
+
+        sweeplist = self.sweeplist(p)
+        n = len(sweeplist)
+
+        if self.resume is None:
+            params = self._sweep_params()
+            self.sweep_data = TransistorSweepData(params=params)
+            self.sweep_data.append_column(sweeplist, name=x_name, unit='V')
+        else:
+            self.sweep_data = TransistorSweepData(
+                    self.resume.column_names, self.resume.column_units,
+                    self.resume.data.copy(), dict(self.resume.params))
+
+        sd = self.sweep_data
+        self._start_journal(p['sweep_type'], sd.params, sd.column_names,
+                            sd.column_units, sd.data)
+
+        for v_step in p[stepped_key]:
+            if self.keithley.abort_event.is_set():
+                break
+
+            names = self._curve_names(label, v_step)
+            settle_name = settle_column_name(label, v_step)
+            if names[0] in sd.column_names:
+                i = sd.column_names.index(names[0])
+                missing = np.flatnonzero(np.isnan(sd.data[:, i:i + 3]).any(axis=1))
+                start = missing[0] if missing.size > 0 else n
+            else:
+                for name in names:
+                    sd.append_column(np.full(n, np.nan), name=name, unit='A')
+                i, start = sd.ncols - 3, 0
+                if p.get('settle_adaptive'):
+                    sd.append_column(np.full(n, np.nan), name=settle_name, unit='s')
+
+            if v_step == 'trailing':
+                sweeplist_stepped = sweeplist
+            else:
+                sweeplist_stepped = np.full_like(sweeplist, v_step)
+
+            for i0, i1 in self._segments(start, n):
+                if self.keithley.abort_event.is_set():
+                    break
+
+                if p.get('settle_adaptive'):
+                    _, currents, settle_times = self._settled_sweep(
+                            (smu_swept, smu_stepped),
+                            (sweeplist[i0:i1], sweeplist_stepped[i0:i1]))
+                    i_swept, i_stepped = currents.T
+                else:
+                    _, i_swept, _, i_stepped = self.keithley.voltageSweepDualSMU(
+                            smu_swept, smu_stepped, sweeplist[i0:i1],
+                            sweeplist_stepped[i0:i1], p['tInt'], p['delay'],
+                            p['pulsed'])
+                    self.keithley.busy = True  # the driver clears it after every sweep
+                    settle_times = None
+                    if len(i_swept) != i1 - i0:
+                        break  # aborted before the sweep started
+
+                i2 = i0 + len(i_swept)  # adaptive sweeps stop at the last point on abort
+                if i2 == i0:
+                    break
+
+                i_g, i_d = (i_swept, i_stepped) if gate_swept else (i_stepped, i_swept)
+                segment = np.column_stack([np.add(i_d, i_g), i_d, i_g])
+                sd.data[i0:i2, i:i + 3] = segment
+                if self.journal is not None:
+                    self.journal.append_segment(names, ['A'] * 3, i0, n, segment)
+
+                if settle_times is not None and settle_name in sd.column_names:
+                    sd.data[i0:i2, sd.column_names.index(settle_name)] = settle_times
+                    if self.journal is not None:
+                        self.journal.append_segment([settle_name], ['s'], i0, n,
+                                                    settle_times[:, np.newaxis])
+
+        if finish:
+            self.keithley.reset()
+            self.keithley.beeper.beep(0.3, 2400)
+            self.keithley.busy = False
+
+    def iv_sweep(self, finish=True):
+        p = self.params
+        self.keithley.busy = True
+        self.keithley.abort_event.clear()
+
+        self.sweep_data = IVSweepData()
+        if self.resume is None:
+            self.sweep_data.params = self._sweep_params()
+            if p.get('settle_adaptive'):
+                table = ResultTable(['Voltage', 'Current', settle_column_name()],
+                                    ['V', 'A', 's'])
+                self.sweep_data.titles = table.titles
+        else:
+            self.sweep_data.titles = list(self.resume.titles)
+            if self.resume.data is not None:
+                self.sweep_data.data = self.resume.data.copy()
+            self.sweep_data.params = dict(self.resume.params)
+
+        sd = self.sweep_data
+        self._start_journal('iv', sd.params, sd.column_names, sd.column_units, sd.data)
+
+        sweeplist = self.sweeplist(p)
+        for i0, i1 in self._segments(sd.nrows, len(sweeplist)):
+            if self.keithley.abort_event.is_set():
+                break
+
+            if p.get('settle_adaptive'):
+                voltages, currents, settle_times = self._settled_sweep(
+                        (p['smu_sweep'],), (sweeplist[i0:i1],), measure_v=True)
+                if len(currents) == 0:
+                    break
+                columns = [voltages[:, 0], currents[:, 0]]
+                if sd.ncols > 2:
+                    columns.append(settle_times)
+            else:
+                v_sweep, i_sweep = self.keithley.voltageSweepSingleSMU(
+                        p['smu_sweep'], sweeplist[i0:i1], p['tInt'], p['delay'],
+                        p['pulsed'])
+                self.keithley.busy = True  # the driver clears it after every sweep
+
+                if len(v_sweep) != i1 - i0:
+                    break  # aborted before the sweep started
+                columns = [v_sweep, i_sweep]
+                if sd.ncols > 2:
+                    columns.append(np.full(len(v_sweep), np.nan))
+
+            rows = np.column_stack(columns)
+            sd.append_rows(rows)
+            if self.journal is not None:
+                self.journal.append_rows(rows)
+
+        if finish:
+            self.keithley.reset()
+            self.keithley.busy = False
+
+    def time_series(self):
+        """
+        Holds gate and drain at a fixed bias and samples both currents every
+        `interval` seconds until `duration` has passed or the measurement is
+        aborted. Samples are appended to the ring buffer in `params['buffer']`.
+        Returns the samples held in the buffer as a ResultTable.
+        """
+        smu_gate = self.params['smu_gate']
+        smu_drain = self.params['smu_drain']
+        ring_buffer = self.params['buffer']
+        duration = self.params['duration']
+        interval = self.params['interval']
+
+        self.keithley.busy = True
+        self.keithley.abort_event.clear()
+
+        self._start_journal('timeseries', {
+            'sweep_type': 'timeseries', 't_int': self.params['tInt'],
+            'delay': self.params['delay'], 'Vg': self.params['Vg'],
+            'Vd': self.params['Vd'], 'interval': interval},
+            ['Time', 'Gate current', 'Drain current'], ['s', 'A', 'A'])
+
+        for smu in (smu_gate, smu_drain):
+            self.keithley.setIntegrationTime(smu, self.params['tInt'])
+            smu.measure.delay = self.params['delay']
+            smu.measure.autorangei = smu.AUTORANGE_ON
+            smu.source.func = smu.OUTPUT_DCVOLTS
+
+        self.keithley.applyVoltage(smu_gate, self.params['Vg'])
+        self.keithley.applyVoltage(smu_drain, self.params['Vd'])
+
+        t_start = time.time()
+        t_next = t_start
+
+        while not self.keithley.abort_event.is_set():
+            t = time.time() - t_start
+            if duration > 0 and t > duration:
+                break
+
+            i_g = smu_gate.measure.i()
+            i_d = smu_drain.measure.i()
+            ring_buffer.append((t, i_g, i_d))
+            if self.journal is not None:
+                self.journal.append_row((t, i_g, i_d))
+
+            # wait for next sample, wake up immediately on abort
+            t_next += interval
+            self.keithley.abort_event.wait(max(t_next - time.time(), 0))
+
+        self.keithley.reset()
+        self.keithley.busy = False
+
+        return self._time_series_data()
+
+    def _time_series_data(self):
+        """
+        Returns the samples held in the ring buffer with the class used for loaded
+        time series, see :data:`keithleygui.utils.sweep_loader.SWEEP_CLASSES`.
+        """
+        ring_buffer = self.params['buffer']
+        interval = self.params['interval']
+        params = {'sweep_type': 'timeseries', 't_int': self.params['tInt'],
+                  'delay': self.params['delay'], 'Vg': self.params['Vg'],
+                  'Vd': self.params['Vd'], 'interval': interval,
+                  'n_samples': ring_buffer.n_total}
+        if ring_buffer.spill_path is not None:
+            params['spill_file'] = ring_buffer.spill_path
+
+        table = ResultTable(['Time', 'Gate current', 'Drain current'], ['s', 'A', 'A'],
+                            ring_buffer.data(), params)
+
+        sweep_data = SWEEP_CLASSES.get('timeseries', DEFAULT_CLASS)()
+        sweep_data.titles = table.titles
+        sweep_data.data = table.data
+        sweep_data.params = table.params
+
+        return sweep_data
 
 
 def run():
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+try:
+    from queue import Queue
+except ImportError:  # Python 2
+    from Queue import Queue
+from qtpy import QtCore
+
+from keithleygui.utils.transistor_params import extract_transfer_parameters
+
+
+class AnalysisThread(QtCore.QThread):
+    """
+    Extracts transistor parameters of sweeps from a queue, see
+    :func:`extract_transfer_parameters`. Results are emitted with :attr:`resultSig`
+    as (key, dimensions, results).
+    """
+
+    resultSig = QtCore.Signal(object, object, object)
+
+    def __init__(self):
+        QtCore.QThread.__init__(self)
+        self._queue = Queue()
+
+    def __del__(self):
+        self.wait()
+
+    def put(self, key, sweep_data, dimensions):
+        """
+        Queues a sweep for extraction.
+
+        :param key: Key which is emitted with the results.
+        :param sweep_data: TransistorSweepData of a transfer sweep.
+        :param tuple dimensions: Channel width and length in m and gate capacitance
+            per area in F/cm^2.
+        """
+        self._queue.put((key, sweep_data, dimensions))
+
+    def stop(self):
+        self._queue.put(None)
+
+    def run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            key, sweep_data, dimensions = job
+            try:
+                results = extract_transfer_parameters(sweep_data, *dimensions)
+            except (ValueError, IndexError):
+                results = []  # e.g., a sweep with too few points
+            self.resultSig.emit(key, dimensions, results)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Helpers to save sweeps automatically: file names from templates, atomic writes and
+a local spool folder which is synced to a slower target folder, e.g., a network share.
+"""
+
+from __future__ import division, absolute_import, print_function
+import os
+import os.path as osp
+import re
+import shutil
+import time
+
+
+DEFAULT_TEMPLATE = '{sample}_{sweep_type}_{timestamp}_{counter:04d}.txt'
+TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+
+# characters which are not allowed in file names on common file systems
+_INVALID_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def _sanitize(value):
+    return _INVALID_CHARS.sub('-', str(value)).strip('-.') or 'untitled'
+
+
+def format_filename(template, sample, sweep_type, counter, timestamp=None):
+    """
+    Creates a file name from a template. The template may contain the fields
+    `{sample}`, `{sweep_type}`, `{timestamp}` and `{counter}`, with the usual
+    format specifications, e.g., `{counter:04d}`. Slashes in the template create
+    subfolders, while the field values are stripped of characters which are not
+    allowed in file names. '.txt' is appended if the template has no extension.
+
+    :param str template: Template for the file name.
+    :param str sample: Sample name.
+    :param str sweep_type: Sweep type.
+    :param int counter: Running number of the file.
+    :param float timestamp: Time of the measurement, defaults to now.
+    :returns: Relative file path.
+    :rtype: str
+    :raises ValueError: if the template is invalid.
+    """
+    fields = {
+        'sample': _sanitize(sample),
+        'sweep_type': _sanitize(sweep_type),
+        'timestamp': time.strftime(TIMESTAMP_FORMAT, time.localtime(timestamp)),
+        'counter': int(counter),
+    }
+
+    try:
+        name = template.format(**fields)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError('Invalid file name template "%s": %s' % (template, e))
+
+    name = osp.normpath(name.strip().lstrip('/\\'))
+    if name.startswith('..') or name in ('', '.'):
+        raise ValueError('Invalid file name template "%s"' % template)
+
+    if osp.splitext(name)[1] == '':
+        name += '.txt'
+
+    return name
+
+
+def unique_path(filepath, *directories):
+    """
+    Returns `filepath` or, if a file of that name exists, the first free name with
+    an appended number, e.g., 'name_2.txt'. Relative paths are checked in all given
+    directories.
+    """
+    base, ext = osp.splitext(filepath)
+    candidate = filepath
+    n = 1
+
+    while any(osp.exists(osp.join(d, candidate)) for d in directories or ('',)):
+        n += 1
+        candidate = '%s_%s%s' % (base, n, ext)
+
+    return candidate
+
+
+def _replace(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:  # Python 2
+        if os.name == 'nt' and osp.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _fsync(filepath):
+    with open(filepath, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def save_sweep(sweep_data, filepath, atomic=True):
+    """
+    Saves sweep data as tab delimited text, or as csv for the extension '.csv'.
+    Missing folders are created.
+
+    If `atomic` is True, the data is written to a hidden temporary file in the same
+    folder, flushed to disk and renamed. The file therefore either appears complete
+    or not at all, also if the program or computer crashes during saving.
+
+    :param sweep_data: ResultTable instance.
+    :param str filepath: Path of the file.
+    :param bool atomic: Whether to save atomically.
+    """
+    dirname, basename = osp.split(osp.abspath(filepath))
+    base, ext = osp.splitext(basename)
+
+    if not osp.isdir(dirname):
+        os.makedirs(dirname)
+
+    path = osp.join(dirname, '.%s.tmp%s' % (base, ext)) if atomic else filepath
+
+    if ext.lower() == '.csv':
+        sweep_data.save_csv(path)
+    else:
+        sweep_data.save(path, ext=ext)
+
+    if atomic:
+        _fsync(path)
+        _replace(path, filepath)
+
+
+def spooled_files(spool_dir):
+    """Returns the relative paths of all completely written files in the spool."""
+    files = []
+    for root, _, names in os.walk(spool_dir):
+        for name in sorted(names):
+            if not name.startswith('.'):  # skip temporary files
+                files.append(osp.relpath(osp.join(root, name), spool_dir))
+    return files
+
+
+def sync_spool(spool_dir, target_dir):
+    """
+    Moves all files from the spool folder to the target folder, keeping subfolders.
+    Each file is copied to a temporary name in the target folder, renamed and only
+    then removed from the spool, so that an interrupted sync never loses a file.
+
+    :param str spool_dir: Local spool folder.
+    :param str target_dir: Target folder.
+    :returns: List of the new paths of all moved files.
+    :raises OSError: if a file cannot be moved. Files which were moved before
+        are removed from the spool.
+    """
+    moved = []
+
+    for relpath in spooled_files(spool_dir):
+        src = osp.join(spool_dir, relpath)
+        dst = osp.join(target_dir, unique_path(relpath, target_dir))
+        dirname, basename = osp.split(dst)
+
+        if not osp.isdir(dirname):
+            os.makedirs(dirname)
+
+        tmp = osp.join(dirname, '.%s.tmp' % basename)
+        shutil.copy2(src, tmp)
+        _fsync(tmp)
+        _replace(tmp, dst)
+        os.remove(src)
+        moved.append(dst)
+
+    return moved
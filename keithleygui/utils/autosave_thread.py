@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import os.path as osp
+import threading
+try:
+    from queue import Queue, Empty
+except ImportError:  # Python 2
+    from Queue import Queue, Empty
+from qtpy import QtCore
+
+from keithleygui.utils.autosave import unique_path, save_sweep, spooled_files, sync_spool
+
+
+class AutosaveThread(QtCore.QThread):
+    """
+    Saves sweep data from a queue, one file after the other. Files may be written
+    to a local spool folder first. The spool is then synced to the target folder
+    after each file and, while this fails, retried every :attr:`SYNC_INTERVAL`
+    seconds. :meth:`stop` saves all queued sweeps and syncs once more before the
+    thread finishes.
+
+    :attr:`savedSig` is emitted with the path of each saved file. The saved sweeps
+    are kept until they are collected with :meth:`pop_saved`, also after the thread
+    has finished.
+    """
+
+    savedSig = QtCore.Signal(str)
+    failedSig = QtCore.Signal(str, str)
+
+    SYNC_INTERVAL = 30  # sec
+
+    def __init__(self):
+        QtCore.QThread.__init__(self)
+        self._queue = Queue()
+        self._pending_sync = None  # spool and target folder of a failed sync
+        self._saved = []  # saved files which have not been collected
+        self._lock = threading.Lock()
+
+    def __del__(self):
+        self.wait()
+
+    def put(self, sweep_data, filename, directory, spool_dir=None, atomic=True,
+            smu_settings=None):
+        """
+        Queues sweep data for saving.
+
+        :param sweep_data: ResultTable instance.
+        :param str filename: File path relative to `directory`.
+        :param str directory: Target folder.
+        :param str spool_dir: Local spool folder or `None` to save directly.
+        :param bool atomic: Whether to save atomically.
+        :param smu_settings: SMU settings which are returned by :meth:`pop_saved`.
+        """
+        self._queue.put((sweep_data, filename, directory, spool_dir, atomic,
+                         smu_settings))
+
+    def sync(self, spool_dir, directory):
+        """Queues a sync of files left in the spool folder."""
+        self._queue.put((None, None, directory, spool_dir, None, None))
+
+    def stop(self):
+        self._queue.put(None)
+
+    def pop_saved(self):
+        """
+        Returns a list of (filepath, sweep_data, smu_settings) tuples of all files
+        saved since the last call.
+        """
+        with self._lock:
+            saved, self._saved = self._saved, []
+        return saved
+
+    def _save(self, sweep_data, filename, directory, spool_dir, atomic, smu_settings):
+        if spool_dir is None:
+            filepath = osp.join(directory, unique_path(filename, directory))
+            save_sweep(sweep_data, filepath, atomic)
+        else:
+            # the file keeps its name when it is moved to the target folder
+            filename = unique_path(filename, directory, spool_dir)
+            filepath = osp.join(directory, filename)
+            save_sweep(sweep_data, osp.join(spool_dir, filename), atomic)
+        with self._lock:
+            self._saved.append((filepath, sweep_data, smu_settings))
+        self.savedSig.emit(filepath)
+
+    def _sync(self, spool_dir, directory):
+        try:
+            sync_spool(spool_dir, directory)
+            self._pending_sync = None
+        except (IOError, OSError):
+            self._pending_sync = (spool_dir, directory)
+
+    def run(self):
+        while True:
+            try:
+                timeout = None if self._pending_sync is None else self.SYNC_INTERVAL
+                job = self._queue.get(timeout=timeout)
+            except Empty:
+                self._sync(*self._pending_sync)
+                continue
+
+            if job is None:
+                break
+
+            sweep_data, filename, directory, spool_dir, atomic, smu_settings = job
+            if sweep_data is not None:
+                try:
+                    self._save(*job)
+                except (IOError, OSError) as e:
+                    self.failedSig.emit(osp.join(directory, filename), str(e))
+                    continue
+            if spool_dir is not None and len(spooled_files(spool_dir)) > 0:
+                self._sync(spool_dir, directory)
+
+        if self._pending_sync is not None:
+            self._sync(*self._pending_sync)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import numpy as np
+
+
+class MinMaxPyramid(object):
+    """
+    Level-of-detail representation of a single curve.
+
+    The curve is split into segments of monotonic x-data, for example the forward
+    and reverse branch of a sweep, which allows to clip each segment to the visible
+    x-range with a binary search.
+
+    Each level keeps the indices of the minimum and maximum y-value in every bin of
+    the next finer level, so that peaks survive decimation. Every level is a factor
+    of `FACTOR` smaller than the previous one. Levels are built down to
+    `MIN_POINTS` points. :meth:`select` returns the coarsest data which still has
+    about two points per pixel in the visible x-range.
+
+    :param x: 1D array of x-values.
+    :param y: 1D array of y-values.
+    """
+
+    FACTOR = 4
+    MIN_POINTS = 1000
+    # with more monotonic segments, the x-range is not used to clip the data
+    MAX_SEGMENTS = 100
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+
+        self.segments = self._monotonic_segments(self.x)
+
+        self.levels = [np.arange(len(self.x))]
+        while len(self.levels[-1]) > self.MIN_POINTS:
+            self.levels.append(self._decimate(self.levels[-1]))
+
+    def _decimate(self, indices):
+        """
+        Reduces an index array by `FACTOR`, keeping the min and max per bin.
+        Entries which do not fill a complete bin are kept as they are.
+        """
+        bin_size = 2 * self.FACTOR
+        n_full = len(indices) // bin_size * bin_size
+
+        bins = indices[:n_full].reshape(-1, bin_size)
+        values = self.y[bins]
+        is_nan = np.isnan(values)  # ignore NaNs, they would hide the peaks of a bin
+        rows = np.arange(len(bins))
+        i_min = bins[rows, np.argmin(np.where(is_nan, np.inf, values), axis=1)]
+        i_max = bins[rows, np.argmax(np.where(is_nan, -np.inf, values), axis=1)]
+
+        # keep min and max in their original order
+        decimated = np.empty(2 * len(bins), dtype=indices.dtype)
+        decimated[0::2] = np.minimum(i_min, i_max)
+        decimated[1::2] = np.maximum(i_min, i_max)
+
+        return np.append(decimated, indices[n_full:])
+
+    def _monotonic_segments(self, x):
+        """
+        Returns a list of (start, stop, direction) of segments with monotonic
+        x-data. Also stores x multiplied by the direction of its segment, which
+        is increasing within every segment and can be searched directly.
+        """
+        n = len(x)
+        self._x_search = x.copy()
+
+        direction = np.sign(np.diff(x))
+        steps = np.flatnonzero(direction)
+        if len(steps) == 0:
+            return [(0, n, 1)]
+
+        # a new segment starts wherever the direction of non-zero steps flips
+        flips = steps[1:][direction[steps[1:]] != direction[steps[:-1]]]
+        starts = np.append(0, flips)
+        stops = np.append(flips + 1, n)
+
+        if len(starts) > self.MAX_SEGMENTS:
+            return None
+
+        segments = []
+        for start, stop in zip(starts, stops):
+            sign = int(direction[steps[np.searchsorted(steps, start)]])
+            self._x_search[start:stop] *= sign
+            segments.append((int(start), int(stop), sign))
+
+        return segments
+
+    def index_ranges(self, xmin, xmax):
+        """
+        Returns the ranges of raw indices needed to draw the x-range [xmin, xmax],
+        including one point on either side so that lines leave the view correctly.
+        """
+        if self.segments is None:
+            return [(0, len(self.x))]
+
+        ranges = []
+        for start, stop, sign in self.segments:
+            x_search = self._x_search[start:stop]
+            lower, upper = sorted((sign * xmin, sign * xmax))
+            i0 = max(np.searchsorted(x_search, lower, side='left') - 1, 0)
+            i1 = min(np.searchsorted(x_search, upper, side='right') + 1, stop - start)
+            if i1 > i0:
+                ranges.append((start + int(i0), start + int(i1)))
+
+        return ranges
+
+    def select(self, xmin, xmax, width):
+        """
+        Selects the level of detail for a view.
+
+        :param float xmin: Lower bound of the visible x-range.
+        :param float xmax: Upper bound of the visible x-range.
+        :param int width: Width of the view in pixels.
+        :returns: Tuple (key, x, y), where `key` identifies the selection and can be
+            used to skip updates if it did not change.
+        """
+        ranges = self.index_ranges(xmin, xmax)
+        max_points = 2 * max(int(width), 1)
+
+        level = 0
+        n_visible = sum(i1 - i0 for i0, i1 in ranges)
+        while n_visible > max_points and level + 1 < len(self.levels):
+            level += 1
+            n_visible //= self.FACTOR
+
+        indices = self.levels[level]
+        bounds = np.searchsorted(indices, np.ravel(ranges), side='left')
+        indices = np.concatenate([indices[:0]] + [indices[j0:j1] for j0, j1 in
+                                                  bounds.reshape(-1, 2)])
+
+        return (level, tuple(ranges)), self.x[indices], self.y[indices]
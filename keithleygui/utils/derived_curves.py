@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Curves derived from measured currents, e.g., the transconductance of a transfer sweep
+or the output conductance of an output sweep.
+
+Transforms act on all y-columns of a sweep at once, given as 2D array with one row per
+column, and return magnitudes like the plain current display. Derivatives are taken
+with respect to the x-data, with central differences for complete sweeps. For a time
+series which is still being recorded, :class:`StreamingTransform` only transforms the
+rows which were appended since its last update.
+"""
+
+from __future__ import division, absolute_import, print_function
+from collections import OrderedDict
+import numpy as np
+
+from keithleygui.utils.ring_buffer import RingBuffer
+
+
+# transforms and their labels for menus
+TRANSFORMS = OrderedDict([
+    ('current', 'Current'),
+    ('sqrt', 'Square root of current'),
+    ('derivative', 'Derivative (transconductance, output conductance)'),
+    ('log_derivative', 'Log-derivative'),
+])
+
+
+def axis_label(transform, sweep_type):
+    """
+    Returns the name and unit of the y-axis for a transform. The unit is empty if
+    it should not be scaled with SI prefixes and is included in the name instead.
+    """
+    dx = 'dt' if sweep_type == 'timeseries' else 'dV'
+
+    if transform == 'sqrt':
+        return 'sqrt(|I|) (A^1/2)', ''
+    elif transform == 'derivative':
+        if sweep_type == 'transfer':
+            return 'Transconductance', 'S'
+        elif sweep_type == 'output':
+            return 'Output conductance', 'S'
+        elif sweep_type == 'timeseries':
+            return 'dI/dt', 'A/s'
+        else:
+            return 'Differential conductance', 'S'
+    elif transform == 'log_derivative':
+        return 'd log|I| / %s (dec/%s)' % (dx, dx[1:]), ''
+    else:
+        return 'Current', 'A'
+
+
+def _log10(ydata):
+    ydata = np.abs(ydata)
+    return np.log10(ydata, out=np.full_like(ydata, np.nan), where=ydata > 0)
+
+
+def _central_gradient(xdata, ydata):
+    """Derivative of every row of `ydata`, NaN where it is undefined."""
+    if ydata.shape[1] < 2:
+        return np.full_like(ydata, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gradient = np.gradient(ydata, xdata, axis=1)
+
+    gradient[~np.isfinite(gradient)] = np.nan  # e.g., at the turn of a dual sweep
+    return gradient
+
+
+def _backward_gradient(xdata, ydata):
+    """
+    Backward differences of every row of `ydata`. The first sample has no
+    predecessor and gives NaN.
+    """
+    gradient = np.full_like(ydata, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gradient[:, 1:] = np.diff(ydata, axis=1) / np.diff(xdata)
+
+    gradient[~np.isfinite(gradient)] = np.nan
+    return gradient
+
+
+def apply_transform(transform, xdata, ydata, backward=False):
+    """
+    Applies a transform to all y-columns.
+
+    :param str transform: Key in :data:`TRANSFORMS`.
+    :param xdata: 1D array with n values.
+    :param ydata: 2D array with shape (m, n).
+    :param bool backward: Use backward instead of central differences.
+    :returns: Magnitude of the transformed data as 2D array with shape (m, n).
+    """
+    ydata = np.asarray(ydata, dtype=np.float64)
+    gradient = _backward_gradient if backward else _central_gradient
+
+    if transform == 'current':
+        return np.abs(ydata)
+    elif transform == 'sqrt':
+        return np.sqrt(np.abs(ydata))
+    elif transform == 'derivative':
+        return np.abs(gradient(xdata, ydata))
+    elif transform == 'log_derivative':
+        return np.abs(gradient(xdata, _log10(ydata)))
+    else:
+        raise ValueError('Unknown transform "%s".' % transform)
+
+
+class StreamingTransform(object):
+    """
+    Applies a transform to a time series held in a :class:`RingBuffer`, whose first
+    column holds the x-data. Each :meth:`update` transforms only the rows appended
+    since the last one, together with the previous row for differences. Backward
+    differences are used, so that rows never change once they are transformed.
+    The x-data and transformed y-data are kept in a second ring buffer of the same
+    capacity.
+
+    :param str transform: Key in :data:`TRANSFORMS`.
+    :param ring_buffer: RingBuffer with the source data.
+    """
+
+    def __init__(self, transform, ring_buffer):
+        self.transform = transform
+        self.source = ring_buffer
+        self.buffer = RingBuffer(ring_buffer.capacity, ring_buffer.ncols)
+
+        self._n_done = 0  # number of source rows transformed
+        self._last = None  # last source row, for differences across updates
+
+    def update(self):
+        """
+        Transforms all new rows of the source buffer.
+
+        :returns: Ring buffer with the x-data and transformed y-data.
+        """
+        rows, n_total = self.source.since(self._n_done)
+        if len(rows) == 0:
+            return self.buffer
+
+        if n_total - self._n_done > len(rows):
+            self._last = None  # rows were overwritten before they were transformed
+        self._n_done = n_total
+
+        data = rows if self._last is None else np.concatenate((self._last, rows))
+        transformed = apply_transform(self.transform, data[:, 0], data[:, 1:].T,
+                                      backward=True)
+
+        out = np.empty_like(rows)
+        out[:, 0] = rows[:, 0]
+        out[:, 1:] = transformed.T[len(data) - len(rows):]
+        self.buffer.extend(out)
+
+        self._last = rows[-1:]
+
+        return self.buffer
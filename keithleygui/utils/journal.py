@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Write-ahead journal of measurements in progress.
+
+Data is appended to the journal as it is acquired, so that a sweep can be recovered
+after the program, the computer or the connection to the instrument dies. A journal
+is a sequence of records, each with a fixed-size header, a JSON description and raw
+float64 values::
+
+    magic (4 bytes) | meta length (uint32) | data length (uint32) | crc32 (uint32)
+    meta (utf-8 JSON) | data (little endian float64)
+
+The first record describes the sweep and may hold its data so far, e.g., the swept
+voltages. Further records append rows (samples) or fill segments of columns (parts of
+curves). Repeated sweeps write the running statistics of all finished repetitions
+after each one, followed by the records of the next repetition. A record which was
+only partially written when the program died fails the checksum and is ignored
+together with everything after it.
+
+This module does not depend on Qt.
+"""
+
+from __future__ import division, absolute_import, print_function
+import os
+import os.path as osp
+import errno
+import json
+import struct
+import time
+import zlib
+import numpy as np
+from keithley2600 import ResultTable
+try:
+    import msvcrt
+except ImportError:  # not Windows
+    msvcrt = None
+
+from keithleygui.utils.sweep_loader import SWEEP_CLASSES, DEFAULT_CLASS
+from keithleygui.utils.running_stats import RunningStatistics, averaged_sweep
+
+
+MAGIC = b'KGJ1'
+RECORD_HEADER = struct.Struct('<4sIII')
+EXTENSION = '.journal'
+LOCK_EXTENSION = '.lock'
+
+_open_paths = set()  # journals written by this process
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM  # the process belongs to another user
+    return True
+
+
+def _locked(path):
+    """
+    Returns whether the lock file of the journal at `path` is locked by a running
+    process. Only used on Windows, where the process id cannot be checked.
+    """
+    try:
+        lock = open(path + LOCK_EXTENSION, 'r+b')
+    except (IOError, OSError) as e:
+        return e.errno != errno.ENOENT  # no lock file, it is removed with the journal
+
+    with lock:
+        try:
+            msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+        except (IOError, OSError):
+            return True
+        msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+        return False
+
+
+class SweepJournal(object):
+    """
+    Appends the data of a measurement in progress to a journal file.
+
+    Segments of columns and blocks of rows are written and synced to disk immediately
+    since each one usually takes seconds to acquire. Single rows are collected in
+    memory and written at most every `sync_interval` seconds, which bounds the
+    overhead for fast sampling to one write and fsync per interval. The time spent
+    writing is accumulated in :attr:`overhead`.
+
+    :param str path: Path of the journal file.
+    :param float sync_interval: Minimum time between writes of rows in seconds.
+    """
+
+    def __init__(self, path, sync_interval=1.0):
+        self.path = path
+        self.sync_interval = sync_interval
+
+        self.overhead = 0.0  # time spent writing and syncing in seconds
+        self.n_records = 0
+        self.nbytes = 0
+
+        self._rows = []
+        self._t_sync = time.time()
+
+        dirname = osp.dirname(path)
+        if not osp.isdir(dirname):
+            os.makedirs(dirname)
+
+        # on Windows, a lock file which is locked while the journal is written tells
+        # other instances that it is not interrupted, the system releases the lock
+        # if the process dies
+        self._lock = None
+        if msvcrt is not None:
+            self._lock = open(path + LOCK_EXTENSION, 'wb')
+            msvcrt.locking(self._lock.fileno(), msvcrt.LK_NBLCK, 1)
+
+        self._file = open(path, 'wb')
+        _open_paths.add(path)
+
+    @classmethod
+    def create(cls, journal_dir, sync_interval=1.0):
+        """Creates a new journal with a unique name in `journal_dir`."""
+        name = 'sweep_%s_%s%s' % (os.getpid(), time.strftime('%Y%m%d_%H%M%S'), EXTENSION)
+        path = osp.join(journal_dir, name)
+        n = 1
+        while osp.exists(path):
+            n += 1
+            path = osp.join(journal_dir, '%s_%s%s' % (osp.splitext(name)[0], n, EXTENSION))
+        return cls(path, sync_interval)
+
+    def _write(self, meta, data=None):
+        t0 = time.time()
+
+        data = b'' if data is None else np.ascontiguousarray(data, '<f8').tobytes()
+        meta = json.dumps(meta, default=str).encode('utf-8')
+        crc = zlib.crc32(meta + data) & 0xffffffff
+
+        self._file.write(RECORD_HEADER.pack(MAGIC, len(meta), len(data), crc))
+        self._file.write(meta)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._t_sync = time.time()
+        self.overhead += self._t_sync - t0
+        self.n_records += 1
+        self.nbytes += RECORD_HEADER.size + len(meta) + len(data)
+
+    def start(self, sweep_type, params, names=(), units=(), data=None, settings=None):
+        """
+        Writes the first record.
+
+        :param str sweep_type: Sweep type, selects the class of recovered data.
+        :param dict params: Parameters of the sweep data.
+        :param names: Names of the first columns.
+        :param units: Units of the first columns.
+        :param data: Data so far as 2D array.
+        :param dict settings: Measurement settings, kept to repeat or resume the
+            measurement. Must be serializable as JSON.
+        """
+        meta = {'type': 'start', 'sweep_type': sweep_type, 'params': params,
+                'names': list(names), 'units': list(units), 'settings': settings,
+                'started': time.time()}
+        if data is not None:
+            meta['shape'] = np.shape(data)
+        self._write(meta, data)
+
+    def append_segment(self, names, units, start, length, data):
+        """
+        Writes a segment of columns, e.g., some points of a curve. Columns which do
+        not exist yet are created with `length` rows and filled with NaN.
+
+        :param names: Names of the columns.
+        :param units: Units of the columns.
+        :param int start: First row of the segment.
+        :param int length: Number of rows of the columns.
+        :param data: Segment as 2D array.
+        """
+        self._write({'type': 'segment', 'names': list(names), 'units': list(units),
+                     'start': int(start), 'length': int(length),
+                     'shape': np.shape(data)}, data)
+
+    def append_rows(self, rows):
+        """Writes a block of rows as 2D array, after any collected rows."""
+        self.flush()
+        self._write({'type': 'rows', 'shape': np.shape(rows)}, rows)
+
+    def append_statistics(self, names, units, stats):
+        """
+        Writes the running statistics of all finished repetitions of a sweep.
+
+        :param names: Names of the columns of a single repetition.
+        :param units: Units of the columns of a single repetition.
+        :param stats: :class:`keithleygui.utils.running_stats.RunningStatistics`.
+        """
+        self.flush()
+        data = stats.to_array()
+        self._write({'type': 'statistics', 'names': list(names), 'units': list(units),
+                     'n_added': stats.n_added, 'shape': np.shape(data)}, data)
+
+    def append_row(self, row):
+        """Collects a row and writes all collected rows if they are due."""
+        self._rows.append(row)
+        if time.time() - self._t_sync >= self.sync_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes all collected rows."""
+        if len(self._rows) > 0:
+            rows = np.array(self._rows, dtype=np.float64, ndmin=2)
+            self._rows = []
+            self._write({'type': 'rows', 'shape': rows.shape}, rows)
+
+    def close(self, remove=True):
+        """Closes the journal and, by default, deletes it."""
+        if self._file.closed:
+            return
+        if not remove:
+            self.flush()
+        self._file.close()
+        _open_paths.discard(self.path)
+        if remove:
+            os.remove(self.path)
+        if self._lock is not None:
+            self._lock.seek(0)
+            msvcrt.locking(self._lock.fileno(), msvcrt.LK_UNLCK, 1)
+            self._lock.close()
+            os.remove(self._lock.name)
+
+
+def read_records(path):
+    """
+    Reads all complete records of a journal.
+
+    :returns: List of (meta, data) tuples, where data is a 2D array or `None`.
+    """
+    records = []
+
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            magic, meta_len, data_len, crc = RECORD_HEADER.unpack(header)
+            if magic != MAGIC:
+                break
+            meta = f.read(meta_len)
+            data = f.read(data_len)
+            if len(data) < data_len or zlib.crc32(meta + data) & 0xffffffff != crc:
+                break  # torn write
+
+            meta = json.loads(meta.decode('utf-8'))
+            if 'shape' in meta:
+                data = np.frombuffer(data, '<f8').reshape(meta['shape'])
+            else:
+                data = None
+            records.append((meta, data))
+
+    return records
+
+
+def recover_sweep(path):
+    """
+    Reads a journal and returns the acquired data. Repeated sweeps are recovered as
+    the average of all repetitions recorded until the journal was interrupted.
+
+    :param str path: Path of the journal file.
+    :returns: Tuple (sweep_data, settings, started). The sweep data is `None` if no
+        record could be read or no points were acquired. `settings` are the measurement settings given to
+        :meth:`SweepJournal.start` and `started` is the start time in seconds since
+        the epoch.
+    """
+    records = read_records(path)
+    if len(records) == 0 or records[0][0]['type'] != 'start':
+        return None, None, None
+
+    start, data = records[0]
+    names, units = list(start['names']), list(start['units'])
+    params = dict(start['params'], recovered=True)
+
+    # of repeated sweeps, only the repetition after the last statistics is replayed
+    statistics = None
+    for i, (meta, _) in enumerate(records):
+        if meta['type'] == 'statistics':
+            statistics = i
+    replayed = records[1:] if statistics is None else records[statistics + 1:]
+
+    blocks = [] if data is None else [data]
+
+    for meta, data in replayed:
+        if meta['type'] == 'rows':
+            blocks.append(data)
+
+    data = np.concatenate(blocks) if len(blocks) > 0 else None
+
+    for meta, segment in replayed:
+        if meta['type'] != 'segment':
+            continue
+        if meta['names'][0] not in names:
+            names += meta['names']
+            units += meta['units']
+            new = np.full((meta['length'], len(meta['names'])), np.nan)
+            data = new if data is None else np.column_stack([data, new])
+        i = names.index(meta['names'][0])
+        data[meta['start']:meta['start'] + len(segment), i:i + segment.shape[1]] = segment
+
+    if statistics is None and data is None:
+        return None, start['settings'], start['started']
+
+    sweep_class = SWEEP_CLASSES.get(start['sweep_type'], DEFAULT_CLASS)
+
+    if statistics is None:
+        table = ResultTable(names, units, data, params)
+    else:
+        # the aborted repetition contributes the points recorded until the crash
+        meta, array = records[statistics]
+        stats = RunningStatistics.from_array(meta['n_added'], array)
+        if len(replayed) > 0 and data is not None:
+            stats.add(data)
+        table = ResultTable(meta['names'], meta['units'], None, params)
+
+    sweep_data = sweep_class()
+    sweep_data.titles = table.titles
+    sweep_data.data = table.data
+    sweep_data.params = table.params
+
+    if statistics is not None:
+        sweep_data = averaged_sweep(sweep_data, stats)
+
+    return sweep_data, start['settings'], start['started']
+
+
+def interrupted_journals(journal_dir):
+    """
+    Returns the paths of all journals in `journal_dir` which are not written by a
+    running process, oldest first. On Windows, a journal is written as long as its
+    lock file is locked.
+    """
+    if not osp.isdir(journal_dir):
+        return []
+
+    paths = []
+    for name in sorted(os.listdir(journal_dir)):
+        if not name.endswith(EXTENSION):
+            continue
+        try:
+            pid = int(name.split('_')[1])
+        except (IndexError, ValueError):
+            pid = None
+        path = osp.join(journal_dir, name)
+        if path in _open_paths:
+            continue
+        if msvcrt is not None:
+            if _locked(path):
+                continue
+        elif pid is not None and pid != os.getpid() and _pid_alive(pid):
+            continue
+        paths.append(path)
+
+    return paths
+
+
+def remove_journal(path):
+    """Deletes a journal which is not written anymore, and its lock file if any."""
+    os.remove(path)
+    if osp.exists(path + LOCK_EXTENSION):
+        os.remove(path + LOCK_EXTENSION)
@@ -5,12 +5,30 @@
 # (see LICENSE.txt for details)
 
 from __future__ import division, absolute_import, print_function
+import weakref
 from qtpy import QtGui, QtCore, QtWidgets
 
 
 class LedIndicator(QtWidgets.QAbstractButton):
+    """
+    Round LED which is green when checked and red otherwise. In the busy state,
+    it blinks between bright and dark green.
+
+    Frames are rendered once per size, device pixel ratio and color into a
+    pixmap cache which is shared between all indicators, and are only copied to
+    the screen on repaints. All busy indicators blink in sync from a single
+    shared timer.
+    """
     scaledSize = 1000.0
 
+    BLINK_INTERVAL = 500  # ms
+    MAX_CACHE_SIZE = 64
+
+    _pixmap_cache = dict()
+    _blink_timer = None
+    _blink_on = True
+    _busy_leds = weakref.WeakSet()
+
     def __init__(self, parent=None):
         QtWidgets.QAbstractButton.__init__(self, parent)
 
@@ -18,6 +36,7 @@ class LedIndicator(QtWidgets.QAbstractButton):
         self.setCheckable(True)
         self.setDisabled(True)  # Make the led non clickable
         self._checked = False
+        self._busy = False
 
         # Green
         self.on_color_1 = QtGui.QColor(0, 255, 0)
@@ -26,19 +45,100 @@ class LedIndicator(QtWidgets.QAbstractButton):
         self.off_color_1 = QtGui.QColor(255, 0, 0)
         self.off_color_2 = QtGui.QColor(176, 0, 0)
 
-    def resizeEvent(self, QResizeEvent):
+    # =============================================================================
+    # Busy state
+    # =============================================================================
+
+    def isBusy(self):
+        return self._busy
+
+    def setBusy(self, busy):
+        """
+        Sets the busy state. A busy LED blinks in its 'on' color, regardless of
+        its checked state.
+        """
+        if busy == self._busy:
+            return
+
+        self._busy = busy
+        cls = self.__class__
+
+        if busy:
+            cls._busy_leds.add(self)
+            if cls._blink_timer is None:
+                # parent to the application so that the timer lives as long as Qt
+                cls._blink_timer = QtCore.QTimer(QtWidgets.QApplication.instance())
+                cls._blink_timer.setInterval(self.BLINK_INTERVAL)
+                cls._blink_timer.timeout.connect(cls._on_blink)
+            if not cls._blink_timer.isActive():
+                cls._blink_on = True
+                cls._blink_timer.start()
+        else:
+            cls._busy_leds.discard(self)
+            if len(cls._busy_leds) == 0 and cls._blink_timer is not None:
+                cls._blink_timer.stop()
+
         self.update()
 
-    def paintEvent(self, QPaintEvent):
-        real_size = min(self.width(), self.height())
+    @classmethod
+    def _on_blink(cls):
+        cls._blink_on = not cls._blink_on
+        for led in list(cls._busy_leds):
+            led.update()
 
-        painter = QtGui.QPainter(self)
+    # =============================================================================
+    # Rendering
+    # =============================================================================
+
+    def _frame_colors(self):
+        """Returns the colors and highlight position of the current frame."""
+        if self._busy:
+            if self._blink_on:
+                return self.on_color_1, self.on_color_2, -500
+            else:
+                return self.on_color_1.darker(250), self.on_color_2.darker(250), -500
+        elif self.isChecked():
+            return self.on_color_1, self.on_color_2, -500
+        else:
+            return self.off_color_1, self.off_color_2, 500
+
+    def _device_pixel_ratio(self):
+        try:
+            return self.devicePixelRatioF()
+        except AttributeError:
+            return self.devicePixelRatio()
+
+    @classmethod
+    def _get_pixmap(cls, size, ratio, color_1, color_2, highlight):
+        key = (size, ratio, color_1.rgba(), color_2.rgba(), highlight)
+
+        try:
+            return cls._pixmap_cache[key]
+        except KeyError:
+            pass
+
+        if len(cls._pixmap_cache) >= cls.MAX_CACHE_SIZE:
+            cls._pixmap_cache.clear()
+
+        pixmap = cls._render(size, ratio, color_1, color_2, highlight)
+        cls._pixmap_cache[key] = pixmap
+
+        return pixmap
+
+    @classmethod
+    def _render(cls, size, ratio, color_1, color_2, highlight):
+        """Renders a single frame with the given logical size in pixels."""
+        pixmap = QtGui.QPixmap(int(round(size*ratio)), int(round(size*ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QtCore.Qt.transparent)
+
+        painter = QtGui.QPainter(pixmap)
         pen = QtGui.QPen(QtCore.Qt.black)
         pen.setWidth(1)
 
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.translate(self.width()/2, self.height()/2)
-        painter.scale(real_size/self.scaledSize, real_size/self.scaledSize)
+        painter.translate(size/2, size/2)
+        painter.scale(size/cls.scaledSize, size/cls.scaledSize)
 
         gradient = QtGui.QRadialGradient(QtCore.QPointF(-500, -500), 1500,
                                          QtCore.QPointF(-500, -500))
@@ -57,16 +157,22 @@ class LedIndicator(QtWidgets.QAbstractButton):
         painter.drawEllipse(QtCore.QPointF(0, 0), 450, 450)
 
         painter.setPen(pen)
-        if self.isChecked():
-            gradient = QtGui.QRadialGradient(QtCore.QPointF(-500, -500), 1500,
-                                             QtCore.QPointF(-500, -500))
-            gradient.setColorAt(0, self.on_color_1)
-            gradient.setColorAt(1, self.on_color_2)
-        else:
-            gradient = QtGui.QRadialGradient(QtCore.QPointF(500, 500), 1500,
-                                             QtCore.QPointF(500, 500))
-            gradient.setColorAt(0, self.off_color_1)
-            gradient.setColorAt(1, self.off_color_2)
+        gradient = QtGui.QRadialGradient(QtCore.QPointF(highlight, highlight), 1500,
+                                         QtCore.QPointF(highlight, highlight))
+        gradient.setColorAt(0, color_1)
+        gradient.setColorAt(1, color_2)
 
         painter.setBrush(gradient)
         painter.drawEllipse(QtCore.QPointF(0, 0), 400, 400)
+        painter.end()
+
+        return pixmap
+
+    def paintEvent(self, QPaintEvent):
+        real_size = min(self.width(), self.height())
+        pixmap = self._get_pixmap(real_size, self._device_pixel_ratio(),
+                                  *self._frame_colors())
+
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(QtCore.QPointF((self.width() - real_size)/2,
+                                          (self.height() - real_size)/2), pixmap)
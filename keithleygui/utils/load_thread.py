@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import threading
+import multiprocessing
+try:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+except ImportError:  # Python 2
+    ProcessPoolExecutor = None
+from qtpy import QtCore
+
+from keithleygui.utils.sweep_loader import load_worker
+
+
+class LoadThread(QtCore.QThread):
+    """
+    Loads sweep data files. Larger batches are parsed in parallel in a pool of
+    worker processes and sweeps are emitted in the order in which they finish. If
+    the pool cannot be used, the remaining files are loaded in this thread.
+    """
+
+    loadedSig = QtCore.Signal(str, object)
+    failedSig = QtCore.Signal(str, str)
+    progressSig = QtCore.Signal(int, int)
+
+    # smaller batches are loaded in this thread, spawning workers takes longer since
+    # each one imports the GUI modules when it starts
+    MIN_PARALLEL_FILES = 16
+
+    def __init__(self, filepaths):
+        QtCore.QThread.__init__(self)
+        self.filepaths = list(filepaths)
+        self._n_done = 0
+        self._stop_event = threading.Event()
+
+    def __del__(self):
+        self.wait()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _create_executor(self):
+        n_processes = min(multiprocessing.cpu_count(), len(self.filepaths))
+        if (ProcessPoolExecutor is None or n_processes < 2
+                or len(self.filepaths) < self.MIN_PARALLEL_FILES):
+            return None
+        # do not fork a process which runs Qt threads
+        try:
+            return ProcessPoolExecutor(n_processes,
+                                       mp_context=multiprocessing.get_context('spawn'))
+        except (TypeError, AttributeError):
+            return None  # contexts require Python 3.4, mp_context 3.7
+
+    def _emit(self, result):
+        filepath, sweep_data, error = result
+        self._n_done += 1
+        if error is None:
+            self.loadedSig.emit(filepath, sweep_data)
+        else:
+            self.failedSig.emit(filepath, error)
+        self.progressSig.emit(self._n_done, len(self.filepaths))
+
+    def run(self):
+        remaining = list(self.filepaths)
+        executor = self._create_executor()
+
+        if executor is not None:
+            futures = dict((executor.submit(load_worker, f), f) for f in remaining)
+            try:
+                for future in as_completed(futures):
+                    if self._stop_event.is_set():
+                        break
+                    self._emit(future.result())
+                    remaining.remove(futures[future])
+            except BrokenProcessPool:
+                pass  # load the remaining files in this thread
+            finally:
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+        for filepath in remaining:
+            if self._stop_event.is_set():
+                break
+            self._emit(load_worker(filepath))
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import numpy as np
+from qtpy import QtCore, QtWidgets
+
+from keithleygui.utils.scientific_spinbox import ScienDSpinBox
+
+
+class TransistorParameterDock(QtWidgets.QDockWidget):
+    """
+    Dock widget with the transistor parameters of the selected sweeps, one row per
+    transfer curve, and the device dimensions used for their extraction. Changes
+    to the dimensions are emitted with :attr:`dimensionsChanged` as a tuple
+    (width, length, capacitance), toggling the fit display with
+    :attr:`showFitsToggled`.
+
+    :param tuple dimensions: Initial channel width and length in m and gate
+        capacitance per area in F/cm^2.
+    :param bool show_fits: Initial state of the 'Show fits' checkbox.
+    """
+
+    dimensionsChanged = QtCore.Signal(object)
+    showFitsToggled = QtCore.Signal(bool)
+
+    # headers and result keys of the table columns after the sweep label
+    COLUMNS = (('Vd (V)', 'vd'), ('Regime', 'regime'), ('μ lin (cm²/Vs)', 'mu_lin'),
+               ('μ sat (cm²/Vs)', 'mu_sat'), ('Vth (V)', 'vth_fwd'),
+               ('Hysteresis (V)', 'hysteresis'), ('On/off', 'on_off'),
+               ('SS (V/dec)', 'ss'))
+
+    def __init__(self, dimensions, show_fits=True, parent=None):
+        QtWidgets.QDockWidget.__init__(self, 'Transistor Parameters', parent)
+        self.setObjectName('transistorParameterDock')
+
+        widget = QtWidgets.QWidget(self)
+        layout = QtWidgets.QGridLayout(widget)
+
+        self.spinBoxes = []
+        for column, (label, suffix, value) in enumerate(zip(
+                ('W:', 'L:', 'Ci:'), ('m', 'm', 'F/cm²'), dimensions)):
+            spin_box = ScienDSpinBox(widget)
+            spin_box.setMinimumWidth(90)
+            spin_box.setAlignment(QtCore.Qt.AlignRight)
+            spin_box.setMinimum(0)
+            spin_box.setValue(value)
+            spin_box.setSuffix(suffix)
+            spin_box.valueChanged.connect(self._on_dimensions_changed)
+            self.spinBoxes.append(spin_box)
+
+            label = QtWidgets.QLabel(label, widget)
+            label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+            layout.addWidget(label, 0, 2 * column)
+            layout.addWidget(spin_box, 0, 2 * column + 1)
+
+        self.checkBoxFits = QtWidgets.QCheckBox('Show fits', widget)
+        self.checkBoxFits.setChecked(show_fits)
+        self.checkBoxFits.toggled.connect(self.showFitsToggled)
+        layout.addWidget(self.checkBoxFits, 0, 6)
+
+        self.tableWidget = QtWidgets.QTableWidget(0, len(self.COLUMNS) + 1, widget)
+        self.tableWidget.setHorizontalHeaderLabels(['Sweep'] + [c[0] for c in self.COLUMNS])
+        self.tableWidget.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidget.setWordWrap(False)
+        self.tableWidget.setAlternatingRowColors(True)
+        self.tableWidget.verticalHeader().hide()
+        layout.addWidget(self.tableWidget, 1, 0, 1, 7)
+
+        self.labelStatus = QtWidgets.QLabel(widget)
+        layout.addWidget(self.labelStatus, 2, 0, 1, 7)
+
+        self.setWidget(widget)
+
+    def dimensions(self):
+        """Returns the device dimensions as tuple (width, length, capacitance)."""
+        return tuple(spin_box.value() for spin_box in self.spinBoxes)
+
+    def showFits(self):
+        return self.checkBoxFits.isChecked()
+
+    def setResults(self, results, status=''):
+        """
+        Shows extracted parameters.
+
+        :param results: List of (label, parameters) tuples, where parameters is a
+            list of dictionaries as returned by :func:`extract_transfer_parameters`.
+        :param str status: Text shown below the table.
+        """
+        rows = [(label, r) for label, parameters in results for r in parameters]
+        self.tableWidget.setRowCount(len(rows))
+
+        for row, (label, r) in enumerate(rows):
+            self.tableWidget.setItem(row, 0, QtWidgets.QTableWidgetItem(label))
+            for column, (_, key) in enumerate(self.COLUMNS):
+                item = QtWidgets.QTableWidgetItem(self._format(key, r[key]))
+                item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                self.tableWidget.setItem(row, column + 1, item)
+
+        self.labelStatus.setText(status)
+
+    @staticmethod
+    def _format(key, value):
+        if key == 'regime':
+            return value
+        elif key == 'vd' and np.isnan(value):
+            return 'trailing'
+        elif not np.isfinite(value):
+            return '--'
+        elif key == 'on_off':
+            return '%.1e' % value
+        else:
+            return '%.3g' % value
+
+    @QtCore.Slot()
+    def _on_dimensions_changed(self):
+        self.dimensionsChanged.emit(self.dimensions())
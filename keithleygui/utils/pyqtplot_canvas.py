@@ -1,18 +1,38 @@
 # -*- coding: utf-8 -*-
 import sys
+import re
 import itertools
+from collections import OrderedDict
 import pyqtgraph as pg
 from pyqtgraph import (AxisItem, PlotItem, GraphicsView, LegendItem,
                        GraphicsWidget, ScatterPlotItem, PlotDataItem,
                        LabelItem, Point)
 from pyqtgraph.graphicsItems.ScatterPlotItem import drawSymbol
+from pyqtgraph.graphicsItems.GraphicsWidgetAnchor import GraphicsWidgetAnchor
 from pyqtgraph import functions as fn
 import numpy as np
-from qtpy import QtWidgets, QtCore
+from qtpy import QtWidgets, QtCore, QtGui
+
+from keithleygui.utils.decimation import MinMaxPyramid
+from keithleygui.utils.si_format import format_si_array, THIN_SPACE
+from keithleygui.utils.derived_curves import (apply_transform, axis_label,
+                                              StreamingTransform)
+from keithleygui.utils.running_stats import std_columns
+from keithleygui.utils.settling import is_settle_column
+
+try:
+    from qtpy import QtOpenGL
+except ImportError:
+    QtOpenGL = None
 
 pg.setConfigOptions(antialias=True, exitCleanup=False)
 
 
+def _log10(ydata):
+    """Base-10 logarithm of non-negative data, NaN for zero samples."""
+    return np.log10(ydata, out=np.full_like(ydata, np.nan), where=ydata > 0)
+
+
 # ==================================================================================================
 # Create our own, more beatiful, legend here.
 # ==================================================================================================
@@ -107,6 +127,35 @@ class MyLegendItem(LegendItem):
         self.layout.setColumnSpacing(0, 10)
         self.updateSize()
 
+    def removeItem(self, item):
+        """
+        Removes the entry of `item` from the legend. Remaining entries are moved up
+        to close the gap.
+
+        ==============  ========================================================
+        **Arguments:**
+        item            The PlotDataItem or ItemSample which was added to the
+                        legend.
+        ==============  ========================================================
+        """
+        remaining = [(s, l) for s, l in self.items if not (s is item or s.item is item)]
+        if len(remaining) == len(self.items):
+            return
+
+        for sample, label in self.items:
+            self.layout.removeItem(sample)
+            self.layout.removeItem(label)
+            if (sample, label) not in remaining:
+                sample.close()
+                label.close()
+
+        del self.items[:]
+        for row, (sample, label) in enumerate(remaining):
+            self.items.append((sample, label))
+            self.layout.addItem(sample, row, 0)
+            self.layout.addItem(label, row, 1)
+        self.updateSize()
+
     def setPen(self, *args, **kargs):
         """
         Sets the pen used to draw lines between points.
@@ -145,10 +194,247 @@ class MyLegendItem(LegendItem):
         p.drawRect(self.boundingRect())
 
 
+# ==================================================================================================
+# Axis with SI formatted tick labels on log scales
+# ==================================================================================================
+
+class MyAxisItem(AxisItem):
+    """
+    AxisItem which labels ticks of log-scaled axes with SI prefixes and units, e.g.,
+    '100 nA' instead of '1e-07'. pyqtgraph disables SI prefixes in the axis label in
+    log mode, so the prefix is shown per tick. Linear axes are labelled as usual.
+    """
+
+    # separator between number and prefix or unit of tick labels
+    SEPARATOR = THIN_SPACE
+
+    def logTickStrings(self, values, scale, spacing):
+        sep = self.SEPARATOR
+        strings = format_si_array(10 ** np.asarray(values, dtype=np.float64), 1, sep)
+        units = self.labelUnits or ''
+
+        # ticks of log axes are integer multiples of decades, drop zero decimals
+        strings = [s.replace('.0' + sep, sep) for s in strings.tolist()]
+
+        if units:
+            return [s + units for s in strings]
+        else:
+            return [s.rstrip(sep) for s in strings]
+
+
+# ==================================================================================================
+# Batched drawing of large curve families, with a color bar instead of a legend
+# ==================================================================================================
+
+class MultiCurveItem(pg.GraphicsObject):
+    """
+    Draws many curves which share their x-data as a single item.
+
+    The curves are colored by a value per curve, e.g., the stepped voltage. Values
+    are sorted into `nbins` color bins and all curves of a bin are drawn as one
+    QPainterPath, so that painting costs `nbins` draw calls instead of one per curve.
+    Paths are only rebuilt when the data changes. Log-scaling is left to the caller,
+    non-finite points are not drawn.
+    """
+
+    def __init__(self, cmap, width=1, nbins=16):
+        pg.GraphicsObject.__init__(self)
+        self.cmap = cmap
+        self.lineWidth = width
+        self.nbins = nbins
+
+        self.xdata = np.zeros(0)
+        self.ydata = np.zeros((0, 0))
+        self.values = np.zeros(0)
+        self.antialias = pg.getConfigOption('antialias')
+
+        self._paths = []  # list of (pen, path) tuples
+        self._bounds = QtCore.QRectF()
+
+    def setData(self, xdata, ydata, values):
+        """
+        :param xdata: 1D array with shape (npoints,).
+        :param ydata: 2D array with shape (ncurves, npoints).
+        :param values: 1D array with shape (ncurves,) to map to colors.
+        """
+        self.xdata = np.asarray(xdata, dtype=np.float64)
+        self.ydata = np.asarray(ydata, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self._build_paths()
+
+    def _build_paths(self):
+        self.prepareGeometryChange()
+        self._paths = []
+
+        ncurves, npoints = self.ydata.shape
+        if ncurves == 0 or npoints == 0:
+            self._bounds = QtCore.QRectF()
+            self.update()
+            return
+
+        ydata = self.ydata
+
+        # break lines at the end of every curve and around missing points
+        finite = np.isfinite(ydata)
+        connect = finite.copy()
+        connect[:, :-1] &= finite[:, 1:]
+        connect[:, -1] = False
+        ydata = np.where(finite, ydata, 0)
+
+        vmin, vmax = self.values.min(), self.values.max()
+        span = vmax - vmin if vmax > vmin else 1.0
+        bins = np.minimum(((self.values - vmin) / span * self.nbins).astype(int),
+                          self.nbins - 1)
+
+        for b in np.unique(bins):
+            rows = bins == b
+            n = int(rows.sum())
+            path = fn.arrayToQPath(np.tile(self.xdata, n), ydata[rows].ravel(),
+                                   connect=connect[rows].ravel().astype(np.int32))
+            color = self.cmap.mapToQColor((b + 0.5) / self.nbins)
+            pen = fn.mkPen(color=color, width=self.lineWidth)
+            self._paths.append((pen, path))
+
+        yfinite = ydata[finite]
+        if yfinite.size == 0:
+            self._bounds = QtCore.QRectF()
+        else:
+            xmin, xmax = np.nanmin(self.xdata), np.nanmax(self.xdata)
+            self._bounds = QtCore.QRectF(xmin, yfinite.min(), xmax - xmin,
+                                         yfinite.max() - yfinite.min())
+        self.update()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        if self._bounds.isNull():
+            return None, None
+        if ax == 0:
+            return self._bounds.left(), self._bounds.right()
+        else:
+            return self._bounds.top(), self._bounds.bottom()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def setAntialias(self, antialias):
+        if antialias != self.antialias:
+            self.antialias = antialias
+            self.update()
+
+    def paint(self, p, *args):
+        p.setRenderHint(p.Antialiasing, self.antialias)
+        for pen, path in self._paths:
+            p.setPen(pen)
+            p.drawPath(path)
+
+
+class MyColorBarItem(GraphicsWidget, GraphicsWidgetAnchor):
+    """
+    Legend for a :class:`MultiCurveItem`: a vertical color gradient with the
+    minimum and maximum value and a title.
+    """
+
+    def __init__(self, cmap, offset=(20, -20), brush=None, labelTextColor='k'):
+        GraphicsWidget.__init__(self)
+        GraphicsWidgetAnchor.__init__(self)
+        self.cmap = cmap
+        self.brush = fn.mkBrush(brush)
+        self.color = fn.mkColor(labelTextColor)
+        self.title = ''
+        self.vmin = 0.
+        self.vmax = 1.
+        self.offset = offset
+        self.setFlag(self.ItemIgnoresTransformations)
+        self.resize(90, 130)
+
+    def setParentItem(self, p):
+        ret = GraphicsWidget.setParentItem(self, p)
+        self.setOffset(self.offset)
+        return ret
+
+    def setOffset(self, offset):
+        self.offset = offset
+        if self.parentItem() is None:
+            return
+
+        offset = Point(offset)
+        anchorx = 1 if offset[0] <= 0 else 0
+        anchory = 1 if offset[1] <= 0 else 0
+        anchor = (anchorx, anchory)
+        self.anchor(itemPos=anchor, parentPos=anchor, offset=offset)
+
+    def setLevels(self, vmin, vmax, title):
+        self.vmin, self.vmax, self.title = vmin, vmax, title
+        self.update()
+
+    def boundingRect(self):
+        return QtCore.QRectF(0, 0, self.width(), self.height())
+
+    def paint(self, p, *args):
+        p.setPen(fn.mkPen(None))
+        p.setBrush(self.brush)
+        p.drawRect(self.boundingRect())
+
+        bar = QtCore.QRectF(10, 25, 15, self.height() - 35)
+        gradient = self.cmap.getGradient(bar.bottomLeft(), bar.topLeft())
+        p.setBrush(QtGui.QBrush(gradient))
+        p.setPen(fn.mkPen(self.color))
+        p.drawRect(bar)
+
+        p.drawText(QtCore.QRectF(5, 0, self.width() - 10, 20),
+                   QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, self.title)
+        p.drawText(QtCore.QRectF(bar.right() + 5, bar.top() - 10, 60, 20),
+                   QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, '%g' % (self.vmax + 0.))
+        p.drawText(QtCore.QRectF(bar.right() + 5, bar.bottom() - 10, 60, 20),
+                   QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, '%g' % (self.vmin + 0.))
+
+
 # ==================================================================================================
 # The actual plot item
 # ==================================================================================================
 
+class PlotArrays(object):
+    """
+    Data of a sweep prepared for :meth:`SweepDataPlot.plot`. Holds all y-columns
+    as a single 2D array and collects the transformed y-data and level-of-detail
+    pyramids which are computed while the sweep is shown, so that plotting the
+    same sweep again does not repeat any of this work. Derived curves are only
+    computed when they are first shown. Standard deviation columns of averaged
+    sweeps are found once and drawn as error bands instead of curves. Settle times
+    of adaptively settled sweeps are not plotted.
+
+    :param sweep_data: ResultTable instance.
+    """
+
+    def __init__(self, sweep_data):
+        columns = [i for i, name in enumerate(sweep_data.column_names)
+                   if i > 0 and not is_settle_column(name)]
+
+        self.xdata = np.asarray(sweep_data.get_column(0), dtype=np.float64)
+        self.ydata = np.ascontiguousarray(sweep_data.data[:, columns].T, dtype=np.float64)
+        self.names = [str(sweep_data.column_names[i]) for i in columns]
+        self.errors = std_columns(self.names)  # rows of standard deviations by row
+        self.transformed = dict()  # y-data for display by (transform, log mode)
+        self.pyramids = dict()  # level-of-detail pyramids by (transform, log mode, row)
+        self._source = (id(sweep_data.data), sweep_data.data.shape)
+
+    def matches(self, sweep_data):
+        """
+        Returns whether the arrays were prepared from the current data of
+        `sweep_data`. They are outdated if its data was replaced or resized.
+        """
+        return self._source == (id(sweep_data.data), sweep_data.data.shape)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by all arrays in bytes."""
+        n = self.xdata.nbytes + self.ydata.nbytes
+        n += sum(y.nbytes for y in self.transformed.values())
+        for pyramid in self.pyramids.values():
+            # x and y are views of the arrays above, x is copied once for searching
+            n += pyramid.x.nbytes + sum(level.nbytes for level in pyramid.levels)
+        return n
+
+
 class SweepDataPlot(GraphicsView):
 
     GREEN = [0, 204, 153]
@@ -165,8 +451,46 @@ class SweepDataPlot(GraphicsView):
     else:
         LW = 1.5
 
-    def __init__(self):
-        GraphicsView.__init__(self)
+    # curves with more points are drawn from a min/max level-of-detail pyramid
+    LOD_THRESHOLD = 5000
+    # larger curve families are drawn as a single MultiCurveItem
+    BATCH_THRESHOLD = 20
+    # antialiasing is switched off when more points are drawn in total
+    ANTIALIAS_MAX_POINTS = 20000
+
+    # parses the stepped value from column names such as 'Drain current (Vg = -20)'
+    STEP_PATTERN = re.compile(r'(\w+)\s*=\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)')
+
+    def __init__(self, use_opengl=False, antialias_max_points=None):
+        GraphicsView.__init__(self, useOpenGL=False)
+
+        self.opengl = False
+        if use_opengl:
+            self.setOpenGL(True)
+
+        if antialias_max_points is not None:
+            self.ANTIALIAS_MAX_POINTS = antialias_max_points
+
+        self.lines = []
+        self._curves = OrderedDict()  # PlotDataItems by column name
+        self._pens = [fn.mkPen(color=c, width=self.LW) for c in self.COLORS]
+        self._overlay_pens = [fn.mkPen(color=c, width=self.LW, style=QtCore.Qt.DashLine)
+                              for c in self.COLORS]
+        self._overlays = []  # (column name, x, y) of overlaid fits
+        self._overlay_items = []
+        self._errors = dict()  # rows of standard deviations by row
+        self._band_items = []
+        self._pyramids = dict()  # level-of-detail pyramids by PlotDataItem
+        self._lod_keys = dict()  # last selection by PlotDataItem
+
+        self._arrays = None  # PlotArrays of the current sweep
+        self._xdata = None
+        self._ydata = None  # 2D array with one row per y-column
+        self._names = []
+        self._transformed = dict()  # y-data for display by (transform, log mode)
+        self._drawn_log_y = False
+        self._sweep_type = None
+        self.transform = 'current'  # see TRANSFORMS
 
         # create layout
         self.layout = pg.GraphicsLayout()
@@ -179,7 +503,7 @@ class SweepDataPlot(GraphicsView):
         axisItems = dict()
 
         for pos in ['bottom', 'left', 'top', 'right']:
-            axisItems[pos] = AxisItem(orientation=pos, maxTickLength=-7)
+            axisItems[pos] = MyAxisItem(orientation=pos, maxTickLength=-7)
 
         self.p = PlotItem(axisItems=axisItems)
         self.setTitle('Sweep data', fontScaling=1.3, color='k')
@@ -237,50 +561,428 @@ class SweepDataPlot(GraphicsView):
                                    offset=(20, -20))
         self.legend.setParentItem(self.p.vb)
 
+        # add batched item and color bar for large curve families
+        cmap = pg.ColorMap([0, 0.5, 1], [self.BLUE, self.PURPLE, self.RED])
+        self._batch = MultiCurveItem(cmap, width=self.LW)
+        self.colorbar = MyColorBarItem(cmap, brush=fn.mkBrush(255, 255, 255, 150),
+                                       labelTextColor='k', offset=(20, -20))
+        self.colorbar.setParentItem(self.p.vb)
+        self.colorbar.hide()
+
+        # transform y-data ourselves when log mode is toggled from the context menu
+        for check in (self.p.ctrl.logXCheck, self.p.ctrl.logYCheck):
+            check.toggled.disconnect(self.p.updateLogMode)
+            check.toggled.connect(self._on_log_mode_toggled)
+
+        # re-slice decimated curves when zooming, panning or resizing
+        self.p.vb.sigXRangeChanged.connect(self._update_lod)
+        self.p.vb.sigResized.connect(self._update_lod)
+
+    def setOpenGL(self, enable):
+        """
+        Renders through an OpenGL viewport if `enable` is True, and through the
+        default raster viewport otherwise. Falls back to raster rendering if OpenGL
+        is not available.
+
+        :param bool enable: Whether to use OpenGL.
+        :returns: Whether OpenGL is used.
+        :rtype: bool
+        """
+        viewport = None
+
+        if enable and QtOpenGL is not None and QtOpenGL.QGLFormat.hasOpenGL():
+            fmt = QtOpenGL.QGLFormat(QtOpenGL.QGL.SampleBuffers)
+            viewport = QtOpenGL.QGLWidget(fmt)
+            if not viewport.isValid():
+                viewport.deleteLater()
+                viewport = None
+
+        self.opengl = viewport is not None
+        self.setViewport(viewport or QtWidgets.QWidget())
+
+        return self.opengl
+
+    def _update_antialias(self):
+        """Disables antialiasing if too many points are drawn in total."""
+        if self._batch in self.p.items:
+            self._batch.setAntialias(self._batch.ydata.size <= self.ANTIALIAS_MAX_POINTS)
+            return
+
+        n_points = sum(0 if c.xData is None else len(c.xData) for c in self._curves.values())
+        antialias = n_points <= self.ANTIALIAS_MAX_POINTS
+
+        for curve in self._curves.values():
+            if curve.opts['antialias'] != antialias:
+                curve.opts['antialias'] = antialias
+                curve.curve.opts['antialias'] = antialias
+                curve.curve.update()
+
     def clear(self):
         self.p.clear()  # clear current plot
         self.legend.clear()  # clear current legend
+        self._curves.clear()
+        self._pyramids.clear()
+        self._lod_keys.clear()
+        self._arrays = None
+        self._xdata = None
+        self._ydata = None
+        self._names = []
+        self._transformed = dict()
+        self._overlays = []
+        self._overlay_items = []
+        self._errors = dict()
+        self._band_items = []
+        self._batch.setData(np.zeros(0), np.zeros((0, 0)), np.zeros(0))
+        self.colorbar.hide()
+        self.legend.show()
+
+    def _step_values(self, names):
+        """
+        Returns the stepped value of every curve and its symbol, parsed from the
+        column names. Falls back to the curve index if a name cannot be parsed.
+        """
+        matches = [self.STEP_PATTERN.search(name) for name in names]
 
-    def plot(self, sweep_data):
-        self.clear()
+        if all(matches):
+            values = [float(m.group(2)) for m in matches]
+            return np.array(values), matches[0].group(1)
+        else:
+            return np.arange(len(names), dtype=np.float64), 'Curve'
+
+    def _plot_batched(self, names, xdata, ydata):
+        """Draws all curves with a single :class:`MultiCurveItem`."""
+        self._update_curves([])
+
+        if self._batch not in self.p.items:
+            self.p.addItem(self._batch)
+
+        values, title = self._step_values(names)
+        self._batch.setData(xdata, ydata, values)
+
+        self.colorbar.setLevels(values.min(), values.max(), title)
+        self.colorbar.setOffset(self.legend.offset)
+        self.colorbar.show()
+        self.legend.hide()
+
+    def _set_curve_data(self, item, xdata, ydata, cache_key=None):
+        """
+        Sets the data of a curve. Large curves are decimated according to the
+        current view, see :class:`MinMaxPyramid`. Pyramids are kept with the
+        :class:`PlotArrays` of the sweep under `cache_key`.
+        """
+        if len(xdata) > self.LOD_THRESHOLD:
+            pyramids = self._arrays.pyramids if self._arrays is not None else dict()
+            try:
+                pyramid = pyramids[cache_key]
+            except KeyError:
+                pyramid = MinMaxPyramid(xdata, ydata)
+                if cache_key is not None:
+                    pyramids[cache_key] = pyramid
+            # start with the full x-range so that auto-ranging sees all data
+            key, xdata, ydata = pyramid.select(-np.inf, np.inf, self.p.vb.width())
+            self._pyramids[item] = pyramid
+            self._lod_keys[item] = key
+            item.setData(xdata, ydata)
+        else:
+            self._pyramids.pop(item, None)
+            item.setData(xdata, ydata)
 
-        xdata = sweep_data.get_column(0)
+    def _update_lod(self, *args):
+        """Selects the level of detail of all decimated curves for the current view."""
+        if len(self._pyramids) == 0:
+            return
+
+        (xmin, xmax), _ = self.p.vb.viewRange()
+        width = self.p.vb.width()
+
+        changed = False
+        for item, pyramid in self._pyramids.items():
+            key, xdata, ydata = pyramid.select(xmin, xmax, width)
+            if self._lod_keys.get(item) != key:
+                self._lod_keys[item] = key
+                item.setData(xdata, ydata)
+                changed = True
+
+        if changed:
+            self._update_antialias()
+
+    def _update_curves(self, names):
+        """
+        Creates or removes curves and legend entries so that there is exactly one
+        curve per name. Curves which already exist are kept, together with their
+        legend entries.
+        """
+        if list(self._curves.keys()) == names:
+            return
+
+        for name in list(self._curves.keys()):
+            if name not in names:
+                curve = self._curves.pop(name)
+                self.p.removeItem(curve)
+                self.legend.removeItem(curve)
+                self._pyramids.pop(curve, None)
+                self._lod_keys.pop(curve, None)
+
+        for name in names:
+            if name not in self._curves:
+                curve = self.p.plot(pen=self._pens[0], connect='finite')
+                curve.setLogMode(self.p.ctrl.logXCheck.isChecked(), False)
+                self._curves[name] = curve
+                self.legend.addItem(curve, name)
+
+        # keep curves in column order
+        self._curves = OrderedDict((name, self._curves[name]) for name in names)
+
+    def plot(self, sweep_data, arrays=None):
+        """
+        Plots a sweep.
+
+        :param sweep_data: ResultTable instance.
+        :param arrays: :class:`PlotArrays` of the same sweep from a previous call,
+            or `None` to prepare them.
+        :returns: The :class:`PlotArrays` used, which can be passed again later.
+        """
         xdata_title = sweep_data.titles[0]
-        ydata = sweep_data.values()[1:]
+
+        # store all y-columns in a single 2D array, with transforms cached per sweep
+        if arrays is None or not arrays.matches(sweep_data):
+            arrays = PlotArrays(sweep_data)
+
+        self._arrays = arrays
+        self._overlays = []  # fits belong to the previous sweep
+        self._xdata = arrays.xdata
+        self._ydata = arrays.ydata
+        self._names = arrays.names
+        self._errors = arrays.errors
+        self._transformed = arrays.transformed
 
         # format plot according to sweep type
         unit = xdata_title.unit if xdata_title.has_unit() else 'a.u.'
         self.x_axis.setLabel(xdata_title.name, unit=unit)
-        self.y_axis.setLabel('Current', unit='A')
+        # plain ResultTables, e.g., of time series, have no sweep_type attribute
+        self._sweep_type = sweep_data.params.get('sweep_type')
 
-        if sweep_data.sweep_type == 'transfer':
+        if self._sweep_type == 'transfer':
             self.setTitle('Transfer curve')
-            self.p.setLogMode(x=False, y=True)
             self.legend.setOffset((20, -20))  # legend in bottom-left corner
-            ydata = [np.abs(y) for y in ydata]
 
-        elif sweep_data.sweep_type == 'output':
+        elif self._sweep_type == 'output':
             self.setTitle('Output curve')
-            self.p.setLogMode(x=False, y=False)
             self.legend.setOffset((-20, 20))  # legend in top-right corner
-            ydata = [np.abs(y) for y in ydata]
+
+        elif self._sweep_type == 'timeseries':
+            self.setTitle('Time series')
 
         else:
             self.setTitle('Sweep curve')
-            self.p.setLogMode(x=False, y=False)
-            ydata = [np.abs(y) for y in ydata]
 
-        # plot data
-        self.lines = []
-        for y, c in zip(ydata, itertools.cycle(self.COLORS)):
-            p = self.p.plot(xdata, y, pen=fn.mkPen(color=c, width=self.LW))
-            self.lines.append(p)
+        self._format_y_axis()
+        self._draw()
 
-        # add legend
-        for l, t in zip(self.lines, sweep_data.column_names[1:]):
-            self.legend.addItem(l, str(t))
+        return arrays
+
+    def setTransform(self, transform):
+        """
+        Selects the curves to show, e.g., the transconductance instead of the
+        current. Derived curves are computed when first shown and cached with the
+        :class:`PlotArrays` of the sweep.
+
+        :param str transform: Key in :data:`TRANSFORMS`.
+        """
+        self.transform = transform
+        if self._ydata is not None:
+            self._format_y_axis()
+            self._draw()
+
+    def _format_y_axis(self):
+        """Sets the y-label and the default log mode for the sweep and transform."""
+        name, unit = axis_label(self.transform, self._sweep_type)
+        self.y_axis.setLabel(name, units=unit)
+        # only currents of transfer curves span many decades
+        log_y = self.transform == 'current' and self._sweep_type == 'transfer'
+        self._set_log_mode(x=False, y=log_y)
+
+    def _set_log_mode(self, x, y):
+        """
+        Sets the log mode of the axes and the state of the 'Log X' and 'Log Y'
+        checkboxes in the context menu without redrawing.
+        """
+        for check, mode in ((self.p.ctrl.logXCheck, x), (self.p.ctrl.logYCheck, y)):
+            check.blockSignals(True)
+            check.setChecked(mode)
+            check.blockSignals(False)
+
+        self._apply_log_mode()
+
+    def _apply_log_mode(self):
+        """
+        Replaces :meth:`PlotItem.updateLogMode`. The y-data is log-scaled by
+        :meth:`_get_transformed` instead of by every curve on every redraw, so only
+        the axes and the x-data of curves are switched to log mode here.
+        """
+        x = self.p.ctrl.logXCheck.isChecked()
+        y = self.p.ctrl.logYCheck.isChecked()
+
+        for item in self.p.items:
+            if hasattr(item, 'setLogMode'):
+                item.setLogMode(x, False)
+
+        for pos in ['bottom', 'top']:
+            self.p.getAxis(pos).setLogMode(x)
+        for pos in ['left', 'right']:
+            self.p.getAxis(pos).setLogMode(y)
+
+        return y
+
+    def _on_log_mode_toggled(self):
+        if self._apply_log_mode() != self._drawn_log_y:
+            self._draw()
+        else:
+            self.p.autoRange()
+
+    def _get_transformed(self, log):
+        """
+        Returns the magnitude of all y-columns or of the selected derived curves as 2D
+        array, or its base-10 logarithm with NaN for zero and negative samples if
+        `log` is True. Results are cached per transform and display mode until new
+        data is plotted.
+        """
+        try:
+            return self._transformed[(self.transform, log)]
+        except KeyError:
+            pass
+
+        if log:
+            ydata = _log10(self._get_transformed(False))
+        else:
+            ydata = apply_transform(self.transform, self._xdata, self._ydata)
+
+        self._transformed[(self.transform, log)] = ydata
+        return ydata
+
+    def _draw(self):
+        """Pushes the cached data for the current display mode to the curves."""
+        if self._ydata is None:
+            return
+
+        self._drawn_log_y = self.p.ctrl.logYCheck.isChecked()
+
+        xdata = self._xdata
+        ydata = self._get_transformed(self._drawn_log_y)
+        names = self._names
+
+        if len(self._errors) > 0:  # standard deviations are drawn as bands
+            rows = [r for r in range(len(names)) if r not in self._errors.values()]
+            names = [names[r] for r in rows]
+            ydata = ydata[rows]
+
+        if len(names) > self.BATCH_THRESHOLD:
+            self._plot_batched(names, xdata, ydata)
+            self.lines = [self._batch]
+            self._update_antialias()
+            self._draw_error_bands(batched=True)
+            self._draw_overlays()
+            self.p.autoRange()
+            return
+
+        if self._batch in self.p.items:
+            self.p.removeItem(self._batch)
+            self.colorbar.hide()
+            self.legend.show()
+
+        # update curves, reusing existing items by column name
+        self._update_curves(names)
+
+        for row, (name, y, pen) in enumerate(zip(names, ydata, itertools.cycle(self._pens))):
+            curve = self._curves[name]
+            if curve.opts['pen'] is not pen:
+                curve.setPen(pen)
+            self._set_curve_data(curve, xdata, y,
+                                 cache_key=(self.transform, self._drawn_log_y, row))
+
+        self.lines = list(self._curves.values())
+        self._update_antialias()
+        self._draw_error_bands()
+        self._draw_overlays()
 
         self.p.autoRange()
+        self._update_lod()
+
+    def _draw_error_bands(self, batched=False):
+        """
+        Fills the range of one standard deviation around every averaged curve.
+        Bands are only drawn for currents and not for batched curve families. In log
+        mode, the lower edge is clipped to one decade below the mean.
+        """
+        for item in self._band_items:
+            self.p.removeItem(item)
+        self._band_items = []
+
+        if batched or self.transform != 'current' or len(self._errors) == 0:
+            return
+
+        log_x = self.p.ctrl.logXCheck.isChecked()
+        xdata = self._xdata
+        ymean = self._get_transformed(False)
+
+        for row, std_row in self._errors.items():
+            mean = ymean[row]
+            std = np.nan_to_num(self._ydata[std_row])
+            upper, lower = mean + std, np.maximum(mean - std, 0)
+            if self._drawn_log_y:
+                lower = np.maximum(lower, mean / 10)
+                upper, lower = _log10(upper), _log10(lower)
+
+            edges = []
+            for y in (upper, lower):
+                edge = PlotDataItem(pen=fn.mkPen(None), connect='finite')
+                self.p.addItem(edge, ignoreBounds=True)
+                edge.setLogMode(log_x, False)  # y-data is transformed above
+                edge.setData(xdata, y)
+                edges.append(edge)
+
+            pen = self._curves[self._names[row]].opts['pen']
+            color = fn.mkColor(pen.color())
+            color.setAlpha(50)
+            band = pg.FillBetweenItem(edges[0], edges[1], brush=fn.mkBrush(color))
+            band.setZValue(-1)  # below the curves
+            self.p.addItem(band, ignoreBounds=True)
+            self._band_items += edges + [band]
+
+    def setOverlays(self, overlays):
+        """
+        Draws dashed lines over the current sweep, e.g., fits to its curves. Overlays
+        are removed when a new sweep is plotted.
+
+        :param overlays: List of (name, xdata, ydata) tuples. Each line is drawn in
+            the color of the curve `name`, if it is plotted, and transformed like
+            the curves.
+        """
+        self._overlays = list(overlays)
+        self._draw_overlays()
+
+    def _draw_overlays(self):
+        """Draws the overlays in the current display mode, without auto-ranging."""
+        for item in self._overlay_items:
+            self.p.removeItem(item)
+        self._overlay_items = []
+
+        log_x = self.p.ctrl.logXCheck.isChecked()
+        names = list(self._names)
+
+        for name, xdata, ydata in self._overlays:
+            ydata = apply_transform(self.transform, xdata, np.atleast_2d(ydata))[0]
+            if self._drawn_log_y:
+                ydata = _log10(ydata)
+
+            row = names.index(name) if name in names else 0
+            pen = self._overlay_pens[row % len(self._overlay_pens)]
+
+            item = PlotDataItem(pen=pen, connect='finite')
+            self.p.addItem(item, ignoreBounds=True)
+            item.setLogMode(log_x, False)  # y-data is transformed above
+            item.setData(xdata, ydata)
+            self._overlay_items.append(item)
 
     def setTitle(self, text, fontScaling=None, color=None, font=None):
         # work around pyqtplot which forces the title to be HTML
@@ -305,6 +1007,87 @@ class SweepDataPlot(GraphicsView):
             self.p.titleLabel.item.setFont(font)
 
 
+class StripChartPlot(SweepDataPlot):
+    """
+    Scrolling plot of a time series held in a :class:`RingBuffer`. The first buffer
+    column is plotted on the x-axis, the absolute values of all other columns on the
+    y-axis. Curves are created once in :meth:`setBuffer` and only their data is
+    replaced on :meth:`update_plot`, so the cost of an update is bounded by the
+    buffer capacity and does not grow with the total run length. Derived curves are
+    computed incrementally by a :class:`StreamingTransform`, so each update only
+    transforms the newly recorded rows.
+    """
+
+    def __init__(self, use_opengl=False, antialias_max_points=None):
+        SweepDataPlot.__init__(self, use_opengl, antialias_max_points)
+        self.buffer = None
+        self.lines = []
+        self._stream = None  # StreamingTransform for derived curves
+        self._sweep_type = 'timeseries'
+
+        self.setTitle('Time series')
+        self.x_axis.setLabel('Time', unit='s')
+        self.y_axis.setLabel('Current', unit='A')
+        self.legend.setOffset((20, -20))  # legend in bottom-left corner
+
+    def setBuffer(self, ring_buffer, names):
+        """
+        Sets the buffer to plot from and creates one curve per y-column.
+
+        :param ring_buffer: RingBuffer instance.
+        :param list names: Legend labels for the y-columns.
+        """
+        self.clear()
+        self.buffer = ring_buffer
+        self._reset_stream()
+
+        names = [str(name) for name in names]
+        self._update_curves(names)
+        for curve, pen in zip(self._curves.values(), itertools.cycle(self._pens)):
+            curve.setPen(pen)
+
+        self.lines = list(self._curves.values())
+
+    def update_plot(self):
+        """
+        Replaces the curve data with the current buffer content. The y-data is
+        log-scaled here if 'Log Y' is checked, see :meth:`_apply_log_mode`.
+        """
+        self._drawn_log_y = self.p.ctrl.logYCheck.isChecked()
+
+        if self.buffer is None or len(self.buffer) == 0:
+            return
+
+        if self._stream is None:
+            data = self.buffer.data()
+        else:
+            data = self._stream.update().data()
+
+        xdata = data[:, 0]
+        for i, line in enumerate(self.lines):
+            ydata = np.abs(data[:, i+1])
+            line.setData(xdata, _log10(ydata) if self._drawn_log_y else ydata)
+
+        self._update_antialias()
+
+    def _draw(self):
+        self.update_plot()
+
+    def setTransform(self, transform):
+        """Selects the curves to show, see :meth:`SweepDataPlot.setTransform`."""
+        self.transform = transform
+        name, unit = axis_label(transform, self._sweep_type)
+        self.y_axis.setLabel(name, units=unit)
+        self._reset_stream()
+        self.update_plot()
+
+    def _reset_stream(self):
+        if self.buffer is None or self.transform == 'current':
+            self._stream = None
+        else:
+            self._stream = StreamingTransform(self.transform, self.buffer)
+
+
 if __name__ == '__main__':
 
     import sys
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import os
+import os.path as osp
+import time
+import threading
+import numpy as np
+
+
+class RingBuffer(object):
+    """
+    Fixed-size, thread-safe ring buffer for rows of numeric data.
+
+    Memory is allocated once on creation. When the buffer is full, the oldest
+    rows are overwritten. Optionally, every row is also appended to a binary
+    spill file so that the complete record of a long measurement is kept on
+    disk while memory use stays constant. The spill file is flushed at most every
+    `flush_interval` seconds, which bounds the overhead for fast sampling.
+
+    :param int capacity: Maximum number of rows kept in memory.
+    :param int ncols: Number of columns per row.
+    :param str spill_path: Path of a binary file to append all rows to as
+        float64 values. No spill file is written if `None`.
+    :param float flush_interval: Minimum time between flushes of the spill file in
+        seconds.
+    """
+
+    def __init__(self, capacity, ncols, spill_path=None, flush_interval=1.0):
+        self.capacity = int(capacity)
+        self.ncols = int(ncols)
+        self.spill_path = spill_path
+        self.flush_interval = flush_interval
+
+        self._data = np.zeros((self.capacity, self.ncols), dtype=np.float64)
+        self._index = 0  # next row to write
+        self._n_total = 0  # number of rows written since creation
+        self._lock = threading.Lock()
+        self._t_flush = time.time()
+
+        if spill_path is None:
+            self._spill_file = None
+        else:
+            self._spill_file = open(spill_path, 'ab')
+
+    def __len__(self):
+        return min(self._n_total, self.capacity)
+
+    @property
+    def n_total(self):
+        """Total number of rows appended, including overwritten rows."""
+        return self._n_total
+
+    def append(self, row):
+        """
+        Appends a single row to the buffer, overwriting the oldest row if the
+        buffer is full.
+
+        :param row: Iterable with `ncols` numbers.
+        """
+        row = np.asarray(row, dtype=np.float64)
+
+        if not row.shape == (self.ncols,):
+            raise ValueError('Length must match number of columns: %s' % self.ncols)
+
+        with self._lock:
+            self._data[self._index] = row
+            self._index = (self._index + 1) % self.capacity
+            self._n_total += 1
+
+            if self._spill_file is not None:
+                self._spill(row)
+
+    def extend(self, rows):
+        """
+        Appends several rows at once, see :meth:`append`.
+
+        :param rows: Array with shape (nrows, ncols).
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+
+        if not (rows.ndim == 2 and rows.shape[1] == self.ncols):
+            raise ValueError('Length must match number of columns: %s' % self.ncols)
+
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill(rows)
+
+            self._n_total += len(rows)
+            rows = rows[-self.capacity:]  # older rows would be overwritten anyway
+            end = self._index + len(rows)
+            if end <= self.capacity:
+                self._data[self._index:end] = rows
+            else:
+                split = self.capacity - self._index
+                self._data[self._index:] = rows[:split]
+                self._data[:end - self.capacity] = rows[split:]
+            self._index = end % self.capacity
+
+    def _spill(self, rows):
+        """Writes rows to the spill file and flushes it if due. Needs the lock."""
+        self._spill_file.write(rows.tobytes())
+        if time.time() - self._t_flush >= self.flush_interval:
+            self._spill_file.flush()
+            self._t_flush = time.time()
+
+    def since(self, n_seen):
+        """
+        Returns a copy of the rows appended after the first `n_seen` rows, as far as
+        they are still held in memory, oldest first, together with :attr:`n_total`
+        at the time of the copy.
+
+        :param int n_seen: Number of rows appended before, e.g., the value of
+            :attr:`n_total` returned by the previous call.
+        :rtype: tuple
+        """
+        with self._lock:
+            n = min(self._n_total - int(n_seen), self.capacity)
+            start = self._index - n
+            if start >= 0:
+                rows = self._data[start:self._index].copy()
+            else:
+                rows = np.concatenate((self._data[start:], self._data[:self._index]))
+            return rows, self._n_total
+
+    def data(self):
+        """
+        Returns a copy of the rows currently held in memory, oldest first.
+
+        :rtype: numpy.ndarray
+        """
+        with self._lock:
+            if self._n_total < self.capacity:
+                return self._data[:self._index].copy()
+            else:
+                return np.concatenate((self._data[self._index:],
+                                       self._data[:self._index]))
+
+    def close(self):
+        """Closes the spill file, if any. Rows can still be appended to memory."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    @staticmethod
+    def load_spill(spill_path, ncols):
+        """
+        Loads all rows from a spill file.
+
+        :param str spill_path: Path of the spill file.
+        :param int ncols: Number of columns per row.
+        :returns: Array with shape (nrows, ncols).
+        :rtype: numpy.ndarray
+        """
+        return np.fromfile(spill_path, dtype=np.float64).reshape(-1, ncols)
+
+
+def prune_spill_files(spill_dir, max_age, extension='.bin'):
+    """
+    Deletes spill files in `spill_dir` which were last written more than `max_age`
+    days ago. Files which cannot be deleted, e.g., because they are still open on
+    Windows, are skipped.
+
+    :param str spill_dir: Directory of the spill files.
+    :param float max_age: Maximum age in days. Nothing is deleted if zero.
+    :param str extension: Extension of the spill files.
+    :returns: Number of deleted files.
+    :rtype: int
+    """
+    if max_age <= 0 or not osp.isdir(spill_dir):
+        return 0
+
+    t_min = time.time() - max_age * 24 * 3600
+    n_deleted = 0
+
+    for name in os.listdir(spill_dir):
+        path = osp.join(spill_dir, name)
+        if not name.endswith(extension):
+            continue
+        try:
+            if osp.getmtime(path) < t_min:
+                os.remove(path)
+                n_deleted += 1
+        except OSError:
+            continue
+
+    return n_deleted
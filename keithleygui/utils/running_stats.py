@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Mean and standard deviation of repeated sweeps, accumulated one sweep at a time.
+
+Averaged sweeps keep the mean of every column under its original name and append the
+standard deviations as columns named with :data:`STD_SUFFIX`, e.g.,
+'Drain current (Vd = -5.0) std'.
+"""
+
+from __future__ import division, absolute_import, print_function
+import numpy as np
+from keithley2600 import ResultTable
+
+
+STD_SUFFIX = ' std'
+
+
+class RunningStatistics(object):
+    """
+    Element-wise mean and variance of arrays of equal shape with Welford's online
+    algorithm. Memory use is independent of the number of arrays added. NaN values,
+    e.g., points which were not recorded, are skipped, so that every element has
+    its own count.
+
+    :param tuple shape: Shape of the arrays.
+    """
+
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        self.n_added = 0
+        self.count = np.zeros(self.shape)
+        self._mean = np.zeros(self.shape)
+        self._m2 = np.zeros(self.shape)  # sum of squared deviations from the mean
+
+    def add(self, values):
+        """
+        Adds an array. Arrays with fewer rows or columns, e.g., of an aborted sweep,
+        are padded with NaN.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != self.shape:
+            padded = np.full(self.shape, np.nan)
+            padded[tuple(slice(0, n) for n in values.shape)] = values
+            values = padded
+
+        valid = np.isfinite(values)
+        self.count += valid
+
+        delta = np.where(valid, values - self._mean, 0)
+        self._mean += delta / np.maximum(self.count, 1)
+        self._m2 += delta * np.where(valid, values - self._mean, 0)
+
+        self.n_added += 1
+
+    def to_array(self):
+        """Returns the state as a single 2D array, e.g., to write it to a journal."""
+        return np.concatenate([self.count, self._mean, self._m2])
+
+    @classmethod
+    def from_array(cls, n_added, array):
+        """Restores the state returned by :meth:`to_array`."""
+        count, mean, m2 = np.split(np.asarray(array, dtype=np.float64), 3)
+        stats = cls(count.shape)
+        stats.n_added = n_added
+        stats.count[:] = count
+        stats._mean[:] = mean
+        stats._m2[:] = m2
+        return stats
+
+    @property
+    def mean(self):
+        """Mean of all added values, NaN where there were none."""
+        return np.where(self.count > 0, self._mean, np.nan)
+
+    @property
+    def std(self):
+        """Sample standard deviation, NaN where fewer than two values were added."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, np.sqrt(self._m2 / (self.count - 1)), np.nan)
+
+
+def averaged_sweep(sweep_data, stats):
+    """
+    Returns sweep data of the same class as `sweep_data` with the mean of all
+    columns and the standard deviation of all but the first column.
+    """
+    names, units = list(sweep_data.column_names), list(sweep_data.column_units)
+    table = ResultTable(names + [name + STD_SUFFIX for name in names[1:]],
+                        units + units[1:],
+                        np.column_stack([stats.mean, stats.std[:, 1:]]),
+                        dict(sweep_data.params, repeats=stats.n_added))
+
+    averaged = type(sweep_data)()
+    averaged.titles = table.titles
+    averaged.data = table.data
+    averaged.params = table.params
+
+    return averaged
+
+
+def std_columns(names):
+    """
+    Returns a dictionary which maps the index of every column with a standard
+    deviation column to the index of the latter.
+    """
+    index = dict((name, i) for i, name in enumerate(names))
+    return dict((index[name[:-len(STD_SUFFIX)]], i) for i, name in enumerate(names)
+                if name.endswith(STD_SUFFIX) and name[:-len(STD_SUFFIX)] in index)
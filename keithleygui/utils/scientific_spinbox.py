@@ -26,7 +26,8 @@ import numpy as np
 import re
 from decimal import Decimal as D  # Use decimal to avoid accumulating floating-point errors
 from decimal import ROUND_FLOOR
-import math
+
+from keithleygui.utils.si_format import format_si, format_si_int
 
 
 __all__ = ['ScienDSpinBox', 'ScienSpinBox']
@@ -59,11 +60,75 @@ class ErrorBox(QtWidgets.QWidget):
         p.end()
 
 
+# Size hints of spin boxes only depend on style, font and screen resolution. They are
+# computed from reference widgets once per combination instead of on every call.
+_size_hint_cache = dict()
+
+
+def spinbox_size_hint(widget):
+    """
+    Returns the size hint of a QDoubleSpinBox with the style and font of `widget`. On
+    macOS, the height is that of a QLineEdit instead, see ScienDSpinBox.sizeHint.
+
+    :param widget: QWidget, the spin box to return the size hint for
+    :return: QSize, the cached size hint
+    """
+    style = widget.style()
+    font = widget.font()
+    key = (style.metaObject().className(), font.key(), widget.logicalDpiX(),
+           widget.logicalDpiY())
+
+    try:
+        return QtCore.QSize(_size_hint_cache[key])
+    except KeyError:
+        pass
+
+    spinbox = QtWidgets.QDoubleSpinBox()
+    spinbox.setStyle(style)
+    spinbox.setFont(font)
+    width = spinbox.sizeHint().width()
+
+    if sys.platform == 'darwin':
+        line_edit = QtWidgets.QLineEdit()
+        line_edit.setStyle(style)
+        line_edit.setFont(font)
+        height = line_edit.sizeHint().height() + 2
+    else:
+        height = spinbox.sizeHint().height()
+
+    _size_hint_cache[key] = QtCore.QSize(width, height)
+    return QtCore.QSize(width, height)
+
+
+def clear_size_hint_cache():
+    """Clears all cached size hints, e.g., after a change of style sheet."""
+    _size_hint_cache.clear()
+
+
+class ParseResult(object):
+    """
+    Result of a single validation pass: the validator state and the match groups.
+
+    :ivar state: enum QValidator::State
+    :ivar groups: dict of match groups by name, or None if the string is invalid
+    """
+    __slots__ = ('state', 'groups')
+
+    def __init__(self, state, groups):
+        self.state = state
+        self.groups = groups
+
+
 class FloatValidator(QtGui.QValidator):
     """
     This is a validator for float values represented as strings in scientific notation.
     (i.e. "1.35e-9", ".24E+8", "14e3" etc.)
     Also supports SI unit prefix like 'M', 'n' etc.
+
+    Validation is done in a single pass by one precompiled pattern which matches all
+    acceptable strings and all incomplete strings that can still become acceptable. Which
+    groups matched determines the state. The result for the last string is kept so that
+    the spin box can reuse it to convert the text into a value.
     """
 
     float_re = re.compile(r'(\s*([+-]?)(\d+\.\d+|\.\d+|\d+\.?)([eE][+-]?\d+)?\s?([YZEPTGMkmµunpfazy]?)\s*)',
@@ -74,6 +139,62 @@ class FloatValidator(QtGui.QValidator):
                  'exponent': 3,
                  'si': 4}
 
+    # Matches complete and incomplete input. An incomplete exponent is only tried after
+    # the SI prefix so that "1E" is read as 1 exa and not as the start of "1E3".
+    state_re = re.compile(r"""
+        \s*(?P<sign>[+-]?)
+        (?:
+            (?P<inf>[iI](?:[nN](?:[fF])?)?)
+          | (?P<mantissa>\d+\.\d*|\.\d*|\d+)?
+            (?:
+                (?P<exponent>[eE][+-]?\d+)?\s?(?P<si>[YZEPTGMkmµunpfazy])?
+              | (?P<partial_exponent>[eE][+-]?)
+            )
+        )
+        \s*$""", flags=re.UNICODE | re.VERBOSE)
+
+    def __init__(self, *args, **kwargs):
+        super(FloatValidator, self).__init__(*args, **kwargs)
+        self._last_string = None
+        self._last_result = None
+
+    def parse(self, string):
+        """
+        Validates a string and returns the state and match groups in a single pass. The
+        result of the previous call is reused if the string did not change.
+
+        The groups are 'match', 'sign', 'mantissa', 'exponent', 'si' and 'inf'. For
+        incomplete input, only the complete parts are set, e.g., "1.5e-" has the mantissa
+        "1.5" but no exponent.
+
+        :param string: str, input string to be parsed
+        :return: ParseResult with the validator state and the groups (None if invalid)
+        """
+        if string == self._last_string:
+            return self._last_result
+
+        match = self.state_re.match(string)
+
+        if match is None:
+            result = ParseResult(self.Invalid, None)
+        else:
+            groups = match.groupdict()
+            groups['match'] = string
+            inf = groups['inf']
+            mantissa = groups['mantissa']
+            if inf is not None:
+                complete = len(inf) == 3
+            else:
+                complete = (mantissa is not None and mantissa != '.' and
+                            groups['partial_exponent'] is None)
+                if mantissa == '.':
+                    groups['mantissa'] = None
+            result = ParseResult(self.Acceptable if complete else self.Intermediate, groups)
+
+        self._last_string = string
+        self._last_result = result
+        return result
+
     def validate(self, string, position):
         """
         This is the actual validator. It checks whether the current user input is a valid string
@@ -89,30 +210,14 @@ class FloatValidator(QtGui.QValidator):
         :return: enum QValidator::State: the returned validator state,
                  str: the input string, int: the cursor position
         """
-        # Return intermediate status when empty string is passed or when incomplete "[+-]inf"
-        if string.strip() in '+.-.' or string.strip() in list('YZEPTGMkmµunpfazy') or re.match(
-                r'[+-]?(in$|i$)', string, re.IGNORECASE):
-            return self.Intermediate, string, position
+        result = self.parse(string)
 
-        # Accept input of [+-]inf. Not case sensitive.
-        if re.match(r'[+-]?\binf$', string, re.IGNORECASE):
+        if result.state == self.Acceptable and result.groups['inf'] is not None:
             return self.Acceptable, string.lower(), position
-
-        group_dict = self.get_group_dict(string)
-        if group_dict:
-            if group_dict['match'] == string:
-                return self.Acceptable, string, position
-            if string.count('.') > 1:
-                return self.Invalid, group_dict['match'], position
-            if position > len(string):
-                position = len(string)
-            if string[position-1] in 'eE-+' and 'i' not in string.lower():
-                return self.Intermediate, string, position
-            return self.Invalid, group_dict['match'], position
+        elif result.state == self.Invalid:
+            return self.Invalid, self.fixup(string), position
         else:
-            if string[position-1] in 'eE-+.' and 'i' not in string.lower():
-                return self.Intermediate, string, position
-            return self.Invalid, '', position
+            return result.state, string, position
 
     def get_group_dict(self, string):
         """
@@ -120,9 +225,16 @@ class FloatValidator(QtGui.QValidator):
         The match groups will be put into a dictionary with string descriptors as keys describing
         the role of the specific group (i.e. mantissa, exponent, si-prefix etc.)
 
+        Valid and incomplete input is taken from :meth:`parse`. Other strings are searched for
+        the first valid number.
+
         :param string: str, input string to be matched
         :return: dictionary containing groups as items and descriptors as keys (see: self.group_map)
         """
+        result = self.parse(string)
+        if result.groups is not None:
+            return result.groups if result.groups['mantissa'] else False
+
         match = self.float_re.search(string)
         if not match:
             return False
@@ -146,6 +258,8 @@ class IntegerValidator(QtGui.QValidator):
     Using engineering notation only positive exponents are allowed
     (i.e. "1e9", "2E+8", "14e+3" etc.)
     Also supports non-fractional SI unit prefix like 'M', 'k' etc.
+
+    Validation is done in a single pass, see :class:`FloatValidator`.
     """
 
     int_re = re.compile(r'(([+-]?\d+)([eE]\+?\d+)?\s?([YZEPTGMk])?\s*)', flags=re.UNICODE)
@@ -155,6 +269,46 @@ class IntegerValidator(QtGui.QValidator):
                  'si': 3
                  }
 
+    state_re = re.compile(r"""
+        \s*(?P<mantissa>[+-]?\d*)
+        (?:
+            (?P<exponent>[eE]\+?\d+)?\s?(?P<si>[YZEPTGMk])?
+          | (?P<partial_exponent>[eE]\+?)
+        )
+        \s*$""", flags=re.UNICODE | re.VERBOSE)
+
+    def __init__(self, *args, **kwargs):
+        super(IntegerValidator, self).__init__(*args, **kwargs)
+        self._last_string = None
+        self._last_result = None
+
+    def parse(self, string):
+        """
+        Validates a string and returns the state and match groups in a single pass. The
+        result of the previous call is reused if the string did not change.
+
+        :param string: str, input string to be parsed
+        :return: ParseResult with the validator state and the groups (None if invalid)
+        """
+        if string == self._last_string:
+            return self._last_result
+
+        match = self.state_re.match(string)
+
+        if match is None:
+            result = ParseResult(self.Invalid, None)
+        else:
+            groups = match.groupdict()
+            groups['match'] = string
+            if not groups['mantissa'].lstrip('+-'):
+                groups['mantissa'] = None
+            complete = groups['mantissa'] is not None and groups['partial_exponent'] is None
+            result = ParseResult(self.Acceptable if complete else self.Intermediate, groups)
+
+        self._last_string = string
+        self._last_result = result
+        return result
+
     def validate(self, string, position):
         """
         This is the actual validator. It checks whether the current user input is a valid string
@@ -170,23 +324,12 @@ class IntegerValidator(QtGui.QValidator):
         :return: enum QValidator::State: the returned validator state,
                  str: the input string, int: the cursor position
         """
-        # Return intermediate status when empty string is passed or cursor is at index 0
-        if not string.strip() or string.strip() in list('YZEPTGMk'):
-            return self.Intermediate, string, position
-
-        group_dict = self.get_group_dict(string)
-        if group_dict:
-            if group_dict['match'] == string:
-                return self.Acceptable, string, position
+        result = self.parse(string)
 
-            if position > len(string):
-                position = len(string)
-            if string[position-1] in 'eE-+':
-                return self.Intermediate, string, position
-
-            return self.Invalid, group_dict['match'], position
+        if result.state == self.Invalid:
+            return self.Invalid, self.fixup(string), position
         else:
-            return self.Invalid, '', position
+            return result.state, string, position
 
     def get_group_dict(self, string):
         """
@@ -194,9 +337,16 @@ class IntegerValidator(QtGui.QValidator):
         The match groups will be put into a dictionary with string descriptors as keys describing
         the role of the specific group (i.e. mantissa, exponent, si-prefix etc.)
 
+        Valid and incomplete input is taken from :meth:`parse`. Other strings are searched for
+        the first valid number.
+
         :param string: str, input string to be matched
         :return: dictionary containing groups as items and descriptors as keys (see: self.group_map)
         """
+        result = self.parse(string)
+        if result.groups is not None:
+            return result.groups if result.groups['mantissa'] else False
+
         match = self.int_re.search(string)
         if not match:
             return False
@@ -277,12 +427,13 @@ class ScienDSpinBox(QtWidgets.QAbstractSpinBox):
         Bug fix for Qt on macOS: ensure that the QLineEdit in a QDoubleSpinbox
         has the same height as a stand-alone QLineEdit.
         """
-        width = QtWidgets.QDoubleSpinBox().sizeHint().width()
-        if sys.platform == 'darwin':
-            height = QtWidgets.QLineEdit().sizeHint().height() + 2
-        else:
-            height = QtWidgets.QDoubleSpinBox().sizeHint().height()
-        return QtCore.QSize(width, height)
+        return spinbox_size_hint(self)
+
+    def changeEvent(self, event):
+        if event.type() in (QtCore.QEvent.StyleChange, QtCore.QEvent.FontChange):
+            clear_size_hint_cache()
+            self.updateGeometry()
+        super(ScienDSpinBox, self).changeEvent(event)
 
     @property
     def dynamic_stepping(self):
@@ -758,8 +909,9 @@ class ScienDSpinBox(QtWidgets.QAbstractSpinBox):
         if position > end:
             position = end
 
-        value = self.valueFromText(text)
-        _, in_range = self.check_range(value)
+        # reuses the parse of the validator
+        value = self.valueFromText(string)
+        in_range = value is False or self.check_range(value)[1]
         self.errorBox.setVisible(not in_range)
 
         return state, text, position
@@ -830,107 +982,14 @@ class ScienDSpinBox(QtWidgets.QAbstractSpinBox):
         in the SpinBox.
         Suffix and Prefix must not be handled here, just the si-Prefix.
 
-        The main problem here is, that a scaled float with a suffix is represented by a different
-        machine precision than the total value.
-        This method is so complicated because it represents the actual precision of the value as
-        float and not the precision of the scaled si float.
-        '{:.20f}'.format(value) shows different digits than
-        '{:.20f} {}'.format(scaled_value, si_prefix)
+        Formatting is done by the cached formatter in keithleygui.utils.si_format which scales
+        the value in decimal arithmetic, so that the displayed digits represent the actual
+        precision of the value and not the precision of the scaled float.
 
         :param value: float|decimal.Decimal, the numeric value to be formatted into a string
         :return: str, the formatted string representing the input value
         """
-        # Catch infinity value
-        if np.isinf(float(value)):
-            if value < 0:
-                return '-inf '
-            else:
-                return 'inf '
-
-        sign = '-' if value < 0 else ''
-        fractional, integer = math.modf(abs(value))
-        integer = int(integer)
-        si_prefix = ''
-        prefix_index = 0
-        if integer != 0 or fractional >= 0.1:
-            integer_str = str(integer)
-            fractional_str = ''
-            while len(integer_str) > 3:
-                fractional_str = integer_str[-3:] + fractional_str
-                integer_str = integer_str[:-3]
-                if prefix_index < 8:
-                    si_prefix = 'kMGTPEZY'[prefix_index]
-                else:
-                    si_prefix = 'e{0:d}'.format(3 * (prefix_index + 1))
-                prefix_index += 1
-            # Truncate and round to set number of decimals
-            # Add digits from fractional if it's not already enough for set self.__decimals
-            if self.__decimals < len(fractional_str):
-                round_indicator = int(fractional_str[self.__decimals])
-                fractional_str = fractional_str[:self.__decimals]
-                if round_indicator >= 5:
-                    if not fractional_str:
-                        fractional_str = '1'
-                    else:
-                        fractional_str = str(int(fractional_str) + 1)
-            elif self.__decimals == len(fractional_str):
-                if fractional >= 0.5:
-                    if fractional_str:
-                        fractional_int = int(fractional_str) + 1
-                        fractional_str = str(fractional_int)
-                    else:
-                        fractional_str = '1'
-            elif self.__decimals > len(fractional_str):
-                digits_to_add = self.__decimals - len(fractional_str)  # number of digits to add
-                fractional_tmp_str = ('{0:.' + str(digits_to_add) + 'f}').format(fractional)
-                if fractional_tmp_str.startswith('1'):
-                    if fractional_str:
-                        fractional_str = str(int(fractional_str) + 1) + '0' * digits_to_add
-                    else:
-                        fractional_str = '1' + '0' * digits_to_add
-                else:
-                    fractional_str += fractional_tmp_str.split('.')[1]
-            # Check if the rounding has overflown the fractional part into the integer part
-            if len(fractional_str) > self.__decimals:
-                integer_str = str(int(integer_str) + 1)
-                fractional_str = '0' * self.__decimals
-        elif fractional == 0.0:
-            fractional_str = '0' * self.__decimals
-            integer_str = '0'
-        else:
-            # determine the order of magnitude by comparing the fractional to unit values
-            prefix_index = 1
-            magnitude = 1e-3
-            si_prefix = 'm'
-            while magnitude > fractional:
-                prefix_index += 1
-                magnitude = magnitude ** prefix_index
-                if prefix_index <= 8:
-                    si_prefix = 'mµnpfazy'[prefix_index - 1]  # use si-prefix if possible
-                else:
-                    si_prefix = 'e-{0:d}'.format(3 * prefix_index)  # use engineering notation
-            # Get the string representation of all needed digits from the fractional part of value.
-            digits_needed = 3 * prefix_index + self.__decimals
-            helper_str = ('{0:.' + str(digits_needed) + 'f}').format(fractional)
-            overflow = bool(int(helper_str.split('.')[0]))
-            helper_str = helper_str.split('.')[1]
-            if overflow:
-                integer_str = '1000'
-                fractional_str = '0' * self.__decimals
-            elif (prefix_index - 1) > 0 and helper_str[3 * (prefix_index - 1) - 1] != '0':
-                integer_str = '1000'
-                fractional_str = '0' * self.__decimals
-            else:
-                integer_str = str(int(helper_str[:3 * prefix_index]))
-                fractional_str = helper_str[3 * prefix_index:3 * prefix_index + self.__decimals]
-
-        # Create the actual string representation of value scaled in a scientific way
-        space = '' if si_prefix.startswith('e') else ' '
-        if self.__decimals > 0:
-            string = '{0}{1}.{2}{3}{4}'.format(sign, integer_str, fractional_str, space, si_prefix)
-        else:
-            string = '{0}{1}{2}{3}'.format(sign, integer_str, space, si_prefix)
-        return string
+        return format_si(value, self.__decimals)
 
     def stepEnabled(self):
         """
@@ -954,26 +1013,63 @@ class ScienDSpinBox(QtWidgets.QAbstractSpinBox):
             return
 
         n = D(int(steps))  # n must be integral number of steps.
-        s = [D(-1), D(1)][n >= 0]  # determine sign of step
         value = self.__value  # working copy of current value
         if self.dynamic_stepping:
-            for i in range(int(abs(n))):
-                if value == 0:
-                    step = self.__minimalStep
-                else:
-                    vs = [D(-1), D(1)][value >= 0]
-                    # fudge factor: at some places, the step size depends on the step sign
-                    fudge = D('1.01') ** (s * vs)
-                    exp = abs(value * fudge).log10().quantize(1, rounding=ROUND_FLOOR)
-                    step = self.__singleStep * D(10) ** exp
-                    if self.__minimalStep > 0:
-                        step = max(step, self.__minimalStep)
-                value += s * step
+            value = self._dynamic_step(value, int(steps))
         else:
             value = value + max(self.__minimalStep * n, self.__singleStep * n)
         self.setValue(value)
         return
 
+    def _dynamic_step(self, value, steps):
+        """
+        Moves value by a number of dynamic steps, where the step size scales with the order of
+        magnitude of the value.
+
+        The result is the same as taking the steps one by one. However, all steps which
+        certainly have the same size, i.e., which stay within one decade of the value, are
+        taken at once. Only the steps next to a decade boundary are taken individually. The
+        number of operations therefore scales with the number of decades crossed and not with
+        the number of steps.
+
+        :param value: decimal.Decimal, the start value
+        :param steps: int, number of steps to take, negative for decreasing values
+        :return: decimal.Decimal, the new value
+        """
+        s = [D(-1), D(1)][steps >= 0]  # determine sign of step
+        remaining = abs(steps)
+        while remaining > 0:
+            if value == 0:
+                value += s * self.__minimalStep
+                remaining -= 1
+                continue
+
+            vs = [D(-1), D(1)][value >= 0]
+            # fudge factor: at some places, the step size depends on the step sign
+            fudge = D('1.01') ** (s * vs)
+            exp = abs(value * fudge).log10().quantize(1, rounding=ROUND_FLOOR)
+            step = self.__singleStep * D(10) ** exp
+            if self.__minimalStep > 0:
+                step = max(step, self.__minimalStep)
+
+            if step == 0:
+                break
+
+            # Distance to the decade boundary at which exp changes, in units of step. The
+            # estimate is rounded down and reduced by one step so that all steps taken at once
+            # stay within the current decade, even with rounding errors near the boundary.
+            if s * vs > 0:
+                distance = D(10) ** (exp + 1) / fudge - abs(value)
+            else:
+                distance = abs(value) - D(10) ** exp / fudge
+            n = int((distance / step).to_integral_value(rounding=ROUND_FLOOR)) - 1
+            n = min(max(n, 1), remaining)
+
+            value += s * step * n
+            remaining -= n
+
+        return value
+
     def selectAll(self):
         begin = len(self.__prefix)
         text = self.cleanText()
@@ -1044,12 +1140,13 @@ class ScienSpinBox(QtWidgets.QAbstractSpinBox):
         Bug fix for Qt on macOS: ensure that the QLineEdit in a QDoubleSpinbox
         has the same height as a stand-alone QLineEdit.
         """
-        width = QtWidgets.QDoubleSpinBox().sizeHint().width()
-        if sys.platform == 'darwin':
-            height = QtWidgets.QLineEdit().sizeHint().height() + 2
-        else:
-            height = QtWidgets.QDoubleSpinBox().sizeHint().height()
-        return QtCore.QSize(width, height)
+        return spinbox_size_hint(self)
+
+    def changeEvent(self, event):
+        if event.type() in (QtCore.QEvent.StyleChange, QtCore.QEvent.FontChange):
+            clear_size_hint_cache()
+            self.updateGeometry()
+        super(ScienSpinBox, self).changeEvent(event)
 
     @property
     def dynamic_stepping(self):
@@ -1384,9 +1481,10 @@ class ScienSpinBox(QtWidgets.QAbstractSpinBox):
         if position > end:
             position = end
 
-        value = self.valueFromText(text)
-        _, in_range = self.check_range(value)
-        self.error.setVisible(not in_range)
+        # reuses the parse of the validator
+        value = self.valueFromText(string)
+        in_range = value is False or self.check_range(value)[1]
+        self.errorBox.setVisible(not in_range)
 
         return state, text, position
 
@@ -1440,33 +1538,7 @@ class ScienSpinBox(QtWidgets.QAbstractSpinBox):
         :param value: int, the numeric value to be formatted into a string
         :return: str, the formatted string representing the input value
         """
-        # Convert the integer value to a string
-        sign = '-' if value < 0 else ''
-        value_str = str(abs(value))
-
-        # find out the index of the least significant non-zero digit
-        for digit_index in range(len(value_str)):
-            if value_str[digit_index:].count('0') == len(value_str) - digit_index:
-                break
-
-        # get the engineering notation exponent (multiple of 3)
-        missing_zeros = (len(value_str) - digit_index) % 3
-        exponent = len(value_str) - digit_index - missing_zeros
-
-        # the scaled integer string that is still missing the order of magnitude (si-prefix or e)
-        integer_str = value_str[:digit_index + missing_zeros]
-
-        space = ' ' if self.__suffix else ''
-        # Add si-prefix or, if the exponent is too big, add e-notation
-        if 2 < exponent <= 24:
-            si_prefix = ' ' + 'kMGTPEZY'[exponent // 3 - 1]
-        elif exponent > 24:
-            si_prefix = 'e{0:d}'.format(exponent) + space
-        else:
-            si_prefix = space
-
-        # Assemble the string and return it
-        return sign + integer_str + si_prefix
+        return format_si_int(value, bool(self.__suffix))
 
     def stepEnabled(self):
         """
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Adaptive settling of sweep points.
+
+Instead of waiting a fixed delay after every voltage step, the currents are sampled
+until two consecutive readings agree within a relative tolerance, or until a
+maximum wait has passed. Points where the device responds quickly are measured
+right away and only slow points take long.
+
+The time each point took to settle is recorded in columns named with
+:data:`SETTLE_COLUMN`, e.g., 'Settle time (Vd = -5.0)'. They are listed with the
+data but not plotted.
+
+This module does not depend on Qt.
+"""
+
+from __future__ import division, absolute_import, print_function
+import time
+import numpy as np
+
+
+SETTLE_COLUMN = 'Settle time'
+
+# readings which differ by less than this are equal regardless of the relative
+# tolerance, so that currents close to zero can settle within the noise
+CURRENT_FLOOR = 1e-12  # A
+
+
+def is_settle_column(name):
+    """Returns whether a column holds settle times, or their standard deviation."""
+    return str(name).startswith(SETTLE_COLUMN)
+
+
+def settle_column_name(label=None, v_step=None):
+    """
+    Returns the name of the settle time column of the curve with stepped voltage
+    `label` = `v_step`, or of an IV sweep if no label is given.
+    """
+    if label is None:
+        return SETTLE_COLUMN
+    return '%s (%s = %s)' % (SETTLE_COLUMN, label, v_step)
+
+
+def wait_until_settled(measure, rtol, max_wait, floor=CURRENT_FLOOR, abort_event=None):
+    """
+    Samples readings until they settle, i.e., until all of them changed by at most
+    `rtol` times their magnitude plus `floor` since the previous sample.
+
+    :param measure: Callable which returns a sequence of readings.
+    :param float rtol: Relative tolerance between consecutive readings.
+    :param float max_wait: Time in seconds after which sampling stops even if the
+        readings did not settle.
+    :param float floor: Absolute tolerance between consecutive readings.
+    :param abort_event: Optional :class:`threading.Event` which stops sampling.
+    :returns: Tuple (readings, settle_time, settled) with the last readings as
+        array, the time from the first to the end of the last sample in seconds and
+        whether the readings settled.
+    """
+    t_start = time.time()
+    previous = np.asarray(measure(), dtype=np.float64)
+
+    while True:
+        readings = np.asarray(measure(), dtype=np.float64)
+        settle_time = time.time() - t_start
+
+        settled = bool(np.all(np.abs(readings - previous) <=
+                              rtol * np.abs(readings) + floor))
+        aborted = abort_event is not None and abort_event.is_set()
+
+        if settled or aborted or settle_time >= max_wait:
+            return readings, settle_time, settled
+
+        previous = readings
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Formatting of numbers with SI prefixes, e.g., 1.5e-9 as '1.5 n'.
+
+Numbers are scaled to a mantissa between 1 and 1000 and the matching SI prefix.
+Numbers between 0.1 and 1 are shown without prefix, and numbers beyond the range
+of SI prefixes in engineering notation, e.g., '1.0e27'. The prefix is separated
+from the mantissa by a space, which is kept if there is no prefix so that any unit
+appended to the string is spaced consistently. :func:`format_si_array` can use
+another separator, e.g., a thin space for plot axes.
+
+:func:`format_si` formats single values and caches the results, :func:`format_si_array`
+formats NumPy arrays in a single vectorized pass.
+"""
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+import math
+from decimal import Decimal as D
+from decimal import ROUND_HALF_UP
+import numpy as np
+
+try:
+    from functools import lru_cache
+except ImportError:  # Python 2
+    lru_cache = None
+
+
+__all__ = ['format_si', 'format_si_int', 'format_si_array', 'SEPARATOR', 'THIN_SPACE']
+
+SEPARATOR = ' '
+THIN_SPACE = '\u2009'
+PREFIXES = 'yzafpnµm kMGTPEZY'  # PREFIXES[8 + exponent // 3], blank at index 8
+CACHE_SIZE = 4096
+
+
+def _memoize(func):
+    """Caches results of `func` in an LRU cache with `CACHE_SIZE` entries."""
+    if lru_cache is not None:
+        return lru_cache(maxsize=CACHE_SIZE)(func)
+
+    cache = dict()
+
+    def wrapper(*args):
+        try:
+            return cache[args]
+        except KeyError:
+            if len(cache) >= CACHE_SIZE:
+                cache.clear()
+            result = cache[args] = func(*args)
+            return result
+
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _engineering_exponent(exponent):
+    """Returns the exponent of the SI prefix for a number with the given decimal exponent."""
+    if -1 <= exponent <= 2:
+        return 0
+    else:
+        return 3 * (exponent // 3)
+
+
+def _round(value, exponent, decimals):
+    """Scales a Decimal by 10**-exponent and rounds it half away from zero."""
+    mantissa = value.scaleb(-exponent).quantize(D(1).scaleb(-decimals), ROUND_HALF_UP)
+    return '{0:.{1}f}'.format(mantissa, decimals)
+
+
+def _prefix(exponent, separator=SEPARATOR):
+    index = 8 + exponent // 3
+    if 0 <= index < len(PREFIXES):
+        return separator + PREFIXES[index].strip()
+    else:
+        return 'e{0:d}'.format(exponent)
+
+
+@_memoize
+def format_si(value, decimals=1):
+    """
+    Formats a number with an SI prefix.
+
+    The mantissa is rounded half away from zero. Rounding is exact also for
+    :class:`decimal.Decimal` input and for floats which are not exactly representable
+    in base 10, because the value is scaled in decimal arithmetic. Results are cached.
+
+    :param value: float|decimal.Decimal, the number to format.
+    :param int decimals: Number of digits after the decimal point of the mantissa.
+    :returns: Formatted string, e.g., '-1.50 µ' for -1.5e-6 and two decimals.
+    :rtype: str
+    """
+    if math.isnan(value):
+        return 'nan' + SEPARATOR
+    if math.isinf(value):
+        return '-inf ' if value < 0 else 'inf '
+
+    sign = '-' if value < 0 else ''
+    value = abs(D(value))
+
+    exponent = _engineering_exponent(value.adjusted())
+    mantissa = _round(value, exponent, decimals)
+
+    # rounding may overflow the mantissa to 1000
+    if len(mantissa.split('.')[0]) > 3:
+        exponent += 3
+        mantissa = _round(value, exponent, decimals)
+
+    return sign + mantissa + _prefix(exponent)
+
+
+@_memoize
+def format_si_int(value, separator=False):
+    """
+    Formats an integer with an SI prefix without rounding. Only trailing zeros
+    are absorbed into the prefix, e.g., 45000 becomes '45 k' but 1500 stays '1500'.
+
+    :param int value: The integer to format.
+    :param bool separator: Whether to append a separator if there is no prefix.
+    :returns: Formatted string.
+    :rtype: str
+    """
+    sign = '-' if value < 0 else ''
+    value_str = str(abs(int(value)))
+
+    n_zeros = len(value_str) - len(value_str.rstrip('0')) if value != 0 else 0
+    exponent = n_zeros - n_zeros % 3
+    mantissa = value_str[:len(value_str) - exponent]
+
+    trailing = SEPARATOR if separator else ''
+
+    if 2 < exponent <= 24:
+        return sign + mantissa + SEPARATOR + PREFIXES[8 + exponent // 3]
+    elif exponent > 24:
+        return sign + mantissa + 'e{0:d}'.format(exponent) + trailing
+    else:
+        return sign + mantissa + trailing
+
+
+def format_si_array(values, decimals=1, separator=SEPARATOR):
+    """
+    Vectorized version of :func:`format_si` for float arrays.
+
+    The mantissa is scaled and rounded in floating point, therefore the last
+    digit may differ from :func:`format_si` for values exactly halfway between
+    two roundings.
+
+    :param values: Array-like of numbers.
+    :param int decimals: Number of digits after the decimal point of the mantissa.
+    :param str separator: Separator between the mantissa and the prefix.
+    :returns: Object array of formatted strings with the same shape as `values`.
+    :rtype: numpy.ndarray
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+
+    finite = np.isfinite(values)
+    nonzero = finite & (magnitude > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.where(nonzero, np.floor(np.log10(magnitude)), 0).astype(int)
+
+    exponent = np.where((exponent >= -1) & (exponent <= 2), 0, 3 * (exponent // 3))
+    mantissa = np.where(finite, magnitude, 0) / 10.0**exponent
+    scale = 10.0**decimals
+    rounded = np.floor(mantissa * scale + 0.5) / scale
+
+    # rounding may overflow the mantissa to 1000
+    overflow = rounded >= 1000
+    exponent = np.where(overflow, exponent + 3, exponent)
+    mantissa = np.where(overflow, np.floor(mantissa / 1000 * scale + 0.5) / scale, rounded)
+
+    # assemble strings, only this step is done per element
+    signs = np.where(np.signbit(values) & nonzero, '-', '').ravel().tolist()
+    fmt = '%.{0}f'.format(decimals)
+    strings = [sign + fmt % m + _prefix(e, separator) for sign, m, e in
+               zip(signs, mantissa.ravel().tolist(), exponent.ravel().tolist())]
+    strings = np.array(strings, dtype=object).reshape(values.shape)
+
+    strings[np.isnan(values)] = 'nan' + separator
+    strings[np.isposinf(values)] = 'inf '
+    strings[np.isneginf(values)] = '-inf '
+
+    return strings
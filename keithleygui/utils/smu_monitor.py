@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import threading
+import visa
+from qtpy import QtCore
+
+
+class MonitorThread(QtCore.QThread):
+    """
+    Continuously polls voltage and current of all given SMUs. Readings are not
+    emitted per sample but kept as the latest value per SMU and must be
+    collected with :meth:`pop_readings`. This leaves the refresh rate of the
+    GUI independent of the poll rate. Polling is paused with :meth:`pause` while
+    a measurement runs and skipped while the Keithley is busy otherwise, e.g.,
+    with another program.
+    """
+
+    def __init__(self, keithley, smu_list, interval):
+        QtCore.QThread.__init__(self)
+        self.keithley = keithley
+        self.smu_list = list(smu_list)
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._readings = dict()
+        self._new_readings = False
+        self._stop_event = threading.Event()
+        self._pause_event = threading.Event()
+        self._query_lock = threading.Lock()  # held while an SMU is queried
+
+    def __del__(self):
+        self.wait()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def pause(self):
+        """Pauses polling and waits until a query in progress has finished."""
+        self._pause_event.set()
+        with self._query_lock:
+            pass
+
+    def resume(self):
+        self._pause_event.clear()
+
+    def pop_readings(self):
+        """
+        Returns a dictionary with the latest (voltage, current) tuple for every SMU
+        or `None` if no new readings arrived since the last call.
+        """
+        with self._lock:
+            if not self._new_readings:
+                return None
+            self._new_readings = False
+            return dict(self._readings)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            for smu_name in self.smu_list:
+                with self._query_lock:
+                    if (self._pause_event.is_set() or not self.keithley.connected or
+                            self.keithley.busy):
+                        break
+                    smu = getattr(self.keithley, smu_name)
+                    try:
+                        v = smu.measure.v()
+                        i = smu.measure.i()
+                    except (visa.VisaIOError, visa.InvalidSession, OSError):
+                        break
+                with self._lock:
+                    self._readings[smu_name] = (v, i)
+                    self._new_readings = True
+
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import os.path as osp
+import re
+import time
+import json
+import sqlite3
+import numpy as np
+from qtpy import QtCore, QtWidgets
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL,
+    format TEXT,
+    sweep_type TEXT,
+    t_int REAL,
+    delay REAL,
+    pulsed INTEGER,
+    v_min REAL,
+    v_max REAL,
+    steps TEXT,
+    n_points INTEGER,
+    params TEXT,
+    smu_settings TEXT,
+    recorded REAL,
+    saved REAL,
+    accessed REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sweeps_accessed ON sweeps (accessed);
+CREATE INDEX IF NOT EXISTS idx_sweeps_type ON sweeps (sweep_type, recorded);
+CREATE INDEX IF NOT EXISTS idx_sweeps_t_int ON sweeps (t_int);
+CREATE INDEX IF NOT EXISTS idx_sweeps_delay ON sweeps (delay);
+CREATE INDEX IF NOT EXISTS idx_sweeps_pulsed ON sweeps (pulsed);
+CREATE INDEX IF NOT EXISTS idx_sweeps_voltage ON sweeps (v_min, v_max);
+DROP INDEX IF EXISTS idx_sweeps_filename;
+CREATE INDEX IF NOT EXISTS idx_sweeps_filename_nocase ON sweeps (filename COLLATE NOCASE);
+"""
+
+# full text index of file names for substring search, requires SQLite 3.34 or later
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS sweeps_fts USING fts5 (
+    filename, content='sweeps', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS sweeps_fts_insert AFTER INSERT ON sweeps BEGIN
+    INSERT INTO sweeps_fts (rowid, filename) VALUES (new.id, new.filename);
+END;
+CREATE TRIGGER IF NOT EXISTS sweeps_fts_delete AFTER DELETE ON sweeps BEGIN
+    INSERT INTO sweeps_fts (sweeps_fts, rowid, filename)
+    VALUES ('delete', old.id, old.filename);
+END;
+CREATE TRIGGER IF NOT EXISTS sweeps_fts_update AFTER UPDATE OF filename ON sweeps BEGIN
+    INSERT INTO sweeps_fts (sweeps_fts, rowid, filename)
+    VALUES ('delete', old.id, old.filename);
+    INSERT INTO sweeps_fts (rowid, filename) VALUES (new.id, new.filename);
+END;
+"""
+
+# minimum length of a substring search, shorter names are matched as prefix
+FTS_MIN_LENGTH = 3
+
+STEP_PATTERN = re.compile(r'\((\w+)\s*=\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)\)')
+
+
+def _recorded_time(params, filepath):
+    """Returns the time of measurement from the params or the file modification time."""
+    recorded = params.get('recorded')
+    if isinstance(recorded, time.struct_time):
+        return time.mktime(recorded)
+    elif osp.isfile(filepath):
+        return osp.getmtime(filepath)
+    else:
+        return time.time()
+
+
+def _sweep_summary(sweep_data):
+    """
+    Returns (v_min, v_max, steps, n_points) of a sweep. The voltage range is taken
+    from the first column, the stepped voltages from the remaining column names,
+    e.g., 'Vd = -5, -60'. Time series have no voltage range.
+    """
+    data = sweep_data.data
+    n_points = 0 if data is None else int(np.atleast_2d(data).shape[0])
+
+    if n_points == 0 or sweep_data.params.get('sweep_type') == 'timeseries':
+        return None, None, '', n_points
+
+    x = np.atleast_2d(data)[:, 0]
+    v_min, v_max = float(np.nanmin(x)), float(np.nanmax(x))
+
+    steps = []
+    for name in sweep_data.column_names[1:]:
+        match = STEP_PATTERN.search(name)
+        if match and match.group(2) not in steps:
+            label = match.group(1)
+            steps.append(match.group(2))
+
+    steps = '%s = %s' % (label, ', '.join(steps)) if steps else ''
+
+    return v_min, v_max, steps, n_points
+
+
+class SweepCatalog(object):
+    """
+    SQLite index of all saved and loaded sweeps.
+
+    Every file is recorded once with its measurement parameters, the voltage range and
+    steps, SMU settings if known, and the times of measurement, saving and last access.
+    All parameters used for searching are indexed columns. File names are searched
+    by substring in a trigram full text index if SQLite supports it, otherwise by
+    prefix in the index of the filename column. The full parameter dictionary is kept
+    as JSON.
+
+    :param str path: Path of the database file.
+    """
+
+    SWEEP_TYPES = ('transfer', 'output', 'iv', 'timeseries')
+    LIMIT = 200
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.executescript(SCHEMA)
+        self.fts = self._create_fts()
+
+    def _create_fts(self):
+        """Creates the full text index of file names, returns whether it exists."""
+        exists = self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                                  "AND name = 'sweeps_fts'").fetchone() is not None
+        try:
+            with self._db:
+                self._db.executescript(FTS_SCHEMA)
+                if not exists:  # index files recorded before
+                    self._db.execute("INSERT INTO sweeps_fts (sweeps_fts) "
+                                     "VALUES ('rebuild')")
+        except sqlite3.OperationalError:  # no FTS5 or trigram tokenizer
+            return False
+        return True
+
+    def close(self):
+        self._db.close()
+
+    def add(self, filepath, sweep_data, smu_settings=None, saved=False):
+        """
+        Records a sweep file or updates its entry.
+
+        :param str filepath: Path of the file.
+        :param sweep_data: ResultTable instance with the content of the file.
+        :param dict smu_settings: Settings of all SMUs during the measurement or `None`
+            if they are not known, e.g., when loading a file.
+        :param bool saved: `True` if the file has just been saved, `False` if loaded.
+        """
+        filepath = osp.abspath(filepath)
+        params = sweep_data.params
+        v_min, v_max, steps, n_points = _sweep_summary(sweep_data)
+        now = time.time()
+
+        row = {
+            'path': filepath,
+            'filename': osp.basename(filepath),
+            'format': osp.splitext(filepath)[1].lstrip('.').lower(),
+            'sweep_type': params.get('sweep_type'),
+            't_int': params.get('t_int'),
+            'delay': params.get('delay'),
+            'pulsed': None if 'pulsed' not in params else int(bool(params['pulsed'])),
+            'v_min': v_min,
+            'v_max': v_max,
+            'steps': steps,
+            'n_points': n_points,
+            'params': json.dumps(params, default=str, sort_keys=True),
+            'smu_settings': None if smu_settings is None else json.dumps(smu_settings),
+            'recorded': _recorded_time(params, filepath),
+            'saved': now if saved else None,
+            'accessed': now,
+        }
+
+        with self._db:
+            existing = self._db.execute('SELECT smu_settings, saved FROM sweeps '
+                                        'WHERE path = ?', (filepath,)).fetchone()
+            if existing is None:
+                columns = ', '.join(row.keys())
+                values = ', '.join(':' + key for key in row.keys())
+                self._db.execute('INSERT INTO sweeps (%s) VALUES (%s)' % (columns, values),
+                                 row)
+            else:
+                # loading a file must not forget what is only known when saving it
+                if row['smu_settings'] is None:
+                    row['smu_settings'] = existing['smu_settings']
+                if row['saved'] is None:
+                    row['saved'] = existing['saved']
+                assignments = ', '.join('%s = :%s' % (key, key) for key in row.keys())
+                self._db.execute('UPDATE sweeps SET %s WHERE path = :path' % assignments,
+                                 row)
+
+    def remove(self, filepath):
+        """Removes a file from the catalog."""
+        with self._db:
+            self._db.execute('DELETE FROM sweeps WHERE path = ?',
+                             (osp.abspath(filepath),))
+
+    def recent(self, limit=LIMIT):
+        """Returns the most recently saved or loaded sweeps."""
+        return self.search(limit=limit)
+
+    def search(self, sweep_type=None, pulsed=None, t_int=None, delay=None, voltage=None,
+               name=None, limit=LIMIT):
+        """
+        Searches the catalog. All given criteria must match, criteria which are `None`
+        are ignored. Results are sorted by the time of last access, most recent first.
+
+        :param str sweep_type: 'transfer', 'output', 'iv' or 'timeseries'.
+        :param bool pulsed: Pulsed or continuous sweeps.
+        :param float t_int: Integration time in sec.
+        :param float delay: Settling delay in sec.
+        :param float voltage: A voltage which lies within the swept range.
+        :param str name: Part of the filename, case insensitive. Only the beginning
+            of the filename if it is shorter than `FTS_MIN_LENGTH` or if there is no
+            full text index.
+        :param int limit: Maximum number of results.
+        :returns: List of rows which can be indexed by column name.
+        """
+        conditions = []
+        args = []
+
+        if sweep_type is not None:
+            conditions.append('sweep_type = ?')
+            args.append(sweep_type)
+        if pulsed is not None:
+            conditions.append('pulsed = ?')
+            args.append(int(bool(pulsed)))
+        for column, value in (('t_int', t_int), ('delay', delay)):
+            if value is not None:
+                # floats from files may differ in the last digits
+                tolerance = abs(value) * 1e-9
+                conditions.append('%s BETWEEN ? AND ?' % column)
+                args += [value - tolerance, value + tolerance]
+        if voltage is not None:
+            conditions.append('v_min <= ? AND v_max >= ?')
+            args += [voltage, voltage]
+        if name and self.fts and len(name) >= FTS_MIN_LENGTH:
+            conditions.append('id IN (SELECT rowid FROM sweeps_fts '
+                              'WHERE sweeps_fts MATCH ?)')
+            args.append('"%s"' % name.replace('"', '""'))
+        elif name:
+            conditions.append("filename LIKE ? ESCAPE '\\'")
+            args.append(re.sub(r'([%_\\])', r'\\\1', name) + '%')
+
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        query = 'SELECT * FROM sweeps %s ORDER BY accessed DESC LIMIT ?' % where
+
+        return self._db.execute(query, args + [int(limit)]).fetchall()
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM sweeps').fetchone()[0]
+
+
+class SweepCatalogDock(QtWidgets.QDockWidget):
+    """
+    Dock widget to search the :class:`SweepCatalog`. Without search criteria, it lists
+    the most recently used sweeps. Double-clicking an entry emits :attr:`loadRequested`
+    with the path of the file.
+    """
+
+    loadRequested = QtCore.Signal(str)
+
+    HEADERS = ['Recorded', 'Type', 'Mode', 't_int [s]', 'Delay [s]', 'Range [V]',
+               'Steps [V]', 'File']
+    SEARCH_DELAY = 150  # ms
+
+    def __init__(self, catalog, parent=None):
+        QtWidgets.QDockWidget.__init__(self, 'Sweep Catalog', parent)
+        self.setObjectName('sweepCatalogDock')
+        self.catalog = catalog
+
+        widget = QtWidgets.QWidget(self)
+        layout = QtWidgets.QGridLayout(widget)
+
+        self.lineEditName = QtWidgets.QLineEdit(widget)
+        self.lineEditName.setPlaceholderText('Filename')
+        self.comboBoxType = QtWidgets.QComboBox(widget)
+        self.comboBoxType.addItems(['Any type'] + list(SweepCatalog.SWEEP_TYPES))
+        self.comboBoxMode = QtWidgets.QComboBox(widget)
+        self.comboBoxMode.addItems(['Any mode', 'Continuous', 'Pulsed'])
+        self.lineEditTInt = QtWidgets.QLineEdit(widget)
+        self.lineEditTInt.setPlaceholderText('t_int [s]')
+        self.lineEditVoltage = QtWidgets.QLineEdit(widget)
+        self.lineEditVoltage.setPlaceholderText('Voltage in range [V]')
+
+        self.treeWidget = QtWidgets.QTreeWidget(widget)
+        self.treeWidget.setHeaderLabels(self.HEADERS)
+        self.treeWidget.setRootIsDecorated(False)
+        self.treeWidget.setUniformRowHeights(True)
+        self.treeWidget.setAlternatingRowColors(True)
+
+        layout.addWidget(self.lineEditName, 0, 0, 1, 2)
+        layout.addWidget(self.comboBoxType, 0, 2)
+        layout.addWidget(self.comboBoxMode, 1, 0)
+        layout.addWidget(self.lineEditTInt, 1, 1)
+        layout.addWidget(self.lineEditVoltage, 1, 2)
+        layout.addWidget(self.treeWidget, 2, 0, 1, 3)
+        self.setWidget(widget)
+
+        # restart the query after typing has paused
+        self.searchTimer = QtCore.QTimer(self)
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(self.SEARCH_DELAY)
+        self.searchTimer.timeout.connect(self.refresh)
+
+        for line_edit in (self.lineEditName, self.lineEditTInt, self.lineEditVoltage):
+            line_edit.textChanged.connect(self.searchTimer.start)
+        self.comboBoxType.currentIndexChanged.connect(self.refresh)
+        self.comboBoxMode.currentIndexChanged.connect(self.refresh)
+        self.treeWidget.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+    @staticmethod
+    def _to_float(text):
+        try:
+            return float(text)
+        except ValueError:
+            return None
+
+    @QtCore.Slot()
+    def refresh(self):
+        """Queries the catalog with the current search criteria and shows the result."""
+        if not self.isVisible():
+            return
+
+        type_index = self.comboBoxType.currentIndex()
+        mode_index = self.comboBoxMode.currentIndex()
+
+        rows = self.catalog.search(
+            sweep_type=self.comboBoxType.currentText() if type_index > 0 else None,
+            pulsed=(mode_index == 2) if mode_index > 0 else None,
+            t_int=self._to_float(self.lineEditTInt.text()),
+            voltage=self._to_float(self.lineEditVoltage.text()),
+            name=self.lineEditName.text().strip() or None,
+        )
+
+        items = []
+        for row in rows:
+            if row['v_min'] is None:
+                v_range = ''
+            else:
+                v_range = '%g to %g' % (row['v_min'], row['v_max'])
+            mode = {None: '', 0: 'Continuous', 1: 'Pulsed'}[row['pulsed']]
+            columns = [time.strftime('%Y-%m-%d %H:%M', time.localtime(row['recorded'])),
+                       row['sweep_type'] or '', mode,
+                       '' if row['t_int'] is None else '%g' % row['t_int'],
+                       '' if row['delay'] is None else '%g' % row['delay'],
+                       v_range, row['steps'], row['filename']]
+            item = QtWidgets.QTreeWidgetItem(columns)
+            item.setData(0, QtCore.Qt.UserRole, row['path'])
+            item.setToolTip(len(columns) - 1, row['path'])
+            items.append(item)
+
+        self.treeWidget.clear()
+        self.treeWidget.addTopLevelItems(items)
+
+    @QtCore.Slot(bool)
+    def _on_visibility_changed(self, visible):
+        if visible:
+            self.refresh()
+
+    @QtCore.Slot(QtWidgets.QTreeWidgetItem, int)
+    def _on_item_double_clicked(self, item, column):
+        self.loadRequested.emit(item.data(0, QtCore.Qt.UserRole))
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import os
+import os.path as osp
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class HistoryEntry(object):
+    """
+    Entry of the :class:`SweepHistory`. The column titles and parameters of a sweep
+    are always kept in memory. The data and prepared plot arrays are dropped when
+    the entry is evicted, and the data is then read back from the spill file.
+    """
+
+    def __init__(self, label, sweep_data, info):
+        self.label = label
+        self.info = info
+        self.sweep_class = type(sweep_data)
+        self.titles = sweep_data.titles
+        self.params = sweep_data.params
+        self.sweep_data = sweep_data
+        self.arrays = None  # prepared plot arrays, see PlotArrays
+        self.spill_path = None
+
+    @property
+    def resident(self):
+        return self.sweep_data is not None
+
+    @property
+    def nbytes(self):
+        """Memory held by the entry in bytes."""
+        if self.sweep_data is None:
+            return 0
+        n = 0 if self.sweep_data.data is None else self.sweep_data.data.nbytes
+        if self.arrays is not None:
+            n += self.arrays.nbytes
+        return n
+
+
+class SweepHistory(object):
+    """
+    History of recently measured or loaded sweeps with a memory budget.
+
+    Entries are kept in order of last use. When the data and plot arrays of all
+    entries exceed `max_bytes`, the least recently used entries are evicted:
+    their data is written once to a binary spill file and released. Getting an
+    evicted entry reads its data back and makes it the most recently used one.
+    The most recently used entry is never evicted. Beyond `max_entries`, the
+    oldest entries are removed completely.
+
+    :param int max_bytes: Memory budget for resident sweeps in bytes.
+    :param str spill_dir: Directory for spill files.
+    :param int max_entries: Maximum number of entries.
+    """
+
+    def __init__(self, max_bytes, spill_dir, max_entries=1000):
+        self.max_bytes = int(max_bytes)
+        self.max_entries = int(max_entries)
+        self.spill_dir = spill_dir
+
+        self._entries = OrderedDict()  # entries by key, least recently used first
+        self._nbytes = 0
+        # spill files are unique per session, other instances may share the folder
+        self._prefix = 'sweep_%s_%s_' % (os.getpid(), int(time.time()))
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def keys(self):
+        """Returns all keys, least recently used first."""
+        return list(self._entries.keys())
+
+    @property
+    def nbytes(self):
+        """Memory held by all resident entries in bytes."""
+        return self._nbytes
+
+    def label(self, key):
+        return self._entries[key].label
+
+    def info(self, key):
+        return self._entries[key].info
+
+    def is_resident(self, key):
+        return self._entries[key].resident
+
+    def add(self, key, label, sweep_data, info=None):
+        """
+        Adds a sweep as the most recently used entry, replacing an entry with the
+        same key.
+
+        :param key: Unique key, e.g., the path of a loaded file.
+        :param str label: Label for display.
+        :param sweep_data: ResultTable instance.
+        :param dict info: Further information which is kept in memory.
+        :returns: Keys of the entries which were removed to stay within `max_entries`.
+        :rtype: list
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        entry = HistoryEntry(label, sweep_data, info or dict())
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+
+        removed = []
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            removed.append(oldest)
+
+        self._evict()
+
+        return removed
+
+    def get(self, key):
+        """
+        Returns the sweep data and prepared plot arrays of an entry and marks it as
+        the most recently used one. The plot arrays are `None` if they have not been
+        set or were evicted.
+
+        :returns: Tuple (sweep_data, arrays).
+        """
+        entry = self._entries.pop(key)
+        self._entries[key] = entry
+
+        if not entry.resident:
+            entry.sweep_data = self._restore(entry)
+            self._nbytes += entry.nbytes
+            self._evict()
+
+        return entry.sweep_data, entry.arrays
+
+    def set_arrays(self, key, arrays):
+        """Keeps the prepared plot arrays of a resident entry."""
+        entry = self._entries[key]
+        if not entry.resident:
+            return
+
+        self._nbytes -= entry.nbytes
+        entry.arrays = arrays
+        self._nbytes += entry.nbytes
+        self._evict()
+
+    def remove(self, key):
+        """Removes an entry and deletes its spill file."""
+        self._remove(key)
+
+    def clear(self):
+        """Removes all entries and deletes their spill files."""
+        for key in list(self._entries.keys()):
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+        if entry.spill_path is not None and osp.isfile(entry.spill_path):
+            os.remove(entry.spill_path)
+
+    def _evict(self):
+        """Evicts least recently used entries until the memory budget is met."""
+        for key in list(self._entries.keys())[:-1]:
+            if self._nbytes <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.resident:
+                self._nbytes -= entry.nbytes
+                self._spill(entry)
+
+    def _spill(self, entry):
+        """Writes the data of an entry to its spill file, once, and releases it."""
+        if entry.spill_path is None and entry.sweep_data.data is not None:
+            if not osp.isdir(self.spill_dir):
+                os.makedirs(self.spill_dir)
+            self._counter += 1
+            path = osp.join(self.spill_dir, '%s%s.npy' % (self._prefix, self._counter))
+            np.save(path, entry.sweep_data.data, allow_pickle=False)
+            entry.spill_path = path
+
+        entry.sweep_data = None
+        entry.arrays = None
+
+    def _restore(self, entry):
+        """Recreates the sweep data of an evicted entry from its spill file."""
+        sweep_data = entry.sweep_class()
+        sweep_data.titles = entry.titles
+        sweep_data.params = entry.params
+        if entry.spill_path is None:
+            sweep_data.data = None
+        else:
+            sweep_data.data = np.load(entry.spill_path, allow_pickle=False)
+        return sweep_data
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+from qtpy import QtCore, QtGui, QtWidgets
+
+
+class SweepListDock(QtWidgets.QDockWidget):
+    """
+    Dock widget which lists the sweeps in a :class:`SweepHistory`, most recent
+    first. Sweeps which have been evicted to disk are shown in grey.
+    :attr:`selectionChanged` is emitted with a list of the selected keys.
+
+    :param history: SweepHistory instance.
+    """
+
+    selectionChanged = QtCore.Signal(object)
+
+    def __init__(self, history, parent=None):
+        QtWidgets.QDockWidget.__init__(self, 'Sweep History', parent)
+        self.setObjectName('sweepListDock')
+
+        self.history = history
+        self._items = dict()  # list items by key
+
+        widget = QtWidgets.QWidget(self)
+        layout = QtWidgets.QVBoxLayout(widget)
+
+        self.listWidget = QtWidgets.QListWidget(widget)
+        self.listWidget.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.listWidget.setUniformItemSizes(True)
+        self.labelMemory = QtWidgets.QLabel(widget)
+        self.pushButtonClear = QtWidgets.QPushButton('Clear', widget)
+
+        layout.addWidget(self.listWidget)
+        layout.addWidget(self.labelMemory)
+        layout.addWidget(self.pushButtonClear)
+        self.setWidget(widget)
+
+        self.listWidget.itemSelectionChanged.connect(self._on_selection_changed)
+        self.pushButtonClear.clicked.connect(self.clear)
+
+    def addSweep(self, key, label, sweep_data, info=None, select=False):
+        """
+        Adds a sweep to the history, replacing an entry with the same key.
+
+        :param key: Unique key, e.g., the path of a loaded file.
+        :param str label: Label for display.
+        :param sweep_data: Sweep data.
+        :param dict info: Further information, see :meth:`SweepHistory.add`.
+        :param bool select: Whether to select the sweep, deselecting all others.
+        """
+        for removed in self.history.add(key, label, sweep_data, info):
+            self._take_item(removed)
+
+        item = self._take_item(key) or QtWidgets.QListWidgetItem(label)
+        item.setData(QtCore.Qt.UserRole, key)
+        self.listWidget.insertItem(0, item)
+        self._items[key] = item
+
+        if select:
+            # emit a single change, also if the item was selected before
+            self.listWidget.blockSignals(True)
+            self.listWidget.setCurrentItem(item, QtCore.QItemSelectionModel.ClearAndSelect)
+            self.listWidget.blockSignals(False)
+            self._on_selection_changed()
+        else:
+            self.updateStatus()
+
+    def selectedKeys(self):
+        """Returns the keys of the selected sweeps, in list order."""
+        return [self.listWidget.item(i).data(QtCore.Qt.UserRole)
+                for i in range(self.listWidget.count())
+                if self.listWidget.item(i).isSelected()]
+
+    def updateStatus(self):
+        """Shows which sweeps are held in memory and the memory used."""
+        for key, item in self._items.items():
+            resident = self.history.is_resident(key)
+            group = QtGui.QPalette.Active if resident else QtGui.QPalette.Disabled
+            item.setForeground(self.palette().brush(group, QtGui.QPalette.Text))
+            item.setToolTip('%s (%s)' % (self.history.label(key),
+                                         'in memory' if resident else 'on disk'))
+
+        self.labelMemory.setText('%s sweeps, %.1f of %.0f MB in memory' % (
+            len(self.history), self.history.nbytes / 2**20,
+            self.history.max_bytes / 2**20))
+
+    @QtCore.Slot()
+    def clear(self):
+        """Removes all sweeps."""
+        self.listWidget.clear()
+        self._items.clear()
+        self.history.clear()
+        self.updateStatus()
+
+    def _take_item(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.listWidget.takeItem(self.listWidget.row(item))
+        return item
+
+    @QtCore.Slot()
+    def _on_selection_changed(self):
+        keys = self.selectedKeys()
+        if len(keys) > 0:
+            self.selectionChanged.emit(keys)
+        self.updateStatus()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Loading of sweep data files.
+
+Files are sniffed by reading their header only, which gives the column titles
+and measurement parameters. The sweep type in the parameters selects the class
+of the returned sweep data, see :func:`register_sweep_class`. The numeric body
+is then parsed in a single vectorized pass.
+
+This module does not use Qt itself, so that sweeps can be loaded in worker processes
+without a GUI. Workers still import Qt and the rest of the GUI once when they
+start, through the package ``__init__`` and the re-imported main module of the
+program, which is why only larger batches are loaded in parallel.
+"""
+
+from __future__ import division, absolute_import, print_function
+import os
+import os.path as osp
+import warnings
+from collections import namedtuple
+import numpy as np
+from keithley2600 import TransistorSweepData, IVSweepData, ResultTable
+
+
+# files are rejected before reading their body if they are larger
+MAX_FILE_SIZE = 2**30  # bytes
+MAX_HEADER_LINES = 10000
+
+SWEEP_CLASSES = {
+    'transfer': TransistorSweepData,
+    'output': TransistorSweepData,
+    'iv': IVSweepData,
+}
+DEFAULT_CLASS = TransistorSweepData
+
+
+class SweepFileError(ValueError):
+    """Raised if a file is not a valid sweep data file."""
+    pass
+
+
+SweepHeader = namedtuple('SweepHeader', ['sweep_class', 'titles', 'params',
+                                         'delimiter', 'n_lines'])
+
+
+def register_sweep_class(sweep_type, sweep_class):
+    """
+    Registers the class used for files of a sweep type.
+
+    :param str sweep_type: Value of the 'sweep_type' parameter in the file header.
+    :param sweep_class: Subclass of ResultTable which can be created without arguments.
+    """
+    SWEEP_CLASSES[sweep_type] = sweep_class
+
+
+def _guess_sweep_type(titles):
+    """Guesses the sweep type from the column names of files without parameters."""
+    names = [t.name for t in titles]
+    if names == ['Voltage', 'Current']:
+        return 'iv'
+    elif names[0] == 'Gate voltage':
+        return 'transfer'
+    elif names[0] == 'Drain voltage':
+        return 'output'
+    else:
+        return 'unknown'
+
+
+def _parse_values(body, delimiter):
+    """Parses delimited numbers from bytes in C. Stops early at an invalid token."""
+    if delimiter.strip():
+        body = body.replace(delimiter, b' ')
+    with warnings.catch_warnings():
+        # numpy warns when it stops at an invalid token, the caller checks the size
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return np.fromstring(body, sep=' ')
+
+
+def _line_ends(body):
+    """Returns the positions of all line ends in bytes, including a missing last one."""
+    line_ends = np.flatnonzero(np.frombuffer(body, np.uint8) == ord('\n'))
+    if len(body) > 0 and not body.endswith(b'\n'):
+        line_ends = np.append(line_ends, len(body))
+    return line_ends
+
+
+def _is_regular(body, line_ends, n_cols, delimiter):
+    """
+    Checks in a vectorized pass that every line holds exactly `n_cols - 1`
+    delimiters, i.e., that the last delimiter of every line lies before its end
+    and the first delimiter of every line after the end of the previous line.
+    """
+    chars = np.frombuffer(body, np.uint8)
+    delimiters = np.flatnonzero(chars == ord(delimiter))
+
+    if n_cols == 1 or delimiters.size != line_ends.size * (n_cols - 1):
+        return delimiters.size == 0 and n_cols == 1
+
+    delimiters = delimiters.reshape(-1, n_cols - 1)
+    return bool(np.all(delimiters[:, -1] < line_ends) and
+                np.all(delimiters[1:, 0] > line_ends[:-1]))
+
+
+def _read_header(f, filepath):
+    """
+    Reads the comment lines at the start of a file opened in binary mode. Returns
+    the decoded header lines and the first data line.
+    """
+    comment = ResultTable.COMMENT.strip().encode()
+    lines = []
+
+    line = f.readline()
+    while line.startswith(comment):
+        lines.append(line.decode('utf-8', 'replace'))
+        if len(lines) > MAX_HEADER_LINES:
+            raise SweepFileError('%s: header is longer than %s lines'
+                                 % (filepath, MAX_HEADER_LINES))
+        line = f.readline()
+
+    if len(lines) == 0:
+        raise SweepFileError('%s: no header with column titles' % filepath)
+
+    return lines, line
+
+
+def sniff_sweep_file(filepath):
+    """
+    Reads the header of a sweep data file without reading its data.
+
+    :param str filepath: Path of the file.
+    :returns: Header with the class for the sweep data, the column titles, the
+        measurement parameters, the column delimiter and the number of header lines.
+    :rtype: SweepHeader
+    :raises SweepFileError: if the file has no valid header.
+    """
+    with open(filepath, 'rb') as f:
+        lines, _ = _read_header(f, filepath)
+
+    return _parse_header(lines, filepath)
+
+
+def _parse_header(lines, filepath):
+    table = ResultTable()
+    if osp.splitext(filepath)[1].lower() == '.csv':
+        table.DELIMITER = ','
+
+    titles, params = table.parse_header(''.join(lines))
+
+    if 'sweep_type' not in params:
+        params['sweep_type'] = _guess_sweep_type(titles)
+
+    sweep_class = SWEEP_CLASSES.get(params['sweep_type'], DEFAULT_CLASS)
+
+    return SweepHeader(sweep_class, titles, params, table.DELIMITER, len(lines))
+
+
+def load_sweep_file(filepath):
+    """
+    Loads a sweep data file. The header and first data line are checked before the
+    rest of the file is read, so that invalid or oversized files fail early. The data
+    is parsed in a single pass, with a fall-back to :func:`numpy.loadtxt` for files
+    with irregular lines.
+
+    :param str filepath: Path of the file.
+    :returns: Sweep data of the class registered for its sweep type.
+    :rtype: ResultTable
+    :raises SweepFileError: if the file is not a valid sweep data file.
+    """
+    size = os.path.getsize(filepath)
+    if size > MAX_FILE_SIZE:
+        raise SweepFileError('%s: file size of %s bytes exceeds the limit of %s bytes'
+                             % (filepath, size, MAX_FILE_SIZE))
+
+    with open(filepath, 'rb') as f:
+        lines, first_line = _read_header(f, filepath)
+        header = _parse_header(lines, filepath)
+        delimiter = header.delimiter.encode()
+        n_cols = len(header.titles)
+
+        # check the first row before reading the rest of the file
+        if first_line.strip() and _parse_values(first_line, delimiter).size != n_cols:
+            raise SweepFileError('%s, line %s: expected %s values, found "%s"'
+                                 % (filepath, header.n_lines + 1, n_cols,
+                                    first_line.strip().decode('utf-8', 'replace')))
+
+        body = first_line + f.read()
+
+    values = _parse_values(body, delimiter)
+    line_ends = _line_ends(body)
+
+    if (values.size == n_cols * line_ends.size and len(delimiter) == 1 and
+            _is_regular(body, line_ends, n_cols, delimiter)):
+        data = values.reshape(line_ends.size, n_cols)
+    else:
+        # blank lines or invalid values, loadtxt skips the first and locates the second
+        try:
+            data = np.loadtxt(filepath, delimiter=header.delimiter.strip() or None,
+                              ndmin=2)
+        except ValueError as e:
+            raise SweepFileError('%s: %s' % (filepath, e))
+
+        if data.size > 0 and data.shape[1] != n_cols:
+            raise SweepFileError('%s: expected %s columns, found %s'
+                                 % (filepath, n_cols, data.shape[1]))
+
+    sweep_data = header.sweep_class()
+    sweep_data.titles = header.titles
+    sweep_data.params = header.params
+    sweep_data.data = data
+
+    return sweep_data
+
+
+def load_worker(filepath):
+    """
+    Loads a sweep data file in a worker process. Errors are returned instead of
+    raised, so that a single broken file does not end a batch.
+
+    :param str filepath: Path of the file.
+    :returns: Tuple (filepath, sweep_data, error), where either `sweep_data` or the
+        error message is `None`.
+    """
+    try:
+        return filepath, load_sweep_file(filepath), None
+    except Exception as e:
+        return filepath, None, '%s: %s' % (type(e).__name__, e)
+
+
+def combine_sweeps(sweeps):
+    """
+    Combines sweeps which share the same x-data into a single sweep for comparison.
+    The y-columns are prefixed with the label of their sweep, without file extension.
+
+    :param sweeps: List of tuples (label, sweep_data).
+    :returns: Combined sweep data or `None` if the sweeps have different x-data.
+    :rtype: TransistorSweepData
+    """
+    sweeps = list(sweeps)
+    first = sweeps[0][1]
+    x = first.get_column(0)
+
+    for _, sweep_data in sweeps[1:]:
+        other = sweep_data.get_column(0)
+        if other.shape != x.shape or not np.array_equal(other, x):
+            return None
+
+    names = [first.titles[0].name]
+    units = [first.titles[0].unit]
+    columns = [x]
+
+    for label, sweep_data in sweeps:
+        label = osp.splitext(label)[0]
+        for i in range(1, sweep_data.ncols):
+            names.append('%s: %s' % (label, sweep_data.titles[i].name))
+            units.append(sweep_data.titles[i].unit)
+            columns.append(sweep_data.get_column(i))
+
+    return TransistorSweepData(names, units, np.column_stack(columns),
+                               dict(first.params))
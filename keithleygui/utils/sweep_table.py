@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+from collections import OrderedDict
+import numpy as np
+from qtpy import QtCore, QtWidgets
+
+from keithleygui.utils.si_format import format_si_array
+
+
+class SweepTableModel(QtCore.QAbstractTableModel):
+    """
+    Read-only table model over the data array of a sweep.
+
+    The model keeps a reference to the data array of the ResultTable and never copies
+    it. Views only request the cells which are visible. Cells are formatted in blocks
+    of `BLOCK_SIZE` rows with :func:`format_si_array` when a row of the block is first
+    requested, and the most recently used `MAX_BLOCKS` blocks are kept.
+    """
+
+    BLOCK_SIZE = 256
+    MAX_BLOCKS = 64
+    DECIMALS = 3
+
+    def __init__(self, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self._data = np.zeros((0, 0))
+        self._titles = []
+        self._units = np.zeros(0, dtype=object)
+        self._blocks = OrderedDict()  # formatted blocks by block index
+
+    def setSweepData(self, sweep_data):
+        """
+        Shows the data of a sweep.
+
+        :param sweep_data: ResultTable instance or None to clear the table.
+        """
+        self.beginResetModel()
+
+        if sweep_data is None or sweep_data.data is None:
+            self._data = np.zeros((0, 0))
+            self._titles = []
+        else:
+            self._data = np.atleast_2d(sweep_data.data)
+            self._titles = list(sweep_data.titles)
+
+        self._units = np.array([t.unit for t in self._titles], dtype=object)
+        self._blocks.clear()
+
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._data.shape[0]
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._data.shape[1]
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            return self._format(index.row(), index.column())
+        elif role == QtCore.Qt.ToolTipRole:
+            return repr(float(self._data[index.row(), index.column()]))
+        elif role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Horizontal:
+            return self._titles[section].name if section < len(self._titles) else None
+        else:
+            return str(section)
+
+    def _format(self, row, column):
+        block = row // self.BLOCK_SIZE
+
+        try:
+            strings = self._blocks.pop(block)
+        except KeyError:
+            strings = self._format_block(block)
+            if len(self._blocks) >= self.MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+
+        self._blocks[block] = strings  # (re-)insert as most recently used
+
+        return strings[row - block * self.BLOCK_SIZE, column]
+
+    def _format_block(self, block):
+        """Formats all cells in a block of rows at once and appends the column units."""
+        start = block * self.BLOCK_SIZE
+        rows = self._data[start:start + self.BLOCK_SIZE]
+        return format_si_array(rows, self.DECIMALS) + self._units
+
+
+class SweepTableDock(QtWidgets.QDockWidget):
+    """
+    Dock widget with a table of the current sweep data, see :class:`SweepTableModel`.
+    """
+
+    def __init__(self, parent=None):
+        QtWidgets.QDockWidget.__init__(self, 'Data Table', parent)
+        self.setObjectName('sweepTableDock')
+
+        self.model = SweepTableModel(self)
+
+        self.view = QtWidgets.QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setWordWrap(False)
+        self.view.setAlternatingRowColors(True)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+
+        # fixed row heights, so that the view never measures rows outside the viewport
+        header = self.view.verticalHeader()
+        header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        header.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+
+        self.view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        self.view.horizontalHeader().setDefaultSectionSize(150)
+
+        self.setWidget(self.view)
+
+    def setSweepData(self, sweep_data):
+        """Shows the data of a sweep, see :meth:`SweepTableModel.setSweepData`."""
+        self.model.setSweepData(sweep_data)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+from qtpy import QtCore, QtWidgets
+
+from keithleygui.utils.scientific_spinbox import ScienDSpinBox
+
+
+class TimeSeriesTab(QtWidgets.QWidget):
+    """Settings of time-series recordings at a fixed gate and drain bias."""
+
+    def __init__(self):
+        super(TimeSeriesTab, self).__init__()
+
+        self.setObjectName('tabTimeSeries')
+
+        self.gridLayouts = QtWidgets.QGridLayout(self)
+        self.gridLayouts.setObjectName('gridLayout')
+
+        self.labelVg = QtWidgets.QLabel(self)
+        self.labelVg.setObjectName('labelVg')
+        self.labelVg.setAlignment(QtCore.Qt.AlignRight)
+        self.labelVg.setText('Gate bias:')
+        self.gridLayouts.addWidget(self.labelVg, 0, 0, 1, 1)
+
+        self.scienDSpinBoxVg = ScienDSpinBox(self)
+        self.scienDSpinBoxVg.setObjectName('scienDSpinBoxVg')
+        self.scienDSpinBoxVg.setMinimumWidth(90)
+        self.scienDSpinBoxVg.setMaximumWidth(90)
+        self.scienDSpinBoxVg.setAlignment(QtCore.Qt.AlignRight)
+        self.scienDSpinBoxVg.setSuffix("V")
+        self.gridLayouts.addWidget(self.scienDSpinBoxVg, 0, 1, 1, 1)
+
+        self.labelVd = QtWidgets.QLabel(self)
+        self.labelVd.setObjectName('labelVd')
+        self.labelVd.setAlignment(QtCore.Qt.AlignRight)
+        self.labelVd.setText('Drain bias:')
+        self.gridLayouts.addWidget(self.labelVd, 1, 0, 1, 1)
+
+        self.scienDSpinBoxVd = ScienDSpinBox(self)
+        self.scienDSpinBoxVd.setObjectName('scienDSpinBoxVd')
+        self.scienDSpinBoxVd.setMinimumWidth(90)
+        self.scienDSpinBoxVd.setMaximumWidth(90)
+        self.scienDSpinBoxVd.setAlignment(QtCore.Qt.AlignRight)
+        self.scienDSpinBoxVd.setSuffix("V")
+        self.gridLayouts.addWidget(self.scienDSpinBoxVd, 1, 1, 1, 1)
+
+        self.labelInterval = QtWidgets.QLabel(self)
+        self.labelInterval.setObjectName('labelInterval')
+        self.labelInterval.setAlignment(QtCore.Qt.AlignRight)
+        self.labelInterval.setText('Interval:')
+        self.gridLayouts.addWidget(self.labelInterval, 2, 0, 1, 1)
+
+        self.scienDSpinBoxInterval = ScienDSpinBox(self)
+        self.scienDSpinBoxInterval.setObjectName('scienDSpinBoxInterval')
+        self.scienDSpinBoxInterval.setMinimumWidth(90)
+        self.scienDSpinBoxInterval.setMaximumWidth(90)
+        self.scienDSpinBoxInterval.setAlignment(QtCore.Qt.AlignRight)
+        self.scienDSpinBoxInterval.setMinimum(0)
+        self.scienDSpinBoxInterval.setSuffix("s")
+        self.gridLayouts.addWidget(self.scienDSpinBoxInterval, 2, 1, 1, 1)
+
+        self.labelDuration = QtWidgets.QLabel(self)
+        self.labelDuration.setObjectName('labelDuration')
+        self.labelDuration.setAlignment(QtCore.Qt.AlignRight)
+        self.labelDuration.setText('Duration:')
+        self.gridLayouts.addWidget(self.labelDuration, 0, 2, 1, 1)
+
+        self.scienDSpinBoxDuration = ScienDSpinBox(self)
+        self.scienDSpinBoxDuration.setObjectName('scienDSpinBoxDuration')
+        self.scienDSpinBoxDuration.setMinimumWidth(90)
+        self.scienDSpinBoxDuration.setMaximumWidth(90)
+        self.scienDSpinBoxDuration.setAlignment(QtCore.Qt.AlignRight)
+        self.scienDSpinBoxDuration.setMinimum(0)
+        self.scienDSpinBoxDuration.setSuffix("s")
+        self.scienDSpinBoxDuration.setToolTip('Set to 0 to record until aborted.')
+        self.gridLayouts.addWidget(self.scienDSpinBoxDuration, 0, 3, 1, 1)
+
+        self.labelBufferSize = QtWidgets.QLabel(self)
+        self.labelBufferSize.setObjectName('labelBufferSize')
+        self.labelBufferSize.setAlignment(QtCore.Qt.AlignRight)
+        self.labelBufferSize.setText('Points shown:')
+        self.gridLayouts.addWidget(self.labelBufferSize, 1, 2, 1, 1)
+
+        self.spinBoxBufferSize = QtWidgets.QSpinBox(self)
+        self.spinBoxBufferSize.setObjectName('spinBoxBufferSize')
+        self.spinBoxBufferSize.setMinimumWidth(90)
+        self.spinBoxBufferSize.setMaximumWidth(90)
+        self.spinBoxBufferSize.setAlignment(QtCore.Qt.AlignRight)
+        self.spinBoxBufferSize.setRange(10, 10**7)
+        self.gridLayouts.addWidget(self.spinBoxBufferSize, 1, 3, 1, 1)
+
+        self.checkBoxSpill = QtWidgets.QCheckBox(self)
+        self.checkBoxSpill.setObjectName('checkBoxSpill')
+        self.checkBoxSpill.setText('Keep all points on disk')
+        self.gridLayouts.addWidget(self.checkBoxSpill, 2, 2, 1, 2)
+
+        self.pushButtonRun = QtWidgets.QPushButton(self)
+        self.pushButtonRun.setObjectName('pushButtonRun')
+        self.pushButtonRun.setMinimumWidth(150)
+        self.pushButtonRun.setMaximumWidth(150)
+        self.pushButtonRun.setText('Run')
+        self.gridLayouts.addWidget(self.pushButtonRun, 3, 3, 1, 1,
+                                   QtCore.Qt.AlignRight)
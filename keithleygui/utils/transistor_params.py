@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+"""
+Extraction of transistor parameters from transfer curves.
+
+All drain currents of a sweep are processed at once as a 2D array with one row per
+curve, so that derivatives and fits are vectorized over all curves and the cost
+per sweep is dominated by a few NumPy calls.
+
+Transfer sweeps are recorded forward and reverse. Mobility, on/off ratio and
+subthreshold swing are taken from the forward sweep, the threshold voltage from
+both and their difference is given as hysteresis.
+
+This module does not depend on Qt.
+"""
+
+from __future__ import division, absolute_import, print_function
+import re
+import warnings
+import numpy as np
+
+
+# parses the drain voltage from column names such as 'Drain current (Vd = -5.0)'
+CURVE_PATTERN = re.compile(r'^Drain current \(Vd = (.+)\)$')
+
+# number of points on each side of the steepest point used for linear fits
+FIT_HALF_WIDTH = 3
+
+# fraction of the decades between off and on current excluded at either end when
+# searching for the subthreshold swing
+SS_MARGIN = 0.1
+
+RESULT_KEYS = ('name', 'vd', 'regime', 'mu_lin', 'mu_sat', 'vth_fwd', 'vth_rvs',
+               'hysteresis', 'on_off', 'ss', 'fit')
+
+
+def _gradient(x, y):
+    """Derivative of every row of `y` with respect to `x`."""
+    return np.gradient(y, x, axis=1)
+
+
+def _steepest_fit(x, y, dy):
+    """
+    Fits a straight line to every row of `y` around its steepest point.
+
+    :param x: 1D array with n values.
+    :param y: 2D array with shape (m, n).
+    :param dy: Derivative of `y`, used to find the steepest point.
+    :returns: Tuple (slope, intercept), each a 1D array with m values.
+    """
+    finite = np.isfinite(dy)
+    steepest = np.argmax(np.where(finite, np.abs(dy), -1), axis=1)
+
+    index = np.arange(len(x))
+    mask = np.abs(index - steepest[:, np.newaxis]) <= FIT_HALF_WIDTH
+    mask &= np.isfinite(y)
+
+    # weighted least squares with 0/1 weights, one fit per row
+    w = mask.astype(np.float64)
+    y = np.where(mask, y, 0)
+    sw = w.sum(axis=1)
+    sx = (w * x).sum(axis=1)
+    sy = y.sum(axis=1)
+    sxx = (w * x**2).sum(axis=1)
+    sxy = (y * x).sum(axis=1)
+
+    denominator = sw * sxx - sx**2
+    slope = (sw * sxy - sx * sy) / denominator
+    intercept = (sy - slope * sx) / sw
+
+    return slope, intercept
+
+
+def _threshold(x, i_d, vds):
+    """
+    Returns the threshold voltages from linear and saturation regime fits, and the
+    slopes and intercepts of the fits, for every row of `i_d`. In the linear regime,
+    the intercept of the fit lies at Vth + Vd/2.
+    """
+    i_abs = np.abs(i_d)
+    sqrt_i = np.sqrt(i_abs)
+
+    slope_lin, intercept_lin = _steepest_fit(x, i_abs, _gradient(x, i_abs))
+    slope_sat, intercept_sat = _steepest_fit(x, sqrt_i, _gradient(x, sqrt_i))
+
+    vth_lin = -intercept_lin / slope_lin - vds / 2
+    vth_sat = -intercept_sat / slope_sat
+
+    return vth_lin, vth_sat, (slope_lin, intercept_lin), (slope_sat, intercept_sat)
+
+
+def _subthreshold_swing(x, i_d):
+    """Returns the smallest gate voltage change per decade of drain current."""
+    i_abs = np.abs(i_d)
+    log_i = np.log10(i_abs, out=np.full_like(i_abs, np.nan), where=i_abs > 0)
+
+    lo = np.nanmin(log_i, axis=1)[:, np.newaxis]
+    hi = np.nanmax(log_i, axis=1)[:, np.newaxis]
+    margin = SS_MARGIN * (hi - lo)
+    region = (log_i > lo + margin) & (log_i < hi - margin)
+
+    slope = np.abs(_gradient(x, log_i))
+    slope = np.where(region & np.isfinite(slope), slope, 0).max(axis=1)
+
+    return np.where(slope > 0, 1 / np.where(slope > 0, slope, 1), np.nan)
+
+
+def _parse_vd(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan  # e.g., 'trailing' where the drain follows the gate
+
+
+def transfer_curves(sweep_data):
+    """
+    Returns the column names, drain voltages and drain currents of all curves of a
+    transfer sweep, the currents as 2D array with one row per curve.
+    """
+    names, vds, columns = [], [], []
+
+    for i, name in enumerate(sweep_data.column_names):
+        match = CURVE_PATTERN.match(name)
+        if match:
+            names.append(name)
+            vds.append(_parse_vd(match.group(1)))
+            columns.append(i)
+
+    return names, np.array(vds), np.asarray(sweep_data.data[:, columns].T, dtype=np.float64)
+
+
+def extract_transfer_parameters(sweep_data, width, length, capacitance):
+    """
+    Extracts transistor parameters from all curves of a transfer sweep.
+
+    The linear mobility is taken from the maximum transconductance, the saturation
+    mobility from the maximum slope of sqrt(|Id|). A curve is in saturation if
+    |Vd| exceeds the largest gate overdrive |Vg - Vth| or if the drain voltage
+    follows the gate voltage. The threshold voltage is the intercept of a linear
+    fit of |Id| or sqrt(|Id|), depending on the regime, around its steepest point.
+
+    :param sweep_data: TransistorSweepData of a transfer sweep.
+    :param float width: Channel width in m.
+    :param float length: Channel length in m.
+    :param float capacitance: Gate capacitance per area in F/cm^2.
+    :returns: List with one dictionary per curve and the keys in
+        :data:`RESULT_KEYS`. Mobilities are given in cm^2/Vs, voltages in V and
+        the subthreshold swing in V/dec. 'name' is the column name of the drain
+        current and 'fit' holds the gate voltages and drain currents of the fit of
+        the forward sweep for display.
+    :rtype: list
+    """
+    if sweep_data.params.get('sweep_type') != 'transfer' or sweep_data.data is None:
+        return []
+
+    names, vds, i_d = transfer_curves(sweep_data)
+    if len(names) == 0:
+        return []
+
+    x = np.asarray(sweep_data.get_column(0), dtype=np.float64)
+    n_fwd = (len(x) + 1) // 2
+    x_fwd, x_rvs = x[:n_fwd], x[n_fwd:][::-1]
+    i_fwd, i_rvs = i_d[:, :n_fwd], i_d[:, n_fwd:][:, ::-1]
+
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        # all-NaN curves of interrupted sweeps give NaN results
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        vth_lin, vth_sat, fit_lin, fit_sat = _threshold(x_fwd, i_fwd, vds)
+        if len(x_rvs) > 2 * FIT_HALF_WIDTH:
+            vth_lin_rvs, vth_sat_rvs, _, _ = _threshold(x_rvs, i_rvs, vds)
+        else:
+            vth_lin_rvs = vth_sat_rvs = np.full(len(names), np.nan)
+
+        overdrive = np.nanmax(np.abs(x_fwd - vth_sat[:, np.newaxis]), axis=1)
+        saturation = np.isnan(vds) | (np.abs(vds) >= overdrive)
+
+        geometry = length / (width * capacitance)
+        mu_lin = geometry * np.abs(fit_lin[0]) / np.abs(vds)
+        mu_sat = 2 * geometry * fit_sat[0]**2
+
+        vth_fwd = np.where(saturation, vth_sat, vth_lin)
+        vth_rvs = np.where(saturation, vth_sat_rvs, vth_lin_rvs)
+        hysteresis = vth_fwd - vth_rvs
+
+        i_abs = np.abs(i_d)
+        i_on = np.nanmax(i_abs, axis=1)
+        i_off = np.nanmin(np.where(i_abs > 0, i_abs, np.nan), axis=1)
+        on_off = i_on / i_off
+
+        ss = _subthreshold_swing(x_fwd, i_fwd)
+
+        # the fits cross zero at the threshold in saturation and at Vth + Vd/2 else
+        x_zero = np.where(saturation, vth_sat, vth_lin + vds / 2)
+
+    results = []
+
+    for k, name in enumerate(names):
+        # draw fits from their zero crossing to the end of the sweep in on-direction
+        if np.isfinite(i_fwd[k]).any():
+            on_side = np.sign(x_fwd[np.nanargmax(np.abs(i_fwd[k]))] - x_zero[k])
+        else:
+            on_side = 0
+        x_fit = x_fwd[np.sign(x_fwd - x_zero[k]) == on_side]
+        if saturation[k]:
+            y_fit = (fit_sat[0][k] * x_fit + fit_sat[1][k])**2
+        else:
+            y_fit = fit_lin[0][k] * x_fit + fit_lin[1][k]
+
+        results.append({
+            'name': name,
+            'vd': vds[k],
+            'regime': 'saturation' if saturation[k] else 'linear',
+            'mu_lin': mu_lin[k],
+            'mu_sat': mu_sat[k],
+            'vth_fwd': vth_fwd[k],
+            'vth_rvs': vth_rvs[k],
+            'hysteresis': hysteresis[k],
+            'on_off': on_off[k],
+            'ss': ss[k],
+            'fit': (x_fit, y_fit),
+        })
+
+    return results
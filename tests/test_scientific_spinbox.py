@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © keithleygui Project Contributors
+# Licensed under the terms of the MIT License
+# (see LICENSE.txt for details)
+
+from __future__ import division, absolute_import, print_function
+import random
+import unittest
+from decimal import Decimal as D
+from decimal import ROUND_FLOOR
+from qtpy import QtWidgets
+
+from keithleygui.utils.scientific_spinbox import ScienDSpinBox
+
+
+def stepwise(value, steps, single_step, minimal_step):
+    """Dynamic stepping of ScienDSpinBox.stepBy before steps were grouped by decade."""
+    s = [D(-1), D(1)][steps >= 0]
+    for i in range(abs(steps)):
+        if value == 0:
+            step = minimal_step
+        else:
+            vs = [D(-1), D(1)][value >= 0]
+            fudge = D('1.01') ** (s * vs)
+            exp = abs(value * fudge).log10().quantize(1, rounding=ROUND_FLOOR)
+            step = single_step * D(10) ** exp
+            if minimal_step > 0:
+                step = max(step, minimal_step)
+        value += s * step
+    return value
+
+
+class TestDynamicStep(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def setUp(self):
+        self.spin_box = ScienDSpinBox()
+
+    def assertEquivalent(self, value, steps, single_step, minimal_step):
+        self.spin_box.setSingleStep(single_step)
+        self.spin_box.setMinimalStep(minimal_step)
+        expected = stepwise(D(value), steps, D(single_step), D(minimal_step))
+        result = self.spin_box._dynamic_step(D(value), steps)
+        self.assertEqual(result, expected, 'value=%s, steps=%s, single_step=%s, '
+                         'minimal_step=%s' % (value, steps, single_step, minimal_step))
+
+    def test_random_values(self):
+        rng = random.Random(0)
+        for i in range(2000):
+            value = '%.*e' % (rng.randint(0, 6), rng.uniform(-10, 10) * 10**rng.randint(-9, 6))
+            steps = rng.randint(-300, 300)
+            single_step = rng.choice(['0.1', '0.01', '1', '0.5'])
+            minimal_step = rng.choice(['0', '0', '1e-6', '0.01', '1'])
+            self.assertEquivalent(value, steps, single_step, minimal_step)
+
+    def test_decade_boundaries(self):
+        for value in ('1', '-1', '10', '-10', '0.99', '-0.99', '1.01', '9.9', '-9.9', '100'):
+            for steps in (-200, -11, -10, -9, -1, 1, 9, 10, 11, 200):
+                self.assertEquivalent(value, steps, '0.1', '0')
+
+    def test_zero(self):
+        for steps in (-50, -1, 0, 1, 50):
+            self.assertEquivalent('0', steps, '0.1', '0.001')
+            self.assertEquivalent('0', steps, '0.1', '0')
+
+    def test_minimal_step(self):
+        # the minimal step is larger than all dynamic steps
+        for value in ('0.001', '-0.001', '0.5', '-3'):
+            for steps in (-100, -7, 7, 100):
+                self.assertEquivalent(value, steps, '0.1', '1')
+
+    def test_zero_crossing(self):
+        for value in ('0.3', '-0.3', '5', '-5'):
+            for steps in (-400, -60, 60, 400):
+                self.assertEquivalent(value, steps, '0.1', '0.01')
+
+
+if __name__ == '__main__':
+    unittest.main()